@@ -1,87 +1,204 @@
 # game loop
-from random import randint
-
 import pygame
-import random
-
-from characters.human import Human
-from characters.zombie import Zombie
-from constants import HUMAN_COUNT, ZOMBIE_COUNT, GRID_WIDTH, GRID_HEIGHT, BACKGROUND_COLOR
-from exceptions import InvalidCoordinateException
-from ui.board import GameBoard
-
-# pygame setup
-pygame.init()
-screen = pygame.display.set_mode((1280, 720))
-clock = pygame.time.Clock()
-running = True
-dt = 0
-board = GameBoard(screen)
+
+from simulation.board import Board
+from simulation.engine import SimulationEngine
+from simulation.instrumentation import Instrumentation
+from simulation.scheduler import TurnScheduler
+from simulation.worker import SimulationWorker
+from ui.frame_view import FrameView
 
 # TODO: This file is currently untested, this makes me uncomfortable but I don't want to be testing the internals of pygame
 #       And I definitely don't want to be unittesting UI elements that could get very complicated very quickly
 
-def populate_initial_humans():
-    """Places a number of humans on the grid at the beginning of the game."""
-    for _ in range(HUMAN_COUNT):
-        board.add_character(Human(location=[randint(0, GRID_WIDTH-1), randint(0, GRID_HEIGHT-1)]))
 
+# The number of frames drawn every second, however fast the invasion is running
+FRAMES_PER_SECOND = 30
+# The turns run every frame when fast-forwarding is switched on with the F key
+FAST_FORWARD_TURNS = 10
+# The seconds of every frame spent running turns when the frame budget is switched on with the B key
+FRAME_BUDGET = 0.025
+# The number of turns profiled when profiling is started with the P key
+PROFILE_TURNS = 100
+
+CONTROLS = f"""Controls:
+    Space       Play / pause
+    Right, N    Step a single turn
+    S           Stop
+    R           Restart
+    Up, +       Faster
+    Down, -     Slower
+    F           Fast-forward on / off
+    B           Run to a frame budget on / off
+    P           Profile the next {PROFILE_TURNS} turns"""
+
+
+def new_invasion(seed, width, height, human_count, zombie_count, walls=()):
+    """
+    Create and populate the board and engine for an invasion.
 
-def populate_initial_zombies(board):
+    The board is headless, it is only ever drawn from the frames the simulation worker publishes.
+
+    Args:
+        walls: The (x, y) coordinates of the two ends of every wall to draw on the board before it is populated.
+
+    Returns:
+        SimulationEngine: The engine of the invasion.
     """
-    Place a number of zombies on the grid at the start of the game.
-    
+    board = Board(width=width, height=height)
+    for start, end in walls:
+        board.add_walls(start, end)
+    engine = SimulationEngine(board, human_count=human_count, zombie_count=zombie_count, seed=seed)
+
+    # Populate the board with initial characters
+    engine.populate()
+    return engine
+
+
+def handle_key(key, worker, restart, instrumentation):
+    """
+    Control the invasion from the keyboard.
+
+    Every key is sent to the simulation worker as a command, so the invasion is only ever changed between turns.
+
+    Args:
+        key: The pygame key code that was pressed.
+        worker: The SimulationWorker running the invasion.
+        restart: A function that creates the engine for a new invasion.
+        instrumentation: The instrumentation used to profile the invasion.
+    """
+    if key == pygame.K_SPACE:
+        worker.submit(TurnScheduler.toggle_pause)
+    elif key in (pygame.K_RIGHT, pygame.K_n):
+        worker.submit(TurnScheduler.step)
+    elif key == pygame.K_s:
+        worker.submit(TurnScheduler.stop)
+    elif key == pygame.K_r:
+        def restart_invasion(scheduler):
+            instrumentation.detach()
+            scheduler.restart(restart())
+
+        worker.submit(restart_invasion)
+    elif key in (pygame.K_UP, pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+        worker.submit(TurnScheduler.faster)
+    elif key in (pygame.K_DOWN, pygame.K_MINUS, pygame.K_KP_MINUS):
+        worker.submit(TurnScheduler.slower)
+    elif key == pygame.K_f:
+        worker.submit(lambda scheduler: scheduler.fast_forward(
+            None if scheduler.turns_per_frame is not None else FAST_FORWARD_TURNS))
+    elif key == pygame.K_b:
+        worker.submit(lambda scheduler: scheduler.run_to_budget(
+            None if scheduler.frame_budget is not None else FRAME_BUDGET))
+    elif key == pygame.K_p:
+        def start_profiling(scheduler):
+            # The board is only instrumented while it is being profiled, so it runs at full speed the rest of the time
+            if instrumentation.board is not None:
+                return
+            path = f"profile-turn-{scheduler.engine.turn_count}.txt"
+            instrumentation.attach(scheduler.engine.board)
+            instrumentation.profile(PROFILE_TURNS, path=path)
+            print(f"Profiling the next {PROFILE_TURNS} turns to {path}")
+
+        worker.submit(start_profiling)
+
+
+def main(seed=None, width=None, height=None, human_count=None, zombie_count=None, turns_per_second=2,
+         turns_per_frame=None, frame_budget=None, record=None, keyframe_interval=100, walls=()):
+    """
+    Run the Zombie Invasion in a pygame window.
+
+    The turns are run by a SimulationWorker on a thread of its own.  This loop only handles input and draws the
+    latest frame the worker has published, so the window responds at the same speed however long a turn takes.
+
     Args:
-        board: The game board to populate with zombies
+        seed: An optional seed for the random number generator so that a run can be repeated.
+        width: The number of columns in the grid, defaults to GRID_WIDTH.
+        height: The number of rows in the grid, defaults to GRID_HEIGHT.
+        human_count: The number of humans at the start, defaults to HUMAN_COUNT.
+        zombie_count: The number of zombies at the start, defaults to ZOMBIE_COUNT.
+        turns_per_second: The speed of the invasion.
+        turns_per_frame: If given, fast-forward by this many turns every frame.
+        frame_budget: If given, run as many turns as fit in this many seconds every frame.
+        record: An optional file to record a replay of the first invasion to.
+        keyframe_interval: The number of turns between each snapshot of the whole board in the replay.
+        walls: The (x, y) coordinates of the two ends of every wall to draw on the grid.
     """
-    for _ in range(ZOMBIE_COUNT):
-        while True:
-            try:
-                # Generate random coordinates
-                x = random.randint(0, GRID_WIDTH - 1)
-                y = random.randint(0, GRID_HEIGHT - 1)
-                
-                # Create and add zombie at the random location
-                zombie = Zombie(location=[x, y])
-                board.add_character(zombie, is_initial_placement=True)
-                break
-            except InvalidCoordinateException:
-                # If the space is occupied, try again
-                continue
-
-
-# Populate the board with initial characters
-populate_initial_humans()
-populate_initial_zombies(board)
-
-# Initialize turn counter
-turn_count = 0
-
-while running:
-    # Handle events
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-    # fill the screen with a color to wipe away anything from last frame
-    screen.fill(BACKGROUND_COLOR)
-
-    # Draw the board
-    board.draw()
-
-    # Update the display
-    pygame.display.flip()
-
-    # Check if all humans are gone
-    if board.count_humans() == 0:
-        print(f"Game Over - All humans have been converted to zombies in {turn_count} turns!")
-        running = False
-    else:
-        # Only process the next turn if the game is still running
-        board.commence_turn()
-        turn_count += 1
-
-    dt = clock.tick(2) / 1000  # limits FPS to 2
-
-# Quit pygame
-pygame.quit()
\ No newline at end of file
+    # pygame setup
+    pygame.init()
+    screen = pygame.display.set_mode((1280, 720))
+    clock = pygame.time.Clock()
+    running = True
+
+    def restart():
+        return new_invasion(seed, width, height, human_count, zombie_count, walls)
+
+    engine = restart()
+    recorder = engine.record(record, keyframe_interval) if record is not None else None
+    scheduler = TurnScheduler(engine, turns_per_second=turns_per_second, turns_per_frame=turns_per_frame,
+                              frame_budget=frame_budget)
+    instrumentation = Instrumentation()
+    reported = False
+    print(CONTROLS)
+
+    def on_update(scheduler):
+        """Runs on the worker thread after every update, between turns."""
+        nonlocal reported, recorder
+        if instrumentation.board is not None and not instrumentation.is_profiling():
+            print(instrumentation.format_summary())
+            instrumentation.detach()
+
+        # Check if all humans are gone, the window stays open so that the invasion can be restarted
+        if not scheduler.engine.is_over():
+            reported = False
+        elif not reported:
+            print(f"Game Over - All humans have been converted to zombies in {scheduler.engine.turn_count} turns!")
+            scheduler.stop()
+            reported = True
+            instrumentation.detach()
+
+        # Only the first invasion is recorded, the recording ends when it is restarted
+        if recorder is not None and scheduler.engine is not engine:
+            recorder.close()
+            recorder = None
+
+    worker = SimulationWorker(scheduler, tick=1 / FRAMES_PER_SECOND, on_update=on_update)
+    view = FrameView(screen, engine.board.width, engine.board.height)
+    # While the invasion is being profiled the time taken to draw each frame is recorded too
+    draw = instrumentation.time_draw(view.draw)
+    worker.start()
+
+    while running:
+        # Handle events
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                handle_key(event.key, worker, restart, instrumentation)
+
+        # Stop with the worker's error rather than showing its last frame forever
+        worker.check()
+
+        # Draw the latest frame, only the parts of the screen that changed since the last frame are redrawn
+        frame = worker.latest()
+        view.show(frame)
+        pygame.display.update(draw())
+
+        caught = f", {frame.conversions} caught last turn" if frame.conversions is not None else ""
+        pygame.display.set_caption(
+            f"Zombie Invasion - turn {frame.turn}, {frame.humans} humans, {frame.zombies} zombies{caught} - "
+            f"{frame.description}"
+        )
+
+        clock.tick(FRAMES_PER_SECOND)
+
+    # Wait for the turn being run to finish, so the replay isn't closed part way through it
+    worker.stop()
+    if recorder is not None:
+        recorder.close()
+
+    # Quit pygame
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark showing that the cost of a turn does not grow with the area of the board.
+
+The population is kept the same on every board so that any change in the cost of a turn comes from the size of the
+board alone.  Run it from the root of the repository:
+
+    python -m benchmarks.bench_location_index
+"""
+import argparse
+import time
+
+from simulation.board import Board
+from simulation.engine import SimulationEngine
+
+
+def time_turns(size, human_count, zombie_count, turns, seed):
+    """
+    Time a number of turns on a square board.
+
+    Args:
+        size: The width and height of the board.
+        human_count: The number of humans at the start.
+        zombie_count: The number of zombies at the start.
+        turns: The number of turns to time.
+        seed: The seed for the random number generator.
+
+    Returns:
+        float: The mean wall clock time of a turn in seconds.
+    """
+    engine = SimulationEngine(Board(width=size, height=size), human_count=human_count,
+                              zombie_count=zombie_count, seed=seed)
+    engine.populate()
+
+    start = time.perf_counter()
+    engine.run(max_turns=turns)
+    return (time.perf_counter() - start) / max(engine.turn_count, 1)
+
+
+def main(argv=None):
+    """Run the benchmark and print the mean cost of a turn for each board size."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 200, 350, 500])
+    parser.add_argument("--humans", type=int, default=200)
+    parser.add_argument("--zombies", type=int, default=5)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    print(f"{'board':>11} {'cells':>9} {'ms/turn':>9}")
+    for size in args.sizes:
+        per_turn = time_turns(size, args.humans, args.zombies, args.turns, args.seed)
+        print(f"{size:>5}x{size:<5} {size * size:>9} {per_turn * 1000:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
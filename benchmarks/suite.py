@@ -0,0 +1,381 @@
+"""
+Benchmark suite measuring turn throughput, time to extinction and peak memory of headless invasions.
+
+Every scenario is run in a fresh process so that its peak memory isn't inflated by the scenarios run before it.  The
+results can be written out as JSON and compared against a stored baseline to see whether a change helped or hurt.
+Run it from the root of the repository:
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --baseline results.json
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from simulation.instrumentation import PhaseClock
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - resource isn't available on Windows
+    resource = None
+
+# The format of the JSON results, bumped whenever a field changes meaning
+RESULTS_VERSION = 1
+
+
+class Scenario:
+    """The size of the board, the starting populations and how long to run for."""
+    def __init__(self, name, width, height, human_count, zombie_count, turns=None, max_turns=10000, phase_turns=5):
+        """
+        Initialise a scenario.
+
+        Args:
+            name: The name the scenario is picked and reported by.
+            width: The number of columns on the board.
+            height: The number of rows on the board.
+            human_count: The number of humans at the start.
+            zombie_count: The number of zombies at the start.
+            turns: The number of turns to time, or None to run until the humans are wiped out.
+            max_turns: The most turns to run when running until the humans are wiped out.
+            phase_turns: The number of extra turns run to break the cost of a turn down into its phases.
+        """
+        self.name = name
+        self.width = width
+        self.height = height
+        self.human_count = human_count
+        self.zombie_count = zombie_count
+        self.turns = turns
+        self.max_turns = max_turns
+        self.phase_turns = phase_turns
+
+    def parameters(self):
+        """
+        The parameters of the scenario.
+
+        Returns:
+            dict: The width, height, human_count and zombie_count.
+        """
+        return {
+            "width": self.width,
+            "height": self.height,
+            "human_count": self.human_count,
+            "zombie_count": self.zombie_count,
+        }
+
+
+SCENARIOS = {
+    scenario.name: scenario for scenario in (
+        Scenario("default", 40, 20, 60, 3),
+        Scenario("small", 100, 100, 1000, 10, turns=100),
+        Scenario("medium", 250, 250, 10000, 100, turns=20),
+        Scenario("large", 500, 500, 100000, 1000, turns=5, phase_turns=2),
+        Scenario("huge", 1000, 1000, 1000000, 1000, turns=2, phase_turns=1),
+    )
+}
+
+# The huge scenario needs several gigabytes of memory with the object engine, so it is only run when asked for
+DEFAULT_SCENARIOS = ["default", "small", "medium", "large"]
+
+
+def create_engine(engine, parameters, seed):
+    """
+    Create and populate an engine for a scenario.
+
+    Args:
+        engine: The name of the engine, "object", "numpy" or "striped".
+        parameters: The parameters of the scenario.
+        seed: The seed for the random number generator.
+
+    Returns:
+        The populated engine.
+    """
+    if engine == "numpy":
+        from simulation.vectorized import VectorizedEngine
+
+        simulation = VectorizedEngine(seed=seed, **parameters)
+    elif engine == "striped":
+        from simulation.striped import StripedEngine
+
+        simulation = StripedEngine(seed=seed, **parameters)
+    else:
+        from simulation.board import Board
+        from simulation.engine import SimulationEngine
+
+        simulation = SimulationEngine(
+            Board(width=parameters["width"], height=parameters["height"]),
+            human_count=parameters["human_count"],
+            zombie_count=parameters["zombie_count"],
+            seed=seed,
+        )
+    simulation.populate()
+    return simulation
+
+
+def phase_methods(engine):
+    """
+    The methods whose time is charged to each phase of a turn.
+
+    Args:
+        engine: The name of the engine, "object", "numpy" or "striped".
+
+    Returns:
+        list: (class, method name, phase) for every method to time.
+    """
+    if engine == "striped":
+        # The phases are played in the worker processes, where they can't be timed from here
+        return []
+    if engine == "numpy":
+        from simulation.vectorized import VectorizedEngine
+
+        return [
+            (VectorizedEngine, "_move_humans", "human_moves"),
+            (VectorizedEngine, "_move_zombies", "zombie_moves"),
+            (VectorizedEngine, "_convert_humans_sharing_with_zombies", "conversions"),
+        ]
+
+    from characters.human import Human
+    from characters.zombie import Zombie
+    from simulation.board import Board
+
+    return [
+        (Human, "decide", "human_moves"),
+        (Zombie, "decide", "zombie_moves"),
+        (Board, "_apply_moves", "apply_moves"),
+        (Board, "_resolve_collisions", "conversions"),
+    ]
+
+
+def time_phases(simulation, engine, turns):
+    """
+    Run a number of turns, breaking the time they took down into phases.
+
+    Args:
+        simulation: The populated engine.
+        engine: The name of the engine, "object", "numpy" or "striped".
+        turns: The number of turns to run.
+
+    Returns:
+        dict: The mean number of seconds per turn spent on each phase.  Time outside every phase is "other".
+    """
+    clock = PhaseClock()
+    methods = phase_methods(engine)
+    originals = [(cls, name, cls.__dict__[name]) for cls, name, _ in methods]
+    for cls, name, phase in methods:
+        setattr(cls, name, clock.wrap(cls.__dict__[name], phase))
+
+    ran = 0
+    try:
+        for _ in range(turns):
+            if simulation.is_over():
+                break
+            clock.enter("other")
+            simulation.commence_turn()
+            clock.exit()
+            ran += 1
+    finally:
+        for cls, name, original in originals:
+            setattr(cls, name, original)
+
+    return {phase: total / max(ran, 1) for phase, total in sorted(clock.totals.items())}
+
+
+def peak_memory():
+    """
+    The peak resident memory of this process.
+
+    Returns:
+        int: The peak in bytes, or None where it can't be measured.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes while macOS reports bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_scenario(scenario, engine="object", seed=1):
+    """
+    Run a single scenario.
+
+    Args:
+        scenario: The Scenario to run.
+        engine: The name of the engine, "object", "numpy" or "striped".
+        seed: The seed for the random number generator.
+
+    Returns:
+        dict: The results of the scenario.
+    """
+    start = time.perf_counter()
+    simulation = create_engine(engine, scenario.parameters(), seed)
+    setup_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if scenario.turns is None:
+        simulation.run(max_turns=scenario.max_turns)
+    else:
+        simulation.run(max_turns=scenario.turns)
+    run_seconds = time.perf_counter() - start
+    turns = simulation.turn_count
+    extinct = simulation.is_over()
+
+    # The phase breakdown is timed separately so that the cost of timing every phase doesn't slow the main run
+    phases = {}
+    if scenario.phase_turns:
+        phase_simulation = simulation if not extinct else create_engine(engine, scenario.parameters(), seed)
+        phases = time_phases(phase_simulation, engine, scenario.phase_turns)
+        if hasattr(phase_simulation, "close"):
+            phase_simulation.close()
+
+    return {
+        "scenario": scenario.name,
+        "engine": engine,
+        "seed": seed,
+        **scenario.parameters(),
+        "setup_seconds": setup_seconds,
+        "turns": turns,
+        "seconds": run_seconds,
+        "turns_per_second": turns / run_seconds if run_seconds > 0 else None,
+        "seconds_per_turn": run_seconds / turns if turns else None,
+        "extinct": extinct,
+        "time_to_extinction": run_seconds if extinct else None,
+        "turns_to_extinction": turns if extinct else None,
+        "phase_seconds_per_turn": phases,
+        "peak_memory_bytes": peak_memory(),
+    }
+
+
+def run_suite(names, engine="object", seed=1, isolate=True):
+    """
+    Run a number of scenarios.
+
+    Args:
+        names: The names of the scenarios to run.
+        engine: The name of the engine, "object", "numpy" or "striped".
+        seed: The seed for the random number generator.
+        isolate: Run every scenario in a fresh process so that their peak memory can be told apart.
+
+    Returns:
+        dict: The results of every scenario along with details of the machine they were run on.
+    """
+    results = []
+    for name in names:
+        scenario = SCENARIOS[name]
+        if isolate:
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                results.append(executor.submit(run_scenario, scenario, engine, seed).result())
+        else:
+            results.append(run_scenario(scenario, engine, seed))
+
+    return {
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scenarios": results,
+    }
+
+
+def compare(results, baseline, tolerance=0.1):
+    """
+    Compare the throughput of results against a baseline.
+
+    Args:
+        results: The results of run_suite.
+        baseline: Results of run_suite from an earlier run.
+        tolerance: How much faster or slower a scenario has to be, as a fraction, before it counts as a change.
+
+    Returns:
+        list: A dict for every scenario in both, with the scenario, engine, the turns per second of both, their ratio
+              and a verdict of "faster", "slower" or "same".
+    """
+    previous = {(result["scenario"], result["engine"]): result for result in baseline["scenarios"]}
+    comparisons = []
+    for result in results["scenarios"]:
+        before = previous.get((result["scenario"], result["engine"]))
+        if before is None or not before["turns_per_second"] or not result["turns_per_second"]:
+            continue
+        ratio = result["turns_per_second"] / before["turns_per_second"]
+        if ratio > 1 + tolerance:
+            verdict = "faster"
+        elif ratio < 1 - tolerance:
+            verdict = "slower"
+        else:
+            verdict = "same"
+        comparisons.append({
+            "scenario": result["scenario"],
+            "engine": result["engine"],
+            "baseline_turns_per_second": before["turns_per_second"],
+            "turns_per_second": result["turns_per_second"],
+            "ratio": ratio,
+            "verdict": verdict,
+        })
+    return comparisons
+
+
+def print_results(results):
+    """Print a table of the results of run_suite."""
+    print(f"{'scenario':<10} {'engine':<7} {'board':>11} {'humans':>8} {'turns':>6} {'turns/s':>10} "
+          f"{'extinct':>8} {'peak MB':>8}  phases (ms/turn)")
+    for result in results["scenarios"]:
+        board = f"{result['width']}x{result['height']}"
+        rate = f"{result['turns_per_second']:.2f}" if result["turns_per_second"] else "-"
+        memory = f"{result['peak_memory_bytes'] / 2 ** 20:.0f}" if result["peak_memory_bytes"] else "-"
+        phases = " ".join(f"{phase}={seconds * 1000:.2f}"
+                          for phase, seconds in result["phase_seconds_per_turn"].items())
+        print(f"{result['scenario']:<10} {result['engine']:<7} {board:>11} {result['human_count']:>8} "
+              f"{result['turns']:>6} {rate:>10} {str(result['extinct']):>8} {memory:>8}  {phases}")
+
+
+def print_comparisons(comparisons):
+    """Print a table of the comparisons made by compare."""
+    print(f"{'scenario':<10} {'engine':<7} {'baseline/s':>11} {'now/s':>11} {'ratio':>7}  verdict")
+    for comparison in comparisons:
+        print(f"{comparison['scenario']:<10} {comparison['engine']:<7} "
+              f"{comparison['baseline_turns_per_second']:>11.2f} {comparison['turns_per_second']:>11.2f} "
+              f"{comparison['ratio']:>7.2f}  {comparison['verdict']}")
+
+
+def main(argv=None):
+    """
+    Run the benchmark suite.
+
+    Returns:
+        int: 1 if any scenario was slower than the baseline, otherwise 0.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS) + ["all"], default=DEFAULT_SCENARIOS)
+    parser.add_argument("--engine", choices=["object", "numpy", "striped"], default="object")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare the results against this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="The fraction turns/s has to change by before it counts as faster or slower")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Run every scenario in this process, peak memory is then the peak of all of them")
+    args = parser.parse_args(argv)
+
+    names = list(SCENARIOS) if "all" in args.scenarios else args.scenarios
+    results = run_suite(names, engine=args.engine, seed=args.seed, isolate=not args.in_process)
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            comparisons = compare(results, json.load(baseline), args.tolerance)
+        print()
+        print_comparisons(comparisons)
+        if any(comparison["verdict"] == "slower" for comparison in comparisons):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
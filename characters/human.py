@@ -1,20 +1,17 @@
 """The Human character class."""
-import glob
 import random
-from copy import copy
-
-from pygame import image
 
 from characters.base import BaseCharacter
-from constants import HUMAN_PACES
-from ui.board import InvalidCoordinateException
+from characters.roles import HUMAN, SHARES_SPACE
+from exceptions import InvalidCoordinateException
+from simulation.config import DIRECTIONS
 
 
 class Human(BaseCharacter):
     """
     A human character has the following behaviour.
 
-    Each turn each Human will walk HUMAN_PACES paces in a random direction (N,NE,E,SE,S,SW,W,NW)
+    Each turn each Human will walk its config's human_paces paces in a random direction (N,NE,E,SE,S,SW,W,NW)
     if a pace places them beyond the grid or bumps into a wall then the pace is not taken and is forfeit.
 
     Humans may occupy space with other Humans.
@@ -22,6 +19,9 @@ class Human(BaseCharacter):
     If a Human occupies the same space as a Zombie then the Human will turn into a Zombie and contiune behaving
     as one.
     """
+    image_pattern = "assets/character-human*"
+    role = HUMAN
+
     def __init__(self, **kwargs):
         """Initialize a Human character."""
         super(Human, self).__init__(**kwargs)
@@ -38,61 +38,71 @@ class Human(BaseCharacter):
             bool: True if this human will share space with the other character
         """
         # Humans can share space with other humans and zombies
-        return other_character.__class__.__name__ in ['Human', 'Zombie']
+        return SHARES_SPACE[HUMAN][other_character.role]
+
+    @staticmethod
+    def movement_direction(rng=random):
+        """
+        Randomly choose a compass direction for the character to move in.
 
-    @classmethod
-    def image_assets(cls):
+        Args:
+            rng: The random number generator to choose with, the board's generator when the human is on a board.
         """
-        Returns a list of assets for human characters.
+        return rng.choice(DIRECTIONS)
+
+    def destination(self, direction):
         """
-        return glob.glob("assets/character-human*")
+        The square a turn's walk away in a direction, ignoring anything in the way.
+
+        Args:
+            direction: The compass direction to walk in.
 
-    def _load_image(self):
+        Returns:
+            tuple: The (x, y) coordinates of the square.
         """
-        Load the image used for the Sprite for this character
+        dx, dy = self.config.human_steps[direction]
+        x, y = self.location
+        return (x + dx, y + dy)
+
+    def move(self, rng=random):
         """
-        self.image = image.load(random.choice(self.image_assets()))
+        Move the human to a new space.
 
-    @staticmethod
-    def movement_direction():
-        """Randomly choose a compass direction for the character to move in."""
-        return random.choice(["N", "NE", "E", "SE", "S", "SW", "W", "NW"])
-
-    def move(self):
-        """Move the human to a new space."""
-        self.previous_location = copy(self.location)
-        direction = self.movement_direction()
-        if direction == "N":
-            self.location[1] += -HUMAN_PACES
-        elif direction == "NE":
-            self.location[0] += HUMAN_PACES
-            self.location[1] += -HUMAN_PACES
-        elif direction == "E":
-            self.location[0] += HUMAN_PACES
-        elif direction == "SE":
-            self.location[0] += HUMAN_PACES
-            self.location[1] += HUMAN_PACES
-        elif direction == "S":
-            self.location[1] += HUMAN_PACES
-        elif direction == "SW":
-            self.location[0] += -HUMAN_PACES
-            self.location[1] += HUMAN_PACES
-        elif direction == "W":
-            self.location[0] += -HUMAN_PACES
-        elif direction == "NW":
-            self.location[0] += -HUMAN_PACES
-            self.location[1] += -HUMAN_PACES
+        Args:
+            rng: The random number generator used to choose the direction.
+        """
+        self.previous_location = self.location
+        self.location = self.destination(self.movement_direction(rng))
+
+    def decide(self, board, direction=None):
+        """
+        Choose where to walk this turn, without changing the board.
+
+        A pace that would leave the grid or walk into a wall is forfeit, along with every pace after it.
+
+        Args:
+            board: The board that this character is contained within.
+            direction: The direction to walk in.  During the board's turn the directions of every human are drawn
+                       at once and handed out, otherwise one is drawn from the board's generator.
+
+        Returns:
+            tuple: The (x, y) coordinates of the square the human will walk to.
+        """
+        if direction is None:
+            direction = self.movement_direction(board.random)
+        return board.walk(self.location, self.destination(direction))
 
     def commence_turn(self, board):
         """
-        This is the main game loop where each turn all characters on the board get to have a 'turn'.
+        Take a turn on its own, outside of the board's turn.
 
-        Each turn a Human character will attempt to walk a number of HUMAN_PACES paces in a random direction
+        Each turn a Human character will attempt to walk its config's human_paces paces in a random direction
 
         Args:
             board: The board that this character is contained within.
         """
-        self.move()
+        self.previous_location = self.location
+        self.location = self.decide(board)
         try:
             board.move_character(self)
         except InvalidCoordinateException:
@@ -0,0 +1,25 @@
+"""The roles characters play, and which roles can share a square."""
+# Every character has one of these roles, they are small integers so that they can index lists and be stored as a
+# single byte in replays and checkpoints
+HUMAN = 0
+ZOMBIE = 1
+ROLE_NAMES = ("human", "zombie")
+
+# The order the roles take their turn in, every character of a role moves before any character of the next, so zombies
+# hunt the humans where they are after they have walked
+TURN_ORDER = (HUMAN, ZOMBIE)
+
+# SHARES_SPACE[role][other] is True when a character of the role will share a square with a character of the other
+SHARES_SPACE = (
+    # Humans share with other humans, and with zombies so that they can be caught
+    (True, True),
+    # Zombies only share with humans, which they turn into zombies
+    (True, False),
+)
+
+# BLOCKED_BY[role] are the roles that stop a character of the role entering a square, because one of them won't share
+# it with the other
+BLOCKED_BY = tuple(
+    tuple(other for other in range(len(ROLE_NAMES)) if not (SHARES_SPACE[role][other] and SHARES_SPACE[other][role]))
+    for role in range(len(ROLE_NAMES))
+)
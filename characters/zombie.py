@@ -1,30 +1,37 @@
 """The Zombie character class."""
-import glob
-import random
-from copy import copy
-import math
-
-from pygame import image
 
 from characters.base import BaseCharacter
-from constants import ZOMBIE_PACES
+from characters.roles import HUMAN, ZOMBIE, SHARES_SPACE
 from exceptions import InvalidCoordinateException
+from simulation.config import DIRECTIONS
+from simulation.distance_field import NEIGHBOUR_OFFSETS
+
+# The compass direction of a single pace to each of the neighbouring cells
+STEP_DIRECTIONS = dict(zip(NEIGHBOUR_OFFSETS, DIRECTIONS))
 
 
 class Zombie(BaseCharacter):
     """
     A zombie character has the following behaviour.
 
-    Each turn each Zombie will walk ZOMBIE_PACES paces towards the nearest Human.
+    Each turn each Zombie will walk its config's zombie_paces paces towards the nearest Human (measured in paces).
+    If there are multiple Humans the same distance away then the Zombie will hunt one at random unless the Human that
+    the Zombie hunted last turn is amongst the nearest Humans, if so the Zombie will continue to hunt the same Human.
     If a pace places them beyond the grid or bumps into a wall then the pace is not taken and is forfeit.
 
     Zombies may occupy space with other Zombies.
 
     If a Zombie occupies the same space as a Human then the Human will turn into a Zombie.
     """
+    image_pattern = "assets/character-zombie*"
+    role = ZOMBIE
+    # The WalkingSearch the target was found with this turn, when the board has walls but no distance field
+    _route = None
+
     def __init__(self, **kwargs):
         """Initialize a Zombie character."""
         super(Zombie, self).__init__(**kwargs)
+        self.target = None
 
     def will_share_space(self, other_character):
         """
@@ -38,24 +45,32 @@ class Zombie(BaseCharacter):
             bool: True if this zombie will share space with the other character
         """
         # Zombies can only share space with humans (for conversion)
-        return other_character.__class__.__name__ == 'Human'
+        return SHARES_SPACE[ZOMBIE][other_character.role]
 
     @classmethod
-    def image_assets(cls):
+    def convert(cls, human):
         """
-        Returns a list of assets for zombie characters.
-        """
-        return glob.glob("assets/character-zombie*")
+        Turn a human into a zombie, in place.
 
-    def _load_image(self):
-        """
-        Load the image used for the Sprite for this character
+        The character stays the same object, with the same id and location, it only starts behaving as a zombie.
+
+        Args:
+            human: The human to turn into a zombie.
+
+        Returns:
+            Zombie: The character, now a zombie.
         """
-        self.image = image.load(random.choice(self.image_assets()))
+        human.__class__ = cls
+        human.target = None
+        return human
 
     def _find_nearest_human(self, board):
         """
-        Find the nearest human on the board.
+        Find the nearest human on the board and make it the target of the hunt.
+
+        The nearest humans are read from the distance field the board shares between all of its zombies.  When there
+        are too few zombies for the board to build one they are found with a spatial query, or on a board with walls
+        by searching outwards from the zombie around the walls.
         
         Args:
             board: The board containing all characters
@@ -63,25 +78,48 @@ class Zombie(BaseCharacter):
         Returns:
             tuple: The location of the nearest human, or None if no humans exist
         """
-        nearest_human = None
-        min_distance = float('inf')
-        
-        for character in board.character_list:
-            if character.__class__.__name__ == 'Human':
-                distance = math.sqrt(
-                    (character.location[0] - self.location[0])**2 +
-                    (character.location[1] - self.location[1])**2
-                )
-                if distance < min_distance:
-                    min_distance = distance
-                    nearest_human = character.location
-                    
-        return nearest_human
+        field = board.distance_field()
+        self._route = None
+        target = self.target
+        target_location = board.character_locations.get(target) if target is not None and target.role == HUMAN else None
+
+        if field is not None:
+            if field.distance_at(self.location) is None:
+                self.target = None
+                return None
+
+            # Keep hunting the same human for as long as it is amongst the nearest
+            if target_location is None or not field.is_nearest(self.location, target_location):
+                self.target = field.label_at(self.location)
+        elif board.walls:
+            self._route = board.walking_search(self.location)
+            if self._route.distance is None:
+                self.target = None
+                return None
+
+            # Keep hunting the same human for as long as it is amongst the nearest
+            if self.target not in self._route.nearest:
+                self.target = board.random.choice(self._route.nearest)
+        else:
+            _, nearest_humans = board.nearest_characters(self.location, HUMAN)
+
+            if not nearest_humans:
+                self.target = None
+                return None
+
+            # Keep hunting the same human for as long as it is amongst the nearest
+            if self.target not in nearest_humans:
+                self.target = board.random.choice(nearest_humans)
+
+        return self.target.location
 
     def movement_direction(self, board):
         """
         Determine the direction to move towards the nearest human.
         If no humans exist, move randomly.
+
+        The zombie steps to whichever neighbouring cell is the fewest paces from a human, favouring the cell that
+        heads most directly towards the human it is hunting.
         
         Args:
             board: The board containing all characters
@@ -92,60 +130,72 @@ class Zombie(BaseCharacter):
         nearest_human = self._find_nearest_human(board)
         
         if nearest_human is None:
-            return random.choice(["N", "NE", "E", "SE", "S", "SW", "W", "NW"])
-            
-        dx = nearest_human[0] - self.location[0]
-        dy = nearest_human[1] - self.location[1]
-        
-        # Determine primary direction (horizontal or vertical)
-        if abs(dx) >= abs(dy):
-            # Move horizontally
-            if dx > 0:
-                return "E"
-            else:
-                return "W"
+            return board.random.choice(DIRECTIONS)
+
+        field = board.distance_field()
+        if field is not None:
+            step = field.downhill(self.location, towards=nearest_human)
+        elif self._route is not None:
+            step = self._route.first_step(nearest_human)
         else:
-            # Move vertically
-            if dy > 0:
-                return "S"
-            else:
-                return "N"
+            step = None
+        if step is None:
+            # Without a distance field, or when no neighbouring cell is any closer to a human, head straight for the
+            # one being hunted.  Where nothing is in the way this is the same step the distance field would give
+            step = (
+                (nearest_human[0] > self.location[0]) - (nearest_human[0] < self.location[0]),
+                (nearest_human[1] > self.location[1]) - (nearest_human[1] < self.location[1]),
+            )
+            if step == (0, 0):
+                return board.random.choice(DIRECTIONS)
+
+        return STEP_DIRECTIONS[step]
+
+    def destination(self, direction):
+        """
+        The square a turn's walk away in a direction, ignoring anything in the way.
+
+        Args:
+            direction: The compass direction to walk in.
+
+        Returns:
+            tuple: The (x, y) coordinates of the square.
+        """
+        dx, dy = self.config.zombie_steps[direction]
+        x, y = self.location
+        return (x + dx, y + dy)
 
     def move(self, board):
         """Move the zombie towards the nearest human."""
-        self.previous_location = copy(self.location)
-        direction = self.movement_direction(board)
-        if direction == "N":
-            self.location[1] += -ZOMBIE_PACES
-        elif direction == "NE":
-            self.location[0] += ZOMBIE_PACES
-            self.location[1] += -ZOMBIE_PACES
-        elif direction == "E":
-            self.location[0] += ZOMBIE_PACES
-        elif direction == "SE":
-            self.location[0] += ZOMBIE_PACES
-            self.location[1] += ZOMBIE_PACES
-        elif direction == "S":
-            self.location[1] += ZOMBIE_PACES
-        elif direction == "SW":
-            self.location[0] += -ZOMBIE_PACES
-            self.location[1] += ZOMBIE_PACES
-        elif direction == "W":
-            self.location[0] += -ZOMBIE_PACES
-        elif direction == "NW":
-            self.location[0] += -ZOMBIE_PACES
-            self.location[1] += -ZOMBIE_PACES
+        self.previous_location = self.location
+        self.location = self.destination(self.movement_direction(board))
+
+    def decide(self, board):
+        """
+        Choose the human to hunt and where to walk this turn, without changing the board.
+
+        A pace that would leave the grid or walk into a wall is forfeit, along with every pace after it.  Whether the
+        square is free of other zombies is only settled once every character has decided.
+
+        Args:
+            board: The board that this character is contained within.
+
+        Returns:
+            tuple: The (x, y) coordinates of the square the zombie will try to walk to.
+        """
+        return board.walk(self.location, self.destination(self.movement_direction(board)))
 
     def commence_turn(self, board):
         """
-        This is the main game loop where each turn all characters on the board get to have a 'turn'.
+        Take a turn on its own, outside of the board's turn.
 
-        Each turn a Zombie character will attempt to walk a number of ZOMBIE_PACES paces towards the nearest human
+        Each turn a Zombie character will attempt to walk its config's zombie_paces paces towards the nearest human
 
         Args:
             board: The board that this character is contained within.
         """
-        self.move(board)
+        self.previous_location = self.location
+        self.location = self.decide(board)
         try:
             board.move_character(self)
         except InvalidCoordinateException:
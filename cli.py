@@ -0,0 +1,396 @@
+"""Command line entry point for the Zombie Invasion."""
+import argparse
+import sys
+
+from constants import GRID_WIDTH, GRID_HEIGHT, HUMAN_COUNT, ZOMBIE_COUNT
+
+
+def wall(text):
+    """
+    Parse a wall given on the command line.
+
+    Args:
+        text: The cells at the two ends of the wall as "X1,Y1:X2,Y2", or a single cell as "X,Y".
+
+    Returns:
+        tuple: The (x, y) coordinates of the two ends of the wall.
+
+    Raises:
+        argparse.ArgumentTypeError: If the wall isn't in either form.
+    """
+    try:
+        ends = [tuple(int(number) for number in end.split(",")) for end in text.split(":")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid wall {text!r}, expected X1,Y1:X2,Y2")
+    if len(ends) == 1:
+        ends *= 2
+    if len(ends) != 2 or any(len(end) != 2 for end in ends):
+        raise argparse.ArgumentTypeError(f"invalid wall {text!r}, expected X1,Y1:X2,Y2")
+    return ends[0], ends[1]
+
+
+def build_parser():
+    """
+    Build the argument parser for the zombie-invasion command.
+
+    Returns:
+        argparse.ArgumentParser: The parser for the command line.
+    """
+    parser = argparse.ArgumentParser(prog="zombie-invasion", description="A simulation of a Zombie Invasion")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run a zombie invasion")
+    run_parser.add_argument("--headless", action="store_true",
+                            help="Run without a display, as fast as the CPU allows")
+    run_parser.add_argument("--seed", type=int, default=None, help="Seed for the random number generator")
+    run_parser.add_argument("--width", type=int, default=GRID_WIDTH, help="Number of columns in the grid")
+    run_parser.add_argument("--height", type=int, default=GRID_HEIGHT, help="Number of rows in the grid")
+    run_parser.add_argument("--humans", type=int, default=HUMAN_COUNT, help="Number of humans at the start")
+    run_parser.add_argument("--zombies", type=int, default=ZOMBIE_COUNT, help="Number of zombies at the start")
+    run_parser.add_argument("--max-turns", type=int, default=None, help="Stop after this many turns")
+    run_parser.add_argument("--wall", type=wall, action="append", default=[], metavar="X1,Y1:X2,Y2",
+                            help="Draw a straight wall between two cells, may be given more than once "
+                                 "(object engine only)")
+    run_parser.add_argument("--engine", choices=["object", "numpy", "striped"], default="object",
+                            help="The engine for a headless run, numpy is much faster for large populations and "
+                                 "striped splits a very large board between several processes.  A seed doesn't give "
+                                 "the same invasion with numpy and striped")
+    run_parser.add_argument("--workers", type=int, default=None,
+                            help="The number of processes the striped engine uses, defaults to the number of CPUs")
+    run_parser.add_argument("--record", default=None, metavar="PATH",
+                            help="Record a replay of the invasion to this file")
+    run_parser.add_argument("--keyframe-interval", type=int, default=100,
+                            help="The number of turns between each snapshot of the whole board in a replay")
+    run_parser.add_argument("--checkpoint", default=None, metavar="PATH",
+                            help="Save a checkpoint of a headless run to this file, so it can be resumed after a crash")
+    run_parser.add_argument("--checkpoint-every", type=int, default=1000, metavar="TURNS",
+                            help="The number of turns between checkpoints")
+    run_parser.add_argument("--resume", default=None, metavar="PATH",
+                            help="Resume a headless run from a checkpoint rather than starting a new invasion")
+    run_parser.add_argument("--metrics", action="append", default=[], metavar="PATH",
+                            help="Stream the metrics of every turn of a headless run to a .csv, .jsonl or .npy file, "
+                                 "may be given more than once")
+    run_parser.add_argument("--instrument", action="store_true",
+                            help="Print the time spent in each phase of a turn at the end of a headless run")
+    run_parser.add_argument("--profile-turns", type=int, default=None, metavar="TURNS",
+                            help="Profile the first TURNS turns of a headless run with cProfile and tracemalloc")
+    run_parser.add_argument("--profile-output", default=None, metavar="PATH",
+                            help="Write the profile to this file rather than printing it")
+    run_parser.add_argument("--speed", type=float, default=2, help="Turns per second when run in a window")
+    pace_group = run_parser.add_mutually_exclusive_group()
+    pace_group.add_argument("--fast-forward", type=int, default=None, metavar="TURNS",
+                            help="Run this many turns every frame when run in a window")
+    pace_group.add_argument("--frame-budget", type=float, default=None, metavar="MS",
+                            help="Run as many turns as fit in this many milliseconds every frame when run in a window")
+
+    replay_parser = subparsers.add_parser("replay", help="Play back a recorded invasion")
+    replay_parser.add_argument("path", help="The replay file")
+    replay_parser.add_argument("--turn", type=int, default=None, help="The turn to start at")
+    replay_parser.add_argument("--speed", type=float, default=2, help="Turns per second")
+
+    fork_parser = subparsers.add_parser("fork", help="Run many what-if continuations of an invasion from a checkpoint")
+    fork_parser.add_argument("checkpoint", help="The checkpoint to continue from")
+    fork_parser.add_argument("--runs", type=int, default=20, help="The number of continuations")
+    fork_parser.add_argument("--seed", type=int, default=0, help="Seed the seed of every continuation is derived from")
+    fork_parser.add_argument("--processes", type=int, default=None, help="Worker processes, defaults to the CPUs")
+    fork_parser.add_argument("--max-turns", type=int, default=None, help="Stop each continuation after this many turns")
+    fork_parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+
+    sweep_parser = subparsers.add_parser("sweep", help="Run many headless invasions over a grid of parameters")
+    sweep_parser.add_argument("--width", type=int, nargs="+", default=[GRID_WIDTH], help="Grid widths to try")
+    sweep_parser.add_argument("--height", type=int, nargs="+", default=[GRID_HEIGHT], help="Grid heights to try")
+    sweep_parser.add_argument("--humans", type=int, nargs="+", default=[HUMAN_COUNT],
+                              help="Starting numbers of humans to try")
+    sweep_parser.add_argument("--zombies", type=int, nargs="+", default=[ZOMBIE_COUNT],
+                              help="Starting numbers of zombies to try")
+    sweep_parser.add_argument("--human-paces", type=int, nargs="+", default=None,
+                              help="Human paces to try")
+    sweep_parser.add_argument("--zombie-paces", type=int, nargs="+", default=None,
+                              help="Zombie paces to try")
+    sweep_parser.add_argument("--replicates", type=int, default=20, help="Runs of every configuration")
+    sweep_parser.add_argument("--processes", type=int, default=None, help="Worker processes, defaults to the CPUs")
+    sweep_parser.add_argument("--engine", choices=["object", "numpy"], default="object")
+    sweep_parser.add_argument("--seed", type=int, default=0, help="Seed the seed of every run is derived from")
+    sweep_parser.add_argument("--max-turns", type=int, default=None, help="Stop each run after this many turns")
+    sweep_parser.add_argument("--ci-tolerance", type=float, default=None,
+                              help="Add replicates until the 95%% confidence interval of the mean is within this "
+                                   "fraction of the mean")
+    sweep_parser.add_argument("--max-replicates", type=int, default=None,
+                              help="The most runs of a configuration when --ci-tolerance is used")
+    sweep_parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+
+    return parser
+
+
+def run_headless(args):
+    """
+    Run a single invasion without a display and print the results.
+
+    Args:
+        args: The parsed command line arguments.
+
+    Returns:
+        dict: The final population statistics.
+    """
+    # main has already refused the options only the object engine supports for the array engines
+    if args.engine == "numpy":
+        from simulation.vectorized import VectorizedEngine
+
+        engine = VectorizedEngine(width=args.width, height=args.height, human_count=args.humans,
+                                  zombie_count=args.zombies, seed=args.seed)
+    elif args.engine == "striped":
+        from simulation.striped import StripedEngine
+
+        engine = StripedEngine(width=args.width, height=args.height, human_count=args.humans,
+                               zombie_count=args.zombies, seed=args.seed, workers=args.workers)
+    elif args.resume:
+        from simulation.checkpoint import load_checkpoint
+
+        engine = load_checkpoint(args.resume)
+    else:
+        from simulation.board import Board
+        from simulation.engine import SimulationEngine
+
+        board = Board(width=args.width, height=args.height)
+        for start, end in args.wall:
+            board.add_walls(start, end)
+        engine = SimulationEngine(board, human_count=args.humans, zombie_count=args.zombies, seed=args.seed)
+    if not args.resume:
+        engine.populate()
+    recorder = None
+    if args.record:
+        recorder = engine.record(args.record, keyframe_interval=args.keyframe_interval)
+
+    instrumentation = None
+    if args.instrument or args.profile_turns:
+        from simulation.instrumentation import Instrumentation
+
+        instrumentation = Instrumentation()
+        instrumentation.attach(engine.board)
+        if args.profile_turns:
+            instrumentation.profile(args.profile_turns, path=args.profile_output)
+    sinks = []
+    if args.metrics:
+        from simulation.metrics import open_sink
+
+        # A resumed run carries on the files from the checkpoint's turn, rather than losing the turns before it
+        resume_turn = engine.turn_count if args.resume else None
+        sinks = [open_sink(path, resume_turn=resume_turn) for path in args.metrics]
+    try:
+        if args.checkpoint:
+            run_with_checkpoints(engine, args.checkpoint, args.checkpoint_every, args.max_turns, sinks=sinks)
+        else:
+            run_turns(engine, args.max_turns, sinks)
+    finally:
+        if instrumentation is not None:
+            instrumentation.detach()
+        if recorder is not None:
+            recorder.close()
+        for sink in sinks:
+            sink.close()
+
+    stats = engine.stats()
+    if engine.is_over():
+        print(f"Game Over - All humans have been converted to zombies in {stats['turns']} turns!")
+    else:
+        print(f"Stopped after {stats['turns']} turns with humans still alive.")
+    print(f"Turns: {stats['turns']}")
+    print(f"Humans: {stats['humans']}")
+    print(f"Zombies: {stats['zombies']}")
+
+    if instrumentation is not None:
+        if args.instrument:
+            print()
+            print(instrumentation.format_summary())
+        if args.profile_turns and args.profile_output is None:
+            for report in instrumentation.reports:
+                print()
+                print(report)
+
+    return stats
+
+
+def run_turns(engine, max_turns=None, sinks=()):
+    """
+    Run an invasion, streaming the metrics of every turn to any sinks.
+
+    Args:
+        engine: The simulation engine to run.
+        max_turns: An optional limit on the number of turns to run.
+        sinks: The MetricsSinks to write a record of every turn to, they are left open.
+    """
+    if not sinks:
+        engine.run(max_turns=max_turns)
+        return
+
+    from simulation.metrics import turn_records
+
+    try:
+        for record in turn_records(engine, max_turns):
+            for sink in sinks:
+                sink.write(record)
+    finally:
+        # The striped engine's workers are stopped by run, which isn't used here
+        close = getattr(engine, "close", None)
+        if close is not None:
+            close()
+
+
+def run_with_checkpoints(engine, path, every, max_turns=None, sinks=()):
+    """
+    Run an invasion, saving a checkpoint every number of turns and once it is over.
+
+    Args:
+        engine: The simulation engine to run.
+        path: The file to save the checkpoints to, each one replaces the last.
+        every: The number of turns between checkpoints.
+        max_turns: An optional limit on the number of turns to run.
+        sinks: The MetricsSinks to write a record of every turn to, they are flushed at every checkpoint.
+    """
+    from simulation.checkpoint import save_checkpoint
+
+    while not engine.is_over() and (max_turns is None or engine.turn_count < max_turns):
+        next_checkpoint = engine.turn_count + every
+        run_turns(engine, next_checkpoint if max_turns is None else min(next_checkpoint, max_turns), sinks)
+        save_checkpoint(engine, path)
+        # So that the metrics on disk reach the checkpoint a resumed run carries on from
+        for sink in sinks:
+            sink.flush()
+
+
+def run_fork(args):
+    """
+    Run continuations of an invasion from a checkpoint and print the distribution of the turns to extinction.
+
+    Args:
+        args: The parsed command line arguments.
+
+    Returns:
+        dict: The summary of the continuations.
+    """
+    import functools
+    import json
+
+    from simulation.checkpoint import load_checkpoint, fork, run_to_extinction
+    from simulation.sweep import replicate_seed, summarise
+
+    engine = load_checkpoint(args.checkpoint)
+    seeds = [replicate_seed(args.seed, 0, run) for run in range(args.runs)]
+    results = fork(engine, seeds, functools.partial(run_to_extinction, max_turns=args.max_turns),
+                   processes=args.processes)
+    summary = {
+        "from_turn": engine.turn_count,
+        **summarise([result["turns"] for result in results]),
+        "unfinished": sum(1 for result in results if result["humans"]),
+    }
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"{args.runs} continuations from turn {engine.turn_count}")
+        interval = f"{summary['ci_low']:.1f}-{summary['ci_high']:.1f}"
+        print(f"Turns to extinction: mean {summary['mean']:.1f} (95% CI {interval}), "
+              f"p5 {summary['p5']:.1f}, p50 {summary['p50']:.1f}, p95 {summary['p95']:.1f}")
+        if summary["unfinished"]:
+            print(f"{summary['unfinished']} continuations hit the turn limit with humans still alive")
+
+    return summary
+
+
+def run_sweep(args):
+    """
+    Run a parameter sweep and print the distribution of turns to extinction for each configuration.
+
+    Args:
+        args: The parsed command line arguments.
+
+    Returns:
+        list: The summary of every configuration.
+    """
+    import json
+
+    from simulation.sweep import parameter_grid, sweep
+
+    parameters = {
+        "width": args.width,
+        "height": args.height,
+        "human_count": args.humans,
+        "zombie_count": args.zombies,
+    }
+    if args.human_paces is not None:
+        parameters["human_paces"] = args.human_paces
+    if args.zombie_paces is not None:
+        parameters["zombie_paces"] = args.zombie_paces
+
+    results = sweep(
+        parameter_grid(**parameters),
+        args.replicates,
+        engine=args.engine,
+        processes=args.processes,
+        base_seed=args.seed,
+        max_turns=args.max_turns,
+        ci_tolerance=args.ci_tolerance,
+        max_replicates=args.max_replicates,
+    )
+    summaries = [result.summary() for result in results]
+
+    if args.json:
+        print(json.dumps(summaries, indent=2))
+    else:
+        print(f"{'parameters':<60} {'runs':>5} {'mean':>8} {'95% CI':>17} {'p5':>6} {'p50':>6} {'p95':>6}")
+        for summary in summaries:
+            label = " ".join(f"{name}={value}" for name, value in summary["parameters"].items())
+            interval = f"{summary['ci_low']:.1f}-{summary['ci_high']:.1f}"
+            print(f"{label:<60} {summary['count']:>5} {summary['mean']:>8.1f} {interval:>17} "
+                  f"{summary['p5']:>6.1f} {summary['p50']:>6.1f} {summary['p95']:>6.1f}")
+
+    return summaries
+
+
+def main(argv=None):
+    """
+    Entry point for the zombie-invasion command.
+
+    Args:
+        argv: The command line arguments, defaults to sys.argv.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == "run" and args.headless and args.engine != "object":
+        # The array engines have no board of characters to resume, record, checkpoint, wall off or instrument, so
+        # these would otherwise be ignored without a word
+        unsupported = [option for option, given in (
+            ("--resume", args.resume is not None),
+            ("--record", args.record is not None),
+            ("--checkpoint", args.checkpoint is not None),
+            ("--wall", bool(args.wall)),
+            ("--instrument", args.instrument),
+            ("--profile-turns", args.profile_turns is not None),
+        ) if given]
+        if unsupported:
+            parser.error(f"{', '.join(unsupported)} can only be used with --engine object")
+
+    if args.command == "run":
+        if args.headless:
+            run_headless(args)
+        else:
+            import app
+
+            frame_budget = args.frame_budget / 1000 if args.frame_budget is not None else None
+            app.main(seed=args.seed, width=args.width, height=args.height,
+                     human_count=args.humans, zombie_count=args.zombies, turns_per_second=args.speed,
+                     turns_per_frame=args.fast_forward, frame_budget=frame_budget, record=args.record,
+                     keyframe_interval=args.keyframe_interval, walls=args.wall)
+    elif args.command == "replay":
+        from ui.replay_viewer import main as view_replay
+
+        view_replay(args.path, turn=args.turn, turns_per_second=args.speed)
+    elif args.command == "fork":
+        run_fork(args)
+    elif args.command == "sweep":
+        run_sweep(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,4 +7,5 @@ ZOMBIE_COUNT = 3
 ZOMBIE_PACES = 1
 
 GRID_COLOR = "black"
-BACKGROUND_COLOR = (50, 50, 50)
\ No newline at end of file
+BACKGROUND_COLOR = (50, 50, 50)
+WALL_COLOR = (140, 110, 80)
@@ -0,0 +1,637 @@
+"""The board an invasion is played out on, and the rules of a turn."""
+import random
+from itertools import islice
+
+from characters.roles import HUMAN, ZOMBIE, ROLE_NAMES, BLOCKED_BY, TURN_ORDER
+from characters.zombie import Zombie
+from exceptions import InvalidCoordinateException, CharacterNotFoundException
+from simulation.config import DEFAULT_CONFIG, DIRECTIONS
+from simulation.distance_field import DistanceField, WalkingSearch
+from simulation.grid import ChunkedGrid
+from simulation.spatial import SpatialIndex
+from simulation.walls import WallMap, bresenham
+
+
+class Board:
+    """
+    The characters on a grid, and the rules they take their turns by.
+
+    Nothing here draws anything, so simulations, sweeps and benchmarks run without pygame ever being imported.  A
+    board is drawn by a ui.frame_view.FrameView, from the frames captured from it between turns.
+    """
+    # The distance field is only worth building once there is at least one zombie for every this many cells, with
+    # fewer zombies it is cheaper for each one to search the spatial index for the humans near it
+    distance_field_cells_per_zombie = 20
+
+    def __init__(self, width=None, height=None, config=None):
+        """
+        Initialisation of the Board object.
+
+        Args:
+            width: The number of columns in the grid, defaults to the config's width.
+            height: The number of rows in the grid, defaults to the config's height.
+            config: The SimulationConfig of the invasion, defaults to DEFAULT_CONFIG.
+        """
+        # Every character on the board walks by the board's config
+        self.config = (DEFAULT_CONFIG if config is None else config).replace(width=width, height=height)
+        self.width = self.config.width
+        self.height = self.config.height
+
+        # The characters in each cell, character_grid[x][y], and the number of each role in every cell.  Only the
+        # parts of the board that characters are in take any memory, so even a huge map is cheap while it is empty
+        self.character_grid = ChunkedGrid(self.width, self.height, len(ROLE_NAMES))
+        self.character_list = []
+        # The authoritative record of which cell each character occupies, kept in step with character_grid by
+        # add_character, move_character and _convert_human_to_zombie so a character can be found without a grid scan
+        self.character_locations = {}
+        # The number of characters of each role on the whole board
+        self.population = [0] * len(ROLE_NAMES)
+        # The number of humans turned into zombies, and of characters killed, since the start of the current turn
+        self.conversions = 0
+        self.kills = 0
+        self.spatial_index = SpatialIndex(self.width, self.height)
+        # The cells that nothing can walk through or see past
+        self.walls = WallMap(self.width, self.height)
+        # Every random choice made during a turn comes from this generator, the simulation engine replaces it with
+        # one seeded from its own seed so that a run can be repeated exactly
+        self.random = random.Random()
+        # The id given to the next character added to the board
+        self.next_id = 0
+        # The distance field zombies use to hunt humans.  It is built once at the start of each turn and shared by
+        # every zombie, outside of a turn it is rebuilt whenever the board changes
+        self._distance_field = None
+        self._distance_field_built = False
+        self._turn_in_progress = False
+
+    def _check_space_sharing(self, character, location):
+        """
+        Check if a character can share space with existing characters at a location.
+        
+        Args:
+            character: The character attempting to move to the location
+            location: The location to check (x, y coordinates)
+            
+        Returns:
+            bool: True if the character can share the space, False otherwise
+            
+        Raises:
+            InvalidCoordinateException: If the location is invalid
+        """
+        x, y = location[0], location[1]
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise InvalidCoordinateException
+
+        # The character can share the space if there is no one there of a role that either won't share with it or
+        # that it won't share with
+        grid = self.character_grid
+        for role in BLOCKED_BY[character.role]:
+            if grid.count(role, x, y):
+                return False
+
+        return True
+
+    def _count_population(self, character, change):
+        """Add change to the number of characters with the role of a character on the board."""
+        self.population[character.role] += change
+
+    def role_count_at(self, location, role):
+        """
+        Count the characters of a role in a cell.
+
+        Args:
+            location: The (x, y) coordinates of the cell.
+            role: The role to count, one of the roles in characters.roles.
+
+        Returns:
+            int: The number of characters of the role in the cell.
+        """
+        return self.character_grid.count(role, location[0], location[1])
+
+    def _convert_human_to_zombie(self, human, location=None):
+        """
+        Convert a human character to a zombie character.
+
+        The human is turned into a zombie in place rather than replaced, so it keeps its identity, id and place in
+        character_list.  Zombies hunting it and anything else holding on to it still refer to the same character,
+        and a conversion costs the same however many characters are on the board.
+        
+        Args:
+            human: The human character to convert
+            location: Optional location for the new zombie. If None, uses human's location.
+            
+        Returns:
+            Zombie: The character, now a zombie
+        """
+        # The human may have been moving to the location of the zombie that caught it, the board still has it where it
+        # was before it moved
+        human_location = self.find_character_location(human)
+        destination = (location[0], location[1]) if location is not None else human_location
+        self._count_population(human, -1)
+        self.spatial_index.remove(human, human_location)
+        moving = destination != human_location
+        if moving:
+            self.character_grid.remove(human, human_location[0], human_location[1])
+
+        zombie = Zombie.convert(human)
+        if moving:
+            zombie.location = destination
+            self.character_grid.add(zombie, destination[0], destination[1])
+            self.character_locations[zombie] = destination
+        else:
+            self.character_grid.change_role(destination[0], destination[1], HUMAN, ZOMBIE)
+
+        self._count_population(zombie, 1)
+        self.spatial_index.add(zombie, destination)
+        self.conversions += 1
+        self._board_changed()
+        
+        return zombie
+
+    def add_character(self, character, is_initial_placement=False):
+        """
+        Add a character to the board.
+
+        Args:
+            character: The character to add.
+            is_initial_placement: Whether this is initial placement (True) or movement/conversion (False)
+            
+        Raises:
+            InvalidCoordinateException: If the location is invalid or space sharing is not allowed
+        """
+        # Whatever the character was given, its location is an (x, y) tuple from now on
+        character.location = (character.location[0], character.location[1])
+        # The grid is only as large as it needs to be, so it can't be relied on to notice a cell off the board
+        x, y = character.location
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise InvalidCoordinateException
+
+        try:
+            if self.walls.is_wall(character.location[0], character.location[1]):
+                raise InvalidCoordinateException
+
+            # For initial placement, only zombies cannot share spaces
+            if is_initial_placement and character.role == ZOMBIE:
+                if self.character_grid.cell(character.location[0], character.location[1]):
+                    raise InvalidCoordinateException
+            else:
+                # For movement/conversion or initial human placement, check space sharing rules
+                if not self._check_space_sharing(character, character.location):
+                    raise InvalidCoordinateException
+
+            self.character_grid.add(character, character.location[0], character.location[1])
+            self._count_population(character, 1)
+            self.character_list.append(character)
+            character.config = self.config
+            if character.id is None:
+                character.id = self.next_id
+                self.next_id += 1
+            self.character_locations[character] = character.location
+            self.spatial_index.add(character, character.location)
+            self._board_changed()
+            
+        except IndexError:
+            raise InvalidCoordinateException
+        
+        return character.location
+
+    def restore(self, characters, cell_order, index_order, next_id):
+        """
+        Put characters back on the board exactly as they were when a checkpoint was taken.
+
+        The order of the characters in each cell and in the spatial index decides which way some random choices go,
+        so it is restored too, which means a resumed run plays out exactly as the original would have.
+
+        Args:
+            characters: The characters in the order of character_list, each with its id and location set.
+            cell_order: The position of each character in the list of its cell.
+            index_order: The position of each character amongst the characters of its class in its spatial index
+                         bucket.
+            next_id: The id to give the next character added to the board.
+        """
+        self.character_list.extend(characters)
+        for character in characters:
+            character.config = self.config
+            character.location = (character.location[0], character.location[1])
+            self.character_locations[character] = character.location
+            self._count_population(character, 1)
+        for order, character in sorted(zip(cell_order, characters), key=lambda pair: pair[0]):
+            self.character_grid.add(character, character.location[0], character.location[1])
+        for order, character in sorted(zip(index_order, characters), key=lambda pair: pair[0]):
+            self.spatial_index.add(character, character.location)
+        self.next_id = next_id
+        self._board_changed()
+
+    def move_character(self, character):
+        """
+        Move the character to its location on the grid.
+
+        The character must be able to walk there in a straight line, a pace at a time, without leaving the grid or
+        walking into a wall.  Characters use walk to find how far they can get before they move.
+
+        Args:
+            character: The character to move.
+            
+        Raises:
+            InvalidCoordinateException: If the location is invalid, a wall is in the way or space sharing is not allowed
+        """
+        start = self.find_character_location(character)
+        destination = self.walk(start, character.location)
+        if destination[0] != character.location[0] or destination[1] != character.location[1]:
+            raise InvalidCoordinateException
+        if destination == start:
+            # A character that stays where it is has nothing to do
+            return
+
+        try:
+            # First check if the character can share the space with existing characters
+            # This needs to happen before any conversions
+            if not self._check_space_sharing(character, character.location):
+                raise InvalidCoordinateException
+
+            # Then handle any human-to-zombie conversions
+            grid = self.character_grid
+            if character.role == ZOMBIE:
+                # If moving character is a zombie, check for humans at destination
+                if grid.count(HUMAN, destination[0], destination[1]):
+                    humans = [existing for existing in grid.cell(destination[0], destination[1])
+                              if existing.role == HUMAN]
+                    for human in humans:
+                        # Convert human to zombie at the destination location
+                        self._convert_human_to_zombie(human)
+            elif character.role == HUMAN:
+                # If moving character is a human, check for zombies at destination
+                if grid.count(ZOMBIE, destination[0], destination[1]):
+                    # Convert human to zombie
+                    self._convert_human_to_zombie(character, destination)
+                    return  # The original character is now a zombie, so we're done
+
+            # Finally, move the character
+            self._relocate(character, start, destination)
+            
+        except IndexError:
+            raise InvalidCoordinateException
+
+    def _relocate(self, character, start, destination):
+        """Move a character from one cell to another in every record of where the characters are."""
+        self.character_grid.add(character, destination[0], destination[1])
+        self.character_grid.remove(character, start[0], start[1])
+        self.character_locations[character] = destination
+        self.spatial_index.move(character, start, destination)
+        self._board_changed()
+
+    def kill_character(self, character):
+        """
+        Remove a character that has been killed from the board.
+
+        Args:
+            character: The character to remove.
+
+        Raises:
+            CharacterNotFoundException: If the character is not on the board.
+        """
+        location = self.find_character_location(character)
+        self.character_grid.remove(character, location[0], location[1])
+        self._count_population(character, -1)
+        self.character_list.remove(character)
+        del self.character_locations[character]
+        self.spatial_index.remove(character, location)
+        self.kills += 1
+        self._board_changed()
+
+    def walk(self, start, destination):
+        """
+        Walk in a straight line towards a cell, a pace at a time, until a pace is blocked.
+
+        Args:
+            start: The (x, y) coordinates to walk from.
+            destination: The (x, y) coordinates to walk to.
+
+        Returns:
+            tuple: The (x, y) coordinates of the last cell reached, which is start if the first pace is blocked.
+        """
+        if not self.walls and 0 <= destination[0] < self.width and 0 <= destination[1] < self.height:
+            # Without walls every pace of a walk that ends on the grid is on the grid too
+            return (destination[0], destination[1])
+        reached = (start[0], start[1])
+        for x, y in islice(bresenham(reached, (destination[0], destination[1])), 1, None):
+            if not self.is_passable(x, y):
+                break
+            reached = (x, y)
+        return reached
+
+    def is_passable(self, x, y):
+        """
+        Check whether a cell can be walked into.
+
+        Returns:
+            bool: True if the cell is on the grid and doesn't hold a wall.
+        """
+        return 0 <= x < self.width and 0 <= y < self.height and not self.walls.is_wall(x, y)
+
+    def add_wall(self, location):
+        """
+        Put a wall in a cell.
+
+        Args:
+            location: The (x, y) coordinates of the cell.
+
+        Raises:
+            InvalidCoordinateException: If the cell is off the grid or a character is standing in it.
+        """
+        x, y = location
+        if not (0 <= x < self.width and 0 <= y < self.height) or self.character_grid.cell(x, y):
+            raise InvalidCoordinateException
+        self.walls.add(x, y)
+        self._walls_changed()
+
+    def add_walls(self, start, end):
+        """
+        Put a wall in every cell on the straight line between two cells.
+
+        Args:
+            start: The (x, y) coordinates of one end of the wall.
+            end: The (x, y) coordinates of the other end of the wall.
+
+        Raises:
+            InvalidCoordinateException: If any of the cells is off the grid or has a character standing in it, in
+                                        which case no wall is added.
+        """
+        cells = list(bresenham(start, end))
+        for x, y in cells:
+            if not (0 <= x < self.width and 0 <= y < self.height) or self.character_grid.cell(x, y):
+                raise InvalidCoordinateException
+        for x, y in cells:
+            self.walls.add(x, y)
+        self._walls_changed()
+
+    def remove_wall(self, location):
+        """Take the wall out of a cell, if there is one."""
+        self.walls.remove(location[0], location[1])
+        self._walls_changed()
+
+    def _walls_changed(self):
+        """Re-route around the walls now that they have changed."""
+        self._distance_field_built = False
+
+    def line_of_sight(self, start, end):
+        """
+        Check whether one cell can be seen from another, or whether a wall is in the way.
+
+        Args:
+            start: The (x, y) coordinates of one cell.
+            end: The (x, y) coordinates of the other.
+
+        Returns:
+            bool: True if no wall lies between the cells.
+        """
+        return self.walls.line_of_sight(start, end)
+
+    def commence_turn(self):
+        """
+        This is the main game loop where each turn all characters on the board get to have a 'turn'.
+
+        The roles take their turn one after another, in TURN_ORDER, and each role's turn happens in three phases:
+        1. Every character of the role decides where to walk, from the board as it stands.  Nothing on the board
+           changes while they decide, so they could decide in any order.
+        2. The characters walk to where they decided to.  A character can't walk into a square that held a character
+           it can't share with before anyone walked, and of several characters that can't share a square walking into
+           the same one only the first to have decided gets there.
+        3. Every human in a square that a character walked into along with a zombie is turned into a zombie.
+
+        Only the characters that had a role at the start of the turn take that role's turn, so humans caught during a
+        turn don't move as zombies until the next one.
+        """
+        self._turn_in_progress = True
+        self.conversions = 0
+        self.kills = 0
+        try:
+            movers = {role: [] for role in TURN_ORDER}
+            for character in self.character_list:
+                movers[character.role].append(character)
+            for role in TURN_ORDER:
+                # Anything worked out from the positions of the characters is worked out afresh for each role
+                self._distance_field_built = False
+                characters = movers[role]
+                # Humans walk in random directions, which are drawn for all of them at once rather than one at a time
+                directions = self.random.choices(DIRECTIONS, k=len(characters)) if role == HUMAN else None
+                moves = self._decide_moves(characters, directions)
+                self._resolve_collisions(self._apply_moves(moves))
+        finally:
+            self._turn_in_progress = False
+            self._distance_field_built = False
+
+    def _decide_moves(self, characters, directions=None):
+        """
+        Ask characters where they will walk this turn.
+
+        Args:
+            characters: The characters to ask.
+            directions: The direction each character is to walk in, if they have already been chosen.
+
+        Returns:
+            list: The character, the cell it is in and the cell it decided to walk to, for every character that decided
+                  to leave its cell.
+        """
+        moves = []
+        locations = self.character_locations
+        if directions is None:
+            for character in characters:
+                start = locations[character]
+                destination = character.decide(self)
+                if destination != start:
+                    moves.append((character, start, destination))
+        else:
+            for character, direction in zip(characters, directions):
+                start = locations[character]
+                destination = character.decide(self, direction)
+                if destination != start:
+                    moves.append((character, start, destination))
+        return moves
+
+    def _apply_moves(self, moves):
+        """
+        Walk the characters to where they decided to.
+
+        Args:
+            moves: The moves returned by _decide_moves.
+
+        Returns:
+            set: The (x, y) coordinates of every cell a character walked into.
+        """
+        # Which moves can go ahead is settled before anyone moves, so it depends on the board at the start of the turn
+        # rather than on the order the moves are made in
+        allowed = []
+        claimed = {}
+        for character, start, destination in moves:
+            if not self._check_space_sharing(character, destination):
+                continue
+            roles = claimed.setdefault(destination, set())
+            if any(role in roles for role in BLOCKED_BY[character.role]):
+                continue
+            roles.add(character.role)
+            allowed.append((character, start, destination))
+
+        for character, start, destination in allowed:
+            character.location = destination
+            self._relocate(character, start, destination)
+
+        return {destination for _, _, destination in allowed}
+
+    def _resolve_collisions(self, cells):
+        """
+        Turn every human sharing a square with a zombie into a zombie.
+
+        Args:
+            cells: The (x, y) coordinates of the cells to check.  Humans and zombies only come together when one of
+                   them walks into the other's square, so only the cells walked into during the turn need checking.
+        """
+        grid = self.character_grid
+        for x, y in cells:
+            if grid.count(HUMAN, x, y) and grid.count(ZOMBIE, x, y):
+                for character in [character for character in grid.cell(x, y) if character.role == HUMAN]:
+                    self._convert_human_to_zombie(character)
+
+    def _board_changed(self):
+        """Discard anything worked out from the positions of the characters now that they have changed."""
+        if not self._turn_in_progress:
+            self._distance_field_built = False
+
+    def distance_field(self):
+        """
+        The number of paces from every cell to the nearest human.
+
+        The field is built with one breadth first search from every human at once and is shared by all the zombies
+        for the rest of the turn, so humans that move later in the turn are hunted where they stood at its start.
+        Building it costs about the same as visiting every cell, so it is only built when there are enough zombies to
+        make that worthwhile.
+
+        Returns:
+            DistanceField: The distance field, labelled with the nearest human to each cell, or None if there are too
+                           few zombies for it to be worth building.
+        """
+        if not self._distance_field_built:
+            self._distance_field_built = True
+            self._distance_field = None
+            humans = []
+            zombie_locations = []
+            for character in self.character_list:
+                if character.role == HUMAN:
+                    humans.append((character, self.character_locations[character]))
+                elif character.role == ZOMBIE:
+                    zombie_locations.append(self.character_locations[character])
+            # The field costs about as much as visiting every cell, walls or not, so it is only built when there are
+            # enough zombies to share it.  With fewer, each zombie finds its own way around walls with walking_search
+            if len(zombie_locations) * self.distance_field_cells_per_zombie < self.width * self.height:
+                return None
+            # Shuffling the humans means a cell that is the same distance from several humans is labelled with one of
+            # them at random
+            self.random.shuffle(humans)
+            self._distance_field = DistanceField(self.width, self.height, humans,
+                                                 is_passable=self.is_passable if self.walls else None,
+                                                 stop_after=zombie_locations)
+
+        return self._distance_field
+
+    def walking_search(self, location):
+        """
+        Find the humans fewest paces from a cell, walking around the walls.
+
+        This is how a zombie finds its way around walls when there are too few zombies for a distance field to be
+        built.  Only the cells nearer to the cell than the nearest human are visited, so it stays cheap on a huge,
+        mostly empty board.
+
+        Args:
+            location: The (x, y) coordinates of the cell to search from.
+
+        Returns:
+            WalkingSearch: The search, holding the nearest humans and the step to take towards them.
+        """
+        grid = self.character_grid
+
+        def humans_at(x, y):
+            if not grid.count(HUMAN, x, y):
+                return ()
+            return [character for character in grid.cell(x, y) if character.role == HUMAN]
+
+        return WalkingSearch(self.width, self.height, location, humans_at, is_passable=self.is_passable)
+
+    def find_character_location(self, character):
+        """
+        Find the location of a character in the character grid.
+        
+        Args:
+            character: The character to find
+            
+        Returns:
+            tuple: The (x, y) coordinates where the character is found
+            
+        Raises:
+            CharacterNotFoundException: If the character is not found on the board
+        """
+        try:
+            return self.character_locations[character]
+        except KeyError:
+            raise CharacterNotFoundException(f"Character {character} not found on the board")
+
+    def nearest_characters(self, location, role=None, max_distance=None):
+        """
+        Find the characters of a role that are the fewest paces from a location.
+
+        Args:
+            location: The (x, y) coordinates to search from.
+            role: Only characters with this role, such as HUMAN, are considered, or all characters if it is None.
+            max_distance: Characters further than this number of paces away are ignored.
+
+        Returns:
+            tuple: The number of paces to the nearest characters and a list of every character at that distance.
+                   If there is no such character the distance is None and the list is empty.
+        """
+        return self.spatial_index.nearest(location, role, max_distance)
+
+    def characters_within(self, location, radius, role=None):
+        """
+        Find the characters of a role that are no more than a number of paces from a location.
+
+        Args:
+            location: The (x, y) coordinates to search from.
+            radius: The greatest number of paces away a character may be.
+            role: Only characters with this role, such as HUMAN, are considered, or all characters if it is None.
+
+        Returns:
+            list: The characters within the radius.
+        """
+        return self.spatial_index.within_radius(location, radius, role)
+
+    def adjacent_characters(self, location, role=None):
+        """
+        Find the characters of a role in the eight cells surrounding a location.
+
+        Args:
+            location: The (x, y) coordinates to search around.
+            role: Only characters with this role, such as HUMAN, are considered, or all characters if it is None.
+
+        Returns:
+            list: The characters in the neighbouring cells.
+        """
+        return self.spatial_index.adjacent(location, role)
+
+    def count_humans(self):
+        """
+        Count the number of humans on the board.
+
+        The count is kept up to date as characters are added, converted and killed, so this doesn't look at any of
+        them.
+        
+        Returns:
+            int: The number of humans currently on the board
+        """
+        return self.population[HUMAN]
+        
+    def count_zombies(self):
+        """
+        Count the number of zombies on the board.
+        
+        Returns:
+            int: The number of zombies currently on the board
+        """
+        return self.population[ZOMBIE]
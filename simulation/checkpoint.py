@@ -0,0 +1,289 @@
+"""Saving an invasion part way through, resuming it, and forking what-if continuations from it."""
+import json
+import mmap
+import multiprocessing
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+from characters.human import Human
+from characters.zombie import Zombie
+from simulation.board import Board
+from simulation.config import SimulationConfig
+from simulation.engine import SimulationEngine
+from characters.roles import HUMAN, ZOMBIE
+
+MAGIC = b"ZCHKPT\x00\x00"
+VERSION = 2
+
+# The magic number, version and the number of bytes of metadata that follow
+HEADER = struct.Struct("<8sHI")
+
+CLASSES = {HUMAN: Human, ZOMBIE: Zombie}
+
+# Every column starts on a multiple of this many bytes, so that it can be read straight from the memory map
+ALIGNMENT = 8
+
+
+def _column_bytes(typecode, values):
+    """Pack a column of numbers into little endian bytes."""
+    packed = array(typecode, values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _read_column(view, offset, typecode, count):
+    """
+    Read a column of numbers.
+
+    On a little endian machine the column is a view straight onto the memory map, so nothing is copied until the
+    numbers are used.
+
+    Returns:
+        The column, and the views that must be released before the memory map is closed.
+    """
+    size = array(typecode).itemsize
+    section = view[offset:offset + count * size]
+    if sys.byteorder == "little":
+        column = section.cast(typecode)
+        return column, [column, section]
+    column = array(typecode, section.tobytes())
+    column.byteswap()
+    return column, [section]
+
+
+def save_checkpoint(engine, path):
+    """
+    Save the full state of an invasion.
+
+    The checkpoint is a small JSON header followed by one aligned column per property of the characters (id, role,
+    location, hunt target and their order in the board's cell lists and spatial index), the bits of the wall map and
+    the state of the random number generator.  Loading it restores the invasion exactly, so a resumed run plays out just as the original would
+    have.
+
+    The checkpoint is written to a temporary file that then replaces the file at path, so a crash part way through
+    saving leaves the last checkpoint as it was.
+
+    Args:
+        engine: The simulation engine to save, between turns.
+        path: The file to write the checkpoint to.
+    """
+    board = engine.board
+    characters = board.character_list
+
+    cell_order = {}
+    for x, y in set(board.character_locations.values()):
+        for order, character in enumerate(board.character_grid[x][y]):
+            cell_order[character] = order
+    index_order = {}
+    for bucket in board.spatial_index.buckets.values():
+        for members in bucket.values():
+            for order, character in enumerate(members):
+                index_order[character] = order
+
+    def target_id(character):
+        target = getattr(character, "target", None)
+        return target.id if target is not None and target in board.character_locations else -1
+
+    rng_version, rng_state, rng_gauss_next = engine.random.getstate()
+    columns = [
+        ("ids", "I", [character.id for character in characters]),
+        ("roles", "B", [character.role for character in characters]),
+        ("xs", "i", [board.character_locations[character][0] for character in characters]),
+        ("ys", "i", [board.character_locations[character][1] for character in characters]),
+        ("targets", "q", [target_id(character) for character in characters]),
+        ("cell_order", "I", [cell_order[character] for character in characters]),
+        ("index_order", "I", [index_order[character] for character in characters]),
+        ("rng_state", "I", rng_state),
+        ("walls", "B", board.walls.bits),
+    ]
+    packed = [(name, typecode, len(values), _column_bytes(typecode, values)) for name, typecode, values in columns]
+
+    metadata = {
+        "width": board.width,
+        "height": board.height,
+        "turn_count": engine.turn_count,
+        "seed": engine.seed,
+        "human_count": engine.human_count,
+        "zombie_count": engine.zombie_count,
+        "config": board.config.as_dict(),
+        "next_id": board.next_id,
+        "rng_version": rng_version,
+        "rng_gauss_next": rng_gauss_next,
+        "characters": len(characters),
+        "columns": {},
+    }
+    # The offsets of the columns are part of the metadata, so they are worked out with room for the largest the
+    # metadata could be once they are filled in
+    metadata["columns"] = {name: [0, typecode, count] for name, typecode, count, _ in packed}
+    metadata_size = len(json.dumps(metadata).encode()) + 32 * len(packed)
+    offset = _align(HEADER.size + metadata_size)
+    for name, typecode, count, data in packed:
+        metadata["columns"][name] = [offset, typecode, count]
+        offset = _align(offset + len(data))
+    encoded = json.dumps(metadata).encode().ljust(metadata_size)
+
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as checkpoint:
+        checkpoint.write(HEADER.pack(MAGIC, VERSION, len(encoded)))
+        checkpoint.write(encoded)
+        for name, _, _, data in packed:
+            checkpoint.write(b"\x00" * (metadata["columns"][name][0] - checkpoint.tell()))
+            checkpoint.write(data)
+    os.replace(temporary_path, path)
+
+
+def _align(offset):
+    """Round an offset up to the next multiple of ALIGNMENT."""
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def load_checkpoint(path, screen=None):
+    """
+    Load an invasion from a checkpoint so that it can be resumed.
+
+    Args:
+        path: The checkpoint file.
+        screen: An optional screen for the board to be drawn on.
+
+    Returns:
+        SimulationEngine: The engine, at the turn the checkpoint was taken.
+
+    Raises:
+        ValueError: If the file isn't a checkpoint, or was written by a newer version.
+    """
+    with open(path, "rb") as checkpoint:
+        buffer = mmap.mmap(checkpoint.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        magic, version, metadata_size = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a checkpoint")
+        if version > VERSION:
+            raise ValueError(f"{path} was written by a newer version of the checkpoint format")
+        metadata = json.loads(bytes(buffer[HEADER.size:HEADER.size + metadata_size]))
+        view = memoryview(buffer)
+        columns = {}
+        views = [view]
+        for name, (offset, typecode, count) in metadata["columns"].items():
+            columns[name], column_views = _read_column(view, offset, typecode, count)
+            views.extend(column_views)
+        try:
+            engine = _restore(metadata, columns, screen)
+        finally:
+            for column_view in reversed(views):
+                column_view.release()
+    finally:
+        buffer.close()
+
+    return engine
+
+
+def _restore(metadata, columns, screen):
+    """Create the engine described by the metadata and columns of a checkpoint."""
+    # Checkpoints from before configs were added only have the size of the board
+    config = SimulationConfig(**metadata.get("config", {"width": metadata["width"], "height": metadata["height"]}))
+    if screen is None:
+        board = Board(config=config)
+    else:
+        # Only a board that is drawn needs the ui, so a headless resume never imports it
+        from ui.board import GameBoard
+
+        board = GameBoard(screen, config=config)
+    characters = []
+    for character_id, role, x, y in zip(columns["ids"], columns["roles"], columns["xs"], columns["ys"]):
+        character = CLASSES[role](location=[x, y])
+        character.id = character_id
+        characters.append(character)
+
+    by_id = {character.id: character for character in characters}
+    for character, target in zip(characters, columns["targets"]):
+        if character.role == ZOMBIE:
+            character.target = by_id.get(target)
+
+    board.restore(characters, list(columns["cell_order"]), list(columns["index_order"]), metadata["next_id"])
+    # Checkpoints from before walls were added have no walls column
+    if "walls" in columns:
+        board.walls.load(columns["walls"])
+
+    engine = SimulationEngine(board, human_count=metadata["human_count"], zombie_count=metadata["zombie_count"],
+                              seed=metadata["seed"])
+    engine.turn_count = metadata["turn_count"]
+    engine.random.setstate((metadata["rng_version"], tuple(columns["rng_state"]), metadata["rng_gauss_next"]))
+    return engine
+
+
+def run_to_extinction(engine, max_turns=None):
+    """
+    Run an invasion until the humans are wiped out.
+
+    This is the default continuation for fork.
+
+    Returns:
+        dict: The population statistics at the end of the run.
+    """
+    engine.run(max_turns=max_turns)
+    return engine.stats()
+
+
+# The engine forked workers continue from, which they inherit from the process that forked them
+_fork_engine = None
+_fork_path = None
+
+
+def _run_continuation(seed, continuation):
+    """Run one continuation of the forked engine in a worker process."""
+    engine = _fork_engine if _fork_engine is not None else load_checkpoint(_fork_path)
+    if seed is not None:
+        engine.random.seed(seed)
+    return continuation(engine)
+
+
+def _load_fork_path(path):
+    """Tell a spawned worker which checkpoint to load its continuations from."""
+    global _fork_path
+    _fork_path = path
+
+
+def fork(engine, seeds, continuation=run_to_extinction, processes=None):
+    """
+    Run many what-if continuations of an invasion from its current state.
+
+    Where the operating system supports it each continuation runs in a process forked from this one, so it starts
+    from a copy-on-write copy of the engine in memory rather than replaying the invasion from the first turn.  A fresh
+    process is forked for every continuation so that none of them sees the changes made by another.  Elsewhere the
+    engine is saved to a checkpoint that every continuation loads.
+
+    Args:
+        engine: The simulation engine to continue, between turns.
+        seeds: A seed for each continuation, its random number generator is reseeded with it so that each takes a
+               different course.  A seed of None continues with the engine's own random number generator, and so
+               plays out exactly as the original would have.
+        continuation: A function taking the engine and returning a picklable result, defaults to running until the
+                      humans are wiped out and returning the population statistics.
+        processes: The number of processes to run at once, defaults to the number of CPUs.
+
+    Returns:
+        list: The result of every continuation, in the order of the seeds.
+    """
+    global _fork_engine
+    seeds = list(seeds)
+    processes = processes or os.cpu_count()
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        _fork_engine = engine
+        try:
+            with multiprocessing.get_context("fork").Pool(processes, maxtasksperchild=1) as pool:
+                return pool.starmap(_run_continuation, [(seed, continuation) for seed in seeds], chunksize=1)
+        finally:
+            _fork_engine = None
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "fork.checkpoint")
+        save_checkpoint(engine, path)
+        with multiprocessing.get_context("spawn").Pool(processes, initializer=_load_fork_path,
+                                                       initargs=(path,)) as pool:
+            return pool.starmap(_run_continuation, [(seed, continuation) for seed in seeds], chunksize=1)
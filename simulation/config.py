@@ -0,0 +1,122 @@
+"""The settings of a simulation, fixed for the whole of an invasion."""
+from constants import GRID_WIDTH, GRID_HEIGHT, HUMAN_COUNT, ZOMBIE_COUNT, HUMAN_PACES, ZOMBIE_PACES
+
+# The compass directions a character can walk in, and the (dx, dy) of a single pace in each
+DIRECTIONS = ("N", "NE", "E", "SE", "S", "SW", "W", "NW")
+DIRECTION_OFFSETS = {
+    "N": (0, -1),
+    "NE": (1, -1),
+    "E": (1, 0),
+    "SE": (1, 1),
+    "S": (0, 1),
+    "SW": (-1, 1),
+    "W": (-1, 0),
+    "NW": (-1, -1),
+}
+
+
+class SimulationConfig:
+    """
+    The size of the grid, the starting populations and how far characters walk.
+
+    A config can't be changed once it is made, so one can be shared by any number of boards, characters and engines
+    running in the same process, and the tables worked out from it are worked out once rather than every turn.  A
+    config that differs in a few settings is made with replace.
+    """
+    FIELDS = ("width", "height", "human_count", "zombie_count", "human_paces", "zombie_paces")
+    __slots__ = FIELDS + ("cells", "human_steps", "zombie_steps")
+
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT, human_count=HUMAN_COUNT, zombie_count=ZOMBIE_COUNT,
+                 human_paces=HUMAN_PACES, zombie_paces=ZOMBIE_PACES):
+        """
+        Initialise a config, the defaults are the values in constants.
+
+        Args:
+            width: The number of columns in the grid.
+            height: The number of rows in the grid.
+            human_count: The number of humans at the start of an invasion.
+            zombie_count: The number of zombies at the start of an invasion.
+            human_paces: The number of paces a human walks each turn.
+            zombie_paces: The number of paces a zombie walks each turn.
+
+        Raises:
+            ValueError: If the grid has no cells or any of the other settings is negative.
+        """
+        if width < 1 or height < 1:
+            raise ValueError(f"A grid of {width}x{height} has no cells")
+        for name, value in (("human_count", human_count), ("zombie_count", zombie_count),
+                            ("human_paces", human_paces), ("zombie_paces", zombie_paces)):
+            if value < 0:
+                raise ValueError(f"{name} can't be negative, it is {value}")
+
+        values = {
+            "width": width,
+            "height": height,
+            "human_count": human_count,
+            "zombie_count": zombie_count,
+            "human_paces": human_paces,
+            "zombie_paces": zombie_paces,
+            "cells": width * height,
+            # The (dx, dy) of a whole turn's walk in each direction
+            "human_steps": {direction: (dx * human_paces, dy * human_paces)
+                            for direction, (dx, dy) in DIRECTION_OFFSETS.items()},
+            "zombie_steps": {direction: (dx * zombie_paces, dy * zombie_paces)
+                             for direction, (dx, dy) in DIRECTION_OFFSETS.items()},
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("A SimulationConfig can't be changed, use replace to make a new one")
+
+    def __delattr__(self, name):
+        raise AttributeError("A SimulationConfig can't be changed, use replace to make a new one")
+
+    def replace(self, **changes):
+        """
+        Make a config with some of the settings changed.
+
+        Args:
+            changes: The settings to change, by name.  Settings given as None are left as they are.
+
+        Returns:
+            SimulationConfig: The new config, or this one if nothing changed.
+
+        Raises:
+            TypeError: If a change isn't one of the settings.
+        """
+        unknown = set(changes) - set(self.FIELDS)
+        if unknown:
+            raise TypeError(f"Unknown settings: {', '.join(sorted(unknown))}")
+        changes = {name: value for name, value in changes.items() if value is not None}
+        if all(getattr(self, name) == value for name, value in changes.items()):
+            return self
+        return SimulationConfig(**{**self.as_dict(), **changes})
+
+    def as_dict(self):
+        """
+        The settings as a dict, which can be passed back to SimulationConfig to make the same config.
+
+        Returns:
+            dict: Every setting by name.
+        """
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def __eq__(self, other):
+        if not isinstance(other, SimulationConfig):
+            return NotImplemented
+        return self.as_dict() == other.as_dict()
+
+    def __hash__(self):
+        return hash(tuple(getattr(self, name) for name in self.FIELDS))
+
+    def __repr__(self):
+        settings = ", ".join(f"{name}={getattr(self, name)}" for name in self.FIELDS)
+        return f"SimulationConfig({settings})"
+
+    def __reduce__(self):
+        # Configs are sent to sweep workers, and can't be unpickled by setting their attributes
+        return SimulationConfig, tuple(getattr(self, name) for name in self.FIELDS)
+
+
+DEFAULT_CONFIG = SimulationConfig()
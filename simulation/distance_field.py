@@ -0,0 +1,244 @@
+"""A distance field measuring how many paces every cell is from the nearest of a set of characters."""
+from collections import deque
+
+from simulation.spatial import pace_distance
+
+# The offsets of the eight neighbouring cells, a pace can be taken to any of them
+NEIGHBOUR_OFFSETS = ((0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1))
+
+
+class DistanceField:
+    """
+    The number of paces from every cell to the nearest source, and which source that is.
+
+    The field is built with a single breadth first search that starts from every source at once, so it costs the same
+    however many characters go on to use it.  Cells that can't be walked through are never entered, which means
+    routes found by stepping down the field go around them.
+    """
+    def __init__(self, width, height, sources, is_passable=None, stop_after=None):
+        """
+        Build the distance field.
+
+        Args:
+            width: The number of columns on the board.
+            height: The number of rows on the board.
+            sources: A sequence of (character, location) pairs to measure the distance from.  Where two sources are
+                     the same distance from a cell the cell is labelled with the one that comes first.
+            is_passable: An optional function taking x and y that returns False for cells that can't be walked
+                         through.  Every cell is passable if it is None.
+            stop_after: An optional collection of (x, y) locations.  The search stops once all of these and their
+                        neighbours have been reached, cells further away are left unreached.
+        """
+        self.width = width
+        self.height = height
+        self.is_passable = is_passable
+        # Both grids are flat lists indexed by x * height + y, the same order as the character grid
+        self.distances = [-1] * (width * height)
+        self.labels = [None] * (width * height)
+        self._search(sources, is_passable, stop_after)
+
+    def _search(self, sources, is_passable, stop_after):
+        """Runs the multi-source breadth first search that fills in the field."""
+        width, height = self.width, self.height
+        distances, labels = self.distances, self.labels
+        frontier = deque()
+
+        for character, (x, y) in sources:
+            index = x * height + y
+            if distances[index] == -1:
+                distances[index] = 0
+                labels[index] = character
+                frontier.append((x, y))
+
+        # Once every location in stop_after has been reached the search expands one more pace so that all of their
+        # neighbours have a distance too, and then stops
+        remaining = None
+        stop_distance = None
+        if stop_after is not None:
+            remaining = {x * height + y for x, y in stop_after} - {x * height + y for x, y in frontier}
+            if not remaining:
+                stop_distance = 1
+
+        while frontier:
+            x, y = frontier.popleft()
+            index = x * height + y
+            if stop_distance is not None and distances[index] >= stop_distance:
+                break
+            distance = distances[index] + 1
+            label = labels[index]
+
+            for dx, dy in NEIGHBOUR_OFFSETS:
+                nx, ny = x + dx, y + dy
+                if nx < 0 or ny < 0 or nx >= width or ny >= height:
+                    continue
+                neighbour = nx * height + ny
+                if distances[neighbour] != -1:
+                    continue
+                if is_passable is not None and not is_passable(nx, ny):
+                    continue
+                distances[neighbour] = distance
+                labels[neighbour] = label
+                frontier.append((nx, ny))
+                if remaining:
+                    remaining.discard(neighbour)
+                    if not remaining:
+                        stop_distance = distance + 1
+
+    def distance_at(self, location):
+        """
+        The number of paces from a location to the nearest source.
+
+        Args:
+            location: The (x, y) coordinates of the cell.
+
+        Returns:
+            int: The number of paces, or None if no source can be reached from the cell.
+        """
+        distance = self.distances[location[0] * self.height + location[1]]
+        return None if distance == -1 else distance
+
+    def label_at(self, location):
+        """
+        The nearest source to a location.
+
+        Args:
+            location: The (x, y) coordinates of the cell.
+
+        Returns:
+            The source nearest to the cell, or None if no source can be reached from the cell.
+        """
+        return self.labels[location[0] * self.height + location[1]]
+
+    def is_nearest(self, location, source_location):
+        """
+        Check whether a source at a location is amongst the nearest sources.
+
+        Args:
+            location: The (x, y) coordinates to measure from.
+            source_location: The (x, y) coordinates of the source.
+
+        Returns:
+            bool: True if the source is no more paces away than the nearest source in the field, walking around
+                  anything that can't be walked through.
+        """
+        distance = self.distance_at(location)
+        if distance is None or pace_distance(location, source_location) > distance:
+            return False
+        if self.is_passable is None:
+            # Nothing is in the way, so the walk is as long as the straight line
+            return True
+        # A source that is near in a straight line may be further on foot, so walk to it, giving up once the walk is
+        # longer than the way to the nearest source
+        source = (source_location[0], source_location[1])
+        search = WalkingSearch(self.width, self.height, location, lambda x, y: (source,) if (x, y) == source else (),
+                               self.is_passable, max_paces=distance)
+        return search.distance is not None
+
+    def downhill(self, location, towards=None):
+        """
+        Find the neighbouring cell that is the fewest paces from a source.
+
+        Args:
+            location: The (x, y) coordinates of the cell to step from.
+            towards: Optional (x, y) coordinates used to choose between neighbours that are equally close to a
+                     source, the neighbour closest to this location in a straight line is chosen.
+
+        Returns:
+            tuple: The (dx, dy) offset of the step to take, or None if no neighbour is closer to a source.
+        """
+        x, y = location
+        current = self.distance_at(location)
+        best_step = None
+        best_key = None
+
+        for dx, dy in NEIGHBOUR_OFFSETS:
+            nx, ny = x + dx, y + dy
+            if nx < 0 or ny < 0 or nx >= self.width or ny >= self.height:
+                continue
+            distance = self.distances[nx * self.height + ny]
+            if distance == -1 or (current is not None and distance >= current):
+                continue
+            key = (distance, 0 if towards is None else (towards[0] - nx) ** 2 + (towards[1] - ny) ** 2)
+            if best_key is None or key < best_key:
+                best_key = key
+                best_step = (dx, dy)
+
+        return best_step
+
+
+class WalkingSearch:
+    """
+    The nearest targets to one cell, measured in paces around anything that can't be walked through.
+
+    The search grows outwards from the cell a pace at a time and stops at the first pace that reaches a target, so it
+    only visits the cells nearer the start than the nearest target.  Its cost depends on how far away that target is
+    rather than on the size of the board, which makes it the way for a lone character to find its way around walls
+    on a board too large, or too empty, for a DistanceField to be worth building.
+    """
+    def __init__(self, width, height, start, targets_at, is_passable=None, max_paces=None):
+        """
+        Search outwards from a cell.
+
+        Args:
+            width: The number of columns on the board.
+            height: The number of rows on the board.
+            start: The (x, y) coordinates of the cell to search from.
+            targets_at: A function taking x and y that returns the targets in a cell, in the order they are found.
+            is_passable: An optional function taking x and y that returns False for cells that can't be walked
+                         through.  Every cell is passable if it is None.
+            max_paces: An optional number of paces to give up after, as if no target could be reached.
+        """
+        self.start = (start[0], start[1])
+        # The number of paces to the nearest targets, and the targets that are that many paces away, or None and no
+        # targets if none can be reached
+        self.distance = None
+        self.nearest = []
+        # For every cell reached, the first steps from the start that begin a shortest walk to it, one bit for each
+        # of NEIGHBOUR_OFFSETS
+        self._first_steps = {self.start: 0}
+
+        frontier = [self.start]
+        paces = 0
+        while frontier and (max_paces is None or paces <= max_paces):
+            found = [target for x, y in frontier for target in targets_at(x, y)]
+            if found:
+                self.distance = paces
+                self.nearest = found
+                return
+
+            reached = {}
+            for x, y in frontier:
+                steps = self._first_steps[(x, y)]
+                for bit, (dx, dy) in enumerate(NEIGHBOUR_OFFSETS):
+                    nx, ny = x + dx, y + dy
+                    if nx < 0 or ny < 0 or nx >= width or ny >= height or (nx, ny) in self._first_steps:
+                        continue
+                    if is_passable is not None and not is_passable(nx, ny):
+                        continue
+                    reached[(nx, ny)] = reached.get((nx, ny), 0) | (1 << bit if paces == 0 else steps)
+            self._first_steps.update(reached)
+            frontier = list(reached)
+            paces += 1
+
+    def first_step(self, location):
+        """
+        The step to take from the start towards one of the nearest targets.
+
+        Args:
+            location: The (x, y) coordinates of the target to head for.  Where several first steps begin a shortest
+                      walk to it, the one that heads most directly towards it is chosen.
+
+        Returns:
+            tuple: The (dx, dy) offset of the step, or None if the location wasn't reached or is the start.
+        """
+        steps = self._first_steps.get((location[0], location[1]), 0)
+        x, y = self.start
+        best_step = None
+        best_key = None
+        for bit, (dx, dy) in enumerate(NEIGHBOUR_OFFSETS):
+            if steps & (1 << bit):
+                key = (location[0] - x - dx) ** 2 + (location[1] - y - dy) ** 2
+                if best_key is None or key < best_key:
+                    best_key = key
+                    best_step = (dx, dy)
+        return best_step
@@ -0,0 +1,208 @@
+"""The headless simulation engine."""
+import math
+import random
+
+from characters.human import Human
+from characters.roles import HUMAN, ZOMBIE
+from characters.zombie import Zombie
+from exceptions import InvalidCoordinateException
+from simulation.board import Board
+
+
+class TurnStats:
+    """What happened in a single turn, and the populations at the end of it."""
+    def __init__(self, turn, humans, zombies, conversions, kills):
+        """
+        Initialise the record of a turn.
+
+        Args:
+            turn: The number of the turn.
+            humans: The number of humans at the end of the turn.
+            zombies: The number of zombies at the end of the turn.
+            conversions: The number of humans turned into zombies during the turn.
+            kills: The number of characters killed during the turn.
+        """
+        self.turn = turn
+        self.humans = humans
+        self.zombies = zombies
+        self.conversions = conversions
+        self.kills = kills
+
+    def as_dict(self):
+        """
+        The record as a dict.
+
+        Returns:
+            dict: The turn, humans, zombies, conversions and kills.
+        """
+        return {
+            "turn": self.turn,
+            "humans": self.humans,
+            "zombies": self.zombies,
+            "conversions": self.conversions,
+            "kills": self.kills,
+        }
+
+
+class SimulationEngine:
+    """
+    Runs a Zombie Invasion without any dependency on a display.
+
+    The engine owns the game board and the turn counter.  Turns are run as fast as they can be computed, it is up to
+    the caller (such as the pygame app) to decide how often to ask for the next one.
+    """
+    def __init__(self, board=None, human_count=None, zombie_count=None, seed=None, config=None):
+        """
+        Initialise the simulation engine.
+
+        Args:
+            board: The game board to run the simulation on.  A headless board is created from the config if one
+                   isn't given.
+            human_count: The number of humans to place on the board, defaults to the config's human_count.
+            zombie_count: The number of zombies to place on the board, defaults to the config's zombie_count.
+            seed: An optional seed for the random number generator so that a run can be repeated.  If it isn't given
+                  one is chosen at random, it is kept in seed so that the run can still be repeated.
+            config: The SimulationConfig of the invasion, defaults to the board's config.
+        """
+        self.board = board if board is not None else Board(config=config)
+        self.config = self.board.config if config is None else config
+        self.human_count = self.config.human_count if human_count is None else human_count
+        self.zombie_count = self.config.zombie_count if zombie_count is None else zombie_count
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.turn_count = 0
+
+        # Every random choice in the simulation comes from this generator rather than the global one, so runs don't
+        # affect each other and a run with the same seed always plays out the same way
+        self.random = random.Random(self.seed)
+        self.board.random = self.random
+        # Writes a replay of the invasion when it is being recorded
+        self.recorder = None
+        # The TurnStats of the last turn that was run, or None before the first
+        self.turn_stats = None
+
+    def populate(self):
+        """Places the initial humans and zombies on the board."""
+        self.populate_initial_humans()
+        self.populate_initial_zombies()
+
+    def populate_initial_humans(self):
+        """
+        Places a number of humans on the grid at the beginning of the game.
+
+        Humans will not be placed in a square that holds a wall.
+        """
+        for _ in range(self.human_count):
+            while True:
+                try:
+                    location = [self.random.randint(0, self.board.width - 1),
+                                self.random.randint(0, self.board.height - 1)]
+                    self.board.add_character(Human(location=location))
+                    break
+                except InvalidCoordinateException:
+                    continue
+
+    def populate_initial_zombies(self):
+        """
+        Place a number of zombies on the grid at the start of the game.
+
+        Zombies will not be placed in a square that is already occupied by a Human or Zombie, or that holds a wall.
+        """
+        for _ in range(self.zombie_count):
+            while True:
+                try:
+                    # Generate random coordinates
+                    x = self.random.randint(0, self.board.width - 1)
+                    y = self.random.randint(0, self.board.height - 1)
+
+                    # Create and add zombie at the random location
+                    self.board.add_character(Zombie(location=[x, y]), is_initial_placement=True)
+                    break
+                except InvalidCoordinateException:
+                    # If the space is occupied, try again
+                    continue
+
+    def is_over(self):
+        """
+        Check whether the invasion has finished.
+
+        The board keeps count of its humans, so this is cheap enough to call every frame however large the invasion.
+
+        Returns:
+            bool: True once there are no humans left on the board.
+        """
+        return self.board.count_humans() == 0
+
+    def commence_turn(self):
+        """Runs a single turn of the simulation."""
+        board = self.board
+        board.commence_turn()
+        self.turn_count += 1
+        self.turn_stats = TurnStats(self.turn_count, board.count_humans(), board.count_zombies(), board.conversions,
+                                    board.kills)
+        if self.recorder is not None:
+            self.recorder.record_turn(self)
+
+    def record(self, path, keyframe_interval=100):
+        """
+        Start recording a replay of the invasion, from the current turn onwards.
+
+        Args:
+            path: The file to write the replay to.
+            keyframe_interval: The number of turns between each snapshot of the whole board in the replay.
+
+        Returns:
+            ReplayRecorder: The recorder, which must be closed once the invasion is over.
+        """
+        from simulation.replay import ReplayRecorder
+
+        self.recorder = ReplayRecorder(path, keyframe_interval)
+        self.recorder.start(self)
+        return self.recorder
+
+    def run(self, max_turns=None):
+        """
+        Run turns until no humans are left.
+
+        Args:
+            max_turns: An optional limit on the number of turns to run.
+
+        Returns:
+            int: The number of turns that have been run.
+        """
+        while not self.is_over():
+            if max_turns is not None and self.turn_count >= max_turns:
+                break
+            self.commence_turn()
+
+        return self.turn_count
+
+    def mean_hunt_distance(self):
+        """
+        The mean number of paces between each hunting zombie and the human it is hunting.
+
+        Returns:
+            float: The mean distance, or NaN when no zombie is hunting a human.
+        """
+        locations = self.board.character_locations
+        total = hunting = 0
+        for character in self.board.character_list:
+            target = getattr(character, "target", None)
+            if character.role == ZOMBIE and target is not None and target.role == HUMAN and target in locations:
+                x, y = locations[character]
+                target_x, target_y = locations[target]
+                total += max(abs(target_x - x), abs(target_y - y))
+                hunting += 1
+        return total / hunting if hunting else math.nan
+
+    def stats(self):
+        """
+        The current population statistics of the simulation.
+
+        Returns:
+            dict: The turn count and the number of humans and zombies on the board.
+        """
+        return {
+            "turns": self.turn_count,
+            "humans": self.board.count_humans(),
+            "zombies": self.board.count_zombies(),
+        }
@@ -0,0 +1,159 @@
+"""Sparse storage for the characters in every cell of a board."""
+
+
+class _Tile:
+    """A chunk_size x chunk_size block of cells with at least one character in it."""
+    __slots__ = ("cells", "counts", "population")
+
+    def __init__(self, area, roles):
+        # The characters in each cell, or None for an empty cell
+        self.cells = [None] * area
+        # counts[role][cell] is the number of characters of the role in the cell
+        self.counts = [[0] * area for _ in range(roles)]
+        # The number of characters in the whole tile, the tile is thrown away when it reaches zero
+        self.population = 0
+
+
+class _Column:
+    """A view of one column of a ChunkedGrid, so that grid[x][y] reads a cell as it did from a list of lists."""
+    __slots__ = ("grid", "x")
+
+    def __init__(self, grid, x):
+        self.grid = grid
+        self.x = x
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.grid.height:
+            raise IndexError(y)
+        cell = self.grid.cell(self.x, y)
+        # An empty cell has no list of its own, a new one is handed out so callers see the [] they always have
+        return cell if cell else []
+
+    def __len__(self):
+        return self.grid.height
+
+    def __iter__(self):
+        for y in range(self.grid.height):
+            yield self[y]
+
+
+class ChunkedGrid:
+    """
+    The characters in every cell of a board, and how many of each role are in each cell.
+
+    The board is divided into square tiles of chunk_size x chunk_size cells.  A tile is only created when a character
+    first enters it and is thrown away as soon as the last character leaves, so the memory a board takes depends on
+    the area its characters are spread over rather than on its size, and a huge, mostly empty map costs next to
+    nothing.
+
+    grid[x][y] reads the characters in a cell just as it did when the grid was a list of lists.  Cells should only be
+    changed with add and remove, which keep the role counts and the tiles in step.
+    """
+    def __init__(self, width, height, roles, chunk_size=32):
+        """
+        Initialise an empty grid.
+
+        Args:
+            width: The number of columns on the board.
+            height: The number of rows on the board.
+            roles: The number of roles to count characters of.
+            chunk_size: The width and height, in cells, of each tile.
+        """
+        self.width = width
+        self.height = height
+        self.roles = roles
+        self.chunk_size = chunk_size
+        # Tile coordinates -> _Tile, only for the tiles with a character in them
+        self.tiles = {}
+
+    def _locate(self, x, y):
+        """The coordinates of the tile holding a cell, and the index of the cell within the tile."""
+        size = self.chunk_size
+        return (x // size, y // size), (x % size) * size + y % size
+
+    def cell(self, x, y):
+        """
+        The characters in a cell.
+
+        Returns:
+            list: The characters in the order they entered the cell, or an empty tuple if there are none.  The list
+                  belongs to the grid and must not be changed.
+        """
+        key, index = self._locate(x, y)
+        tile = self.tiles.get(key)
+        if tile is None:
+            return ()
+        return tile.cells[index] or ()
+
+    def count(self, role, x, y):
+        """The number of characters of a role in a cell."""
+        # This is asked whenever a character might move, so the tile is found without calling _locate
+        size = self.chunk_size
+        tile = self.tiles.get((x // size, y // size))
+        if tile is None:
+            return 0
+        return tile.counts[role][(x % size) * size + y % size]
+
+    def add(self, character, x, y):
+        """
+        Put a character in a cell, after any characters already there.
+
+        Args:
+            character: The character to add, counted under its role.
+            x: The column of the cell.
+            y: The row of the cell.
+        """
+        key, index = self._locate(x, y)
+        tile = self.tiles.get(key)
+        if tile is None:
+            tile = self.tiles[key] = _Tile(self.chunk_size * self.chunk_size, self.roles)
+        cell = tile.cells[index]
+        if cell is None:
+            cell = tile.cells[index] = []
+        cell.append(character)
+        tile.counts[character.role][index] += 1
+        tile.population += 1
+
+    def remove(self, character, x, y):
+        """
+        Take a character out of a cell.
+
+        Args:
+            character: The character to remove, counted under its role.
+            x: The column of the cell.
+            y: The row of the cell.
+
+        Raises:
+            ValueError: If the character isn't in the cell.
+        """
+        key, index = self._locate(x, y)
+        tile = self.tiles.get(key)
+        cell = tile.cells[index] if tile is not None else None
+        if not cell:
+            raise ValueError(f"{character} is not in cell {(x, y)}")
+        cell.remove(character)
+        if not cell:
+            tile.cells[index] = None
+        tile.counts[character.role][index] -= 1
+        tile.population -= 1
+        if not tile.population:
+            del self.tiles[key]
+
+    def change_role(self, x, y, old_role, new_role):
+        """Count a character in a cell under a new role, after it has changed role without moving."""
+        key, index = self._locate(x, y)
+        counts = self.tiles[key].counts
+        counts[old_role][index] -= 1
+        counts[new_role][index] += 1
+
+    def __getitem__(self, x):
+        if not 0 <= x < self.width:
+            raise IndexError(x)
+        return _Column(self, x)
+
+    def __len__(self):
+        return self.width
+
+    def __iter__(self):
+        for x in range(self.width):
+            yield _Column(self, x)
@@ -0,0 +1,316 @@
+"""Measuring where the time of a turn goes, and profiling a window of turns on demand."""
+import cProfile
+import io
+import pstats
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+from characters.human import Human
+from characters.zombie import Zombie
+
+# The methods of the characters whose time is charged to each phase of a turn
+CHARACTER_PHASES = (
+    (Human, "decide", "human_movement"),
+    (Zombie, "decide", "zombie_movement"),
+    (Zombie, "_find_nearest_human", "zombie_target_selection"),
+)
+
+# The methods of the board whose time is charged to each phase of a turn
+BOARD_PHASES = (
+    ("move_character", "move_validation"),
+    ("_check_space_sharing", "move_validation"),
+    ("_apply_moves", "move_validation"),
+    ("_resolve_collisions", "conversions"),
+    ("_convert_human_to_zombie", "conversions"),
+)
+
+
+class PhaseClock:
+    """
+    Charges the time spent in a turn to the phase that spent it.
+
+    Phases can be nested, such as a conversion that happens while a zombie moves.  The time spent in the inner phase
+    is only charged to the inner phase, so the phases add up to the time of the turn.
+    """
+    def __init__(self):
+        """Initialise the clock with nothing charged to any phase."""
+        self.totals = {}
+        self._stack = []
+        self._since = None
+
+    def _charge(self):
+        """Charge the time since the last change of phase to the current phase."""
+        now = time.perf_counter()
+        if self._stack:
+            phase = self._stack[-1]
+            self.totals[phase] = self.totals.get(phase, 0.0) + now - self._since
+        self._since = now
+
+    def enter(self, phase):
+        """Start charging time to a phase."""
+        self._charge()
+        self._stack.append(phase)
+
+    def exit(self):
+        """Go back to charging time to the phase that was current before the last enter."""
+        self._charge()
+        self._stack.pop()
+
+    def wrap(self, method, phase):
+        """
+        Wrap a method so that the time spent in it is charged to a phase.
+
+        Returns:
+            function: The wrapped method.
+        """
+        def timed(*args, **kwargs):
+            self.enter(phase)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.exit()
+
+        return timed
+
+
+class Instrumentation:
+    """
+    Records how long every phase of every turn takes, and how often the hot methods of the board are called.
+
+    Nothing is measured until the instrumentation is attached to a board, and attaching it is what puts the timing
+    wrappers in place, so a board that isn't being instrumented runs exactly the same code as before.  While it is
+    attached the character methods are wrapped for every board, so only one board should be instrumented at a time.
+
+    The phases are human_movement, zombie_movement, zombie_target_selection, move_validation, conversions and
+    other.  The time of a nested phase, such as the conversion when a zombie catches a human, is only charged to the
+    nested phase.
+
+    Frames are drawn on the window's thread while turns run on the worker's, so drawing isn't part of a turn.  The
+    draw phase is timed a frame at a time instead, by wrapping the function that draws a frame with time_draw.
+    """
+    def __init__(self, history=1000):
+        """
+        Initialise the instrumentation.
+
+        Args:
+            history: The number of most recent turns to keep the timings of.
+        """
+        self.clock = PhaseClock()
+        self.turns = deque(maxlen=history)
+        # The seconds taken to draw each frame while attached
+        self.frames = deque(maxlen=history)
+        # The number of calls to each board method and the net number of memory blocks they allocated
+        self.calls = {}
+        self.allocations = {}
+        self.reports = []
+        self.board = None
+        self._originals = []
+        self._last_totals = {}
+        self._profile_turns = 0
+        self._profile_path = None
+        self._profiler = None
+
+    def attach(self, board):
+        """
+        Start instrumenting a board.
+
+        Args:
+            board: The game board to instrument.
+
+        Raises:
+            RuntimeError: If the instrumentation is already attached to a board.
+        """
+        if self.board is not None:
+            raise RuntimeError("The instrumentation is already attached to a board")
+        self.board = board
+        self.frames.clear()
+
+        for cls, name, phase in CHARACTER_PHASES:
+            self._originals.append((cls, name, cls.__dict__[name]))
+            setattr(cls, name, self.clock.wrap(cls.__dict__[name], phase))
+
+        # The board's methods are wrapped on the board itself, so other boards aren't affected
+        for name, phase in BOARD_PHASES:
+            setattr(board, name, self._counted(getattr(board, name), name, phase))
+        board.commence_turn = self._turn(board.commence_turn)
+
+    def detach(self):
+        """Stop instrumenting the board, putting back the methods that were wrapped."""
+        if self.board is None:
+            return
+        for cls, name, original in self._originals:
+            setattr(cls, name, original)
+        self._originals = []
+        for name, _ in BOARD_PHASES:
+            del self.board.__dict__[name]
+        del self.board.__dict__["commence_turn"]
+        self._stop_profiling()
+        self.board = None
+
+    def _counted(self, method, name, phase):
+        """Wrap a board method so that its calls, allocations and time are recorded."""
+        timed = self.clock.wrap(method, phase)
+        calls = self.calls
+        allocations = self.allocations
+        calls[name] = 0
+        allocations[name] = 0
+
+        def counted(*args, **kwargs):
+            calls[name] += 1
+            blocks = sys.getallocatedblocks()
+            try:
+                return timed(*args, **kwargs)
+            finally:
+                allocations[name] += sys.getallocatedblocks() - blocks
+
+        return counted
+
+    def _turn(self, commence_turn):
+        """Wrap the board's commence_turn so that the phases of each turn are recorded separately."""
+        def instrumented_turn():
+            if self._profile_turns and self._profiler is None:
+                self._start_profiling()
+            self.clock.enter("other")
+            try:
+                commence_turn()
+            finally:
+                self.clock.exit()
+                self._end_turn()
+
+        return instrumented_turn
+
+    def _end_turn(self):
+        """Record the time charged to each phase since the end of the last turn."""
+        totals = self.clock.totals
+        self.turns.append({
+            phase: total - self._last_totals.get(phase, 0.0)
+            for phase, total in totals.items() if total != self._last_totals.get(phase, 0.0)
+        })
+        self._last_totals = dict(totals)
+
+        if self._profiler is not None:
+            self._profile_turns -= 1
+            if self._profile_turns <= 0:
+                self._stop_profiling()
+
+    def time_draw(self, draw):
+        """
+        Wrap the function that draws a frame, such as FrameView.draw, so that its time is recorded.
+
+        Frames are only timed while the instrumentation is attached to a board, so drawing costs no more than an
+        attribute check the rest of the time.
+
+        Args:
+            draw: The function that draws a frame.
+
+        Returns:
+            function: The wrapped function, to call in its place.
+        """
+        def timed_draw(*args, **kwargs):
+            if self.board is None:
+                return draw(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return draw(*args, **kwargs)
+            finally:
+                self.frames.append(time.perf_counter() - start)
+
+        return timed_draw
+
+    def draw_summary(self):
+        """
+        The mean time taken to draw a frame while attached.
+
+        Returns:
+            float: The mean number of seconds per frame, or None if no frames were drawn.
+        """
+        # The frames are added to on the window's thread, so work from a copy
+        frames = tuple(self.frames)
+        return sum(frames) / len(frames) if frames else None
+
+    def summary(self):
+        """
+        The mean time of every phase over the turns that have been recorded.
+
+        Returns:
+            dict: The mean number of seconds per turn spent on each phase.
+        """
+        if not self.turns:
+            return {}
+        phases = sorted({phase for turn in self.turns for phase in turn})
+        return {phase: sum(turn.get(phase, 0.0) for turn in self.turns) / len(self.turns) for phase in phases}
+
+    def profile(self, turns, path=None):
+        """
+        Profile the next number of turns with cProfile and tracemalloc.
+
+        Profiling starts at the beginning of the next turn.  Once the turns have been run the report is added to
+        reports and, if a path is given, written to it.
+
+        Args:
+            turns: The number of turns to profile.
+            path: An optional file to write the report to.
+        """
+        self._profile_turns = turns
+        self._profile_path = path
+
+    def is_profiling(self):
+        """
+        Check whether a profile is waiting to start or in progress.
+
+        Returns:
+            bool: True until the report of the last call to profile has been made.
+        """
+        return self._profile_turns > 0
+
+    def _start_profiling(self):
+        """Start the profiler and the tracing of memory allocations."""
+        tracemalloc.start()
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+
+    def _stop_profiling(self):
+        """Stop profiling and make the report."""
+        if self._profiler is None:
+            return
+        self._profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        report = io.StringIO()
+        report.write("Profile of the turns run\n\n")
+        pstats.Stats(self._profiler, stream=report).sort_stats("cumulative").print_stats(25)
+        report.write(f"Memory allocated by the turns: {current / 1024:.1f} KiB now, {peak / 1024:.1f} KiB at peak\n\n")
+        report.write("Largest allocations by line:\n")
+        for statistic in snapshot.statistics("lineno")[:15]:
+            report.write(f"    {statistic}\n")
+        self.reports.append(report.getvalue())
+
+        if self._profile_path is not None:
+            with open(self._profile_path, "w") as output:
+                output.write(report.getvalue())
+
+        self._profiler = None
+        self._profile_turns = 0
+
+    def format_summary(self):
+        """
+        A table of the mean time of every phase and the calls and allocations of the board's hot methods.
+
+        Returns:
+            str: The table.
+        """
+        lines = [f"{'phase':<25} {'ms/turn':>10}"]
+        for phase, seconds in self.summary().items():
+            lines.append(f"{phase:<25} {seconds * 1000:>10.3f}")
+        draw = self.draw_summary()
+        if draw is not None:
+            lines.append(f"{'draw':<25} {draw * 1000:>10.3f} ms/frame")
+        lines.append("")
+        lines.append(f"{'method':<25} {'calls':>10} {'net blocks':>12}")
+        for name, count in self.calls.items():
+            lines.append(f"{name:<25} {count:>10} {self.allocations[name]:>12}")
+        return "\n".join(lines)
@@ -0,0 +1,334 @@
+"""
+Streaming the metrics of every turn of an invasion to files.
+
+turn_records runs an engine a turn at a time and yields a record of each turn, and the sinks write the records to a
+file in chunks, so a long run can be analysed afterwards without its history being kept in memory or the turn loop
+waiting on a write for every turn.
+"""
+import csv
+import json
+import math
+import os
+import struct
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+# The fields of every record, in the order they are written
+FIELDS = ("turn", "humans", "zombies", "conversions", "kills", "mean_hunt_distance", "seconds")
+
+
+def turn_records(engine, max_turns=None):
+    """
+    Run turns until no humans are left, yielding a record of each one.
+
+    Works with any of the engines.  The array engines have no kills, so every human they lose in a turn was converted.
+
+    Args:
+        engine: The simulation engine to run.
+        max_turns: An optional limit on the number of turns to run.
+
+    Yields:
+        dict: The turn, the number of humans and zombies at the end of it, the conversions and kills during it, the
+              mean paces between each hunting zombie and its human, and the seconds the turn took to run.
+    """
+    humans = engine.stats()["humans"]
+    while not engine.is_over():
+        if max_turns is not None and engine.turn_count >= max_turns:
+            break
+        start = time.perf_counter()
+        engine.commence_turn()
+        seconds = time.perf_counter() - start
+
+        stats = getattr(engine, "turn_stats", None)
+        if stats is not None:
+            record = stats.as_dict()
+        else:
+            remaining = engine.count_humans()
+            record = {
+                "turn": engine.turn_count,
+                "humans": remaining,
+                "zombies": engine.count_zombies(),
+                "conversions": humans - remaining,
+                "kills": 0,
+            }
+        humans = record["humans"]
+        record["mean_hunt_distance"] = engine.mean_hunt_distance()
+        record["seconds"] = seconds
+        yield record
+
+
+def export_metrics(records, sinks):
+    """
+    Write every record to each of the sinks, closing the sinks once the records run out.
+
+    Args:
+        records: The records to write, such as the generator returned by turn_records.
+        sinks: The sinks to write them to.
+
+    Returns:
+        int: The number of records written.
+    """
+    written = 0
+    try:
+        for record in records:
+            for sink in sinks:
+                sink.write(record)
+            written += 1
+    finally:
+        for sink in sinks:
+            sink.close()
+    return written
+
+
+class MetricsSink(ABC):
+    """
+    Writes records to a file, a chunk at a time.
+
+    Records are kept in a buffer until buffer_size of them have been written, then the whole chunk is written to the
+    file at once.  Whatever is left in the buffer is written when the sink is flushed or closed.  Subclasses write
+    the chunks in their own format with _write_chunk.
+
+    A sink can also carry on a file written by an earlier run, for a run resumed from a checkpoint.  The records the
+    earlier run wrote after the checkpoint are cut off, as the resumed run writes those turns again.
+    """
+    # The file mode the subclass writes in, and the mode it carries on writing an existing file in
+    mode = "w"
+    resume_mode = "a"
+
+    def __init__(self, path, buffer_size=1000, resume_turn=None):
+        """
+        Initialise the sink, creating the file.
+
+        Args:
+            path: The file to write the records to.
+            buffer_size: The number of records to keep before writing them.
+            resume_turn: The turn of the checkpoint a resumed run carries on from.  If it is given and the file
+                         exists, the records up to this turn are kept and the new records are added after them.
+        """
+        self.path = Path(path)
+        self.buffer_size = buffer_size
+        self.buffer = []
+        self.written = 0
+        kwargs = {} if "b" in self.mode else {"newline": "", "encoding": "utf-8"}
+        kept = self._records_up_to(resume_turn) if resume_turn is not None and self.path.exists() else None
+        if kept is None:
+            self.file = open(self.path, self.mode, **kwargs)
+            self._start()
+        else:
+            length, self.written = kept
+            os.truncate(self.path, length)
+            self.file = open(self.path, self.resume_mode, **kwargs)
+            self.file.seek(0, os.SEEK_END)
+            self._carry_on()
+
+    def _start(self):
+        """Write anything that comes before the first record."""
+        self._carry_on()
+
+    def _carry_on(self):
+        """Get ready to write records after those already in the file."""
+
+    def _records_up_to(self, turn):
+        """
+        Find the records an earlier run wrote to the file up to a turn.
+
+        Args:
+            turn: The last turn to keep.
+
+        Returns:
+            tuple: The number of bytes at the start of the file that hold those records, and the number of records,
+                   or None if the file has to be started again.
+        """
+        return None
+
+    @abstractmethod
+    def _write_chunk(self, records):
+        """Write a chunk of records to the file."""
+        pass
+
+    def _finish(self):
+        """Write anything that needs the number of records to be known, before the file is closed."""
+
+    def write(self, record):
+        """
+        Add a record, writing the buffer out if it is full.
+
+        Args:
+            record: The record, a dict with every field in FIELDS.
+        """
+        self.buffer.append(record)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write the records in the buffer to the file."""
+        if self.buffer:
+            self._write_chunk(self.buffer)
+            self.written += len(self.buffer)
+            self.buffer = []
+        self.file.flush()
+
+    def close(self):
+        """Write the records in the buffer and close the file."""
+        if self.file.closed:
+            return
+        self.flush()
+        self._finish()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CsvSink(MetricsSink):
+    """Writes records as CSV, with a header row naming the fields."""
+    def _start(self):
+        self._carry_on()
+        self.writer.writerow(FIELDS)
+
+    def _carry_on(self):
+        self.writer = csv.writer(self.file)
+
+    def _records_up_to(self, turn):
+        # Only the header is kept if that is all there is, a file without one is started again
+        kept = _lines_up_to(self.path, turn, lambda line: int(line.split(b",", 1)[0]), skip=1)
+        return kept if kept[0] else None
+
+    def _write_chunk(self, records):
+        self.writer.writerows([[record[field] for field in FIELDS] for record in records])
+
+
+class JsonLinesSink(MetricsSink):
+    """Writes every record as a JSON object on a line of its own."""
+    def _records_up_to(self, turn):
+        return _lines_up_to(self.path, turn, lambda line: json.loads(line)["turn"])
+
+    def _write_chunk(self, records):
+        # JSON has no NaN, so a turn with no hunting zombie has a null mean_hunt_distance
+        self.file.write("".join(
+            json.dumps({field: None if _is_nan(record[field]) else record[field] for field in FIELDS}) + "\n"
+            for record in records
+        ))
+
+
+class NumpySink(MetricsSink):
+    """
+    Writes records to a .npy file as a NumPy structured array, a column for each field.
+
+    The file is a compact binary table that np.load reads straight back, or maps with mmap_mode="r" so that only the
+    columns being looked at are read.  Chunks are appended as they are written and the number of records in the
+    header is filled in when the sink is closed, so the file can't be read until then.  Needs the optional numpy
+    extra.
+    """
+    mode = "wb"
+    # The header is written again when the sink is closed, which a file opened for appending can't do
+    resume_mode = "r+b"
+
+    def __init__(self, path, buffer_size=1000, resume_turn=None):
+        import numpy as np
+
+        self.np = np
+        self.dtype = np.dtype([(field, np.float64 if field in ("mean_hunt_distance", "seconds") else np.int64)
+                               for field in FIELDS])
+        # The header is written with room for any number of records, then written again once the number is known
+        self.header_size = len(self._header(2 ** 63 - 1, 0))
+        super().__init__(path, buffer_size=buffer_size, resume_turn=resume_turn)
+
+    def _start(self):
+        self.file.write(self._header(0, self.header_size))
+
+    def _records_up_to(self, turn):
+        with open(self.path, "rb") as file:
+            header = file.read(10)
+        if len(header) < 10:
+            return None
+        if header[:8] != b"\x93NUMPY\x01\x00" or 10 + struct.unpack("<H", header[8:])[0] != self.header_size:
+            raise ValueError(f"Can't carry on writing metrics to {self.path}, it wasn't written by a NumpySink")
+        # A run that stopped without closing the sink left a header with no records in it, so the records are
+        # counted from the size of the file, leaving out any record that was only partly written
+        size = self.path.stat().st_size - self.header_size
+        turns = self.np.fromfile(self.path, dtype=self.dtype, count=max(size, 0) // self.dtype.itemsize,
+                                 offset=self.header_size)["turn"]
+        rows = int(self.np.count_nonzero(turns <= turn))
+        return self.header_size + rows * self.dtype.itemsize, rows
+
+    def _header(self, rows, size):
+        """The .npy header of an array of a number of rows, padded with spaces to size bytes."""
+        description = repr({
+            "descr": self.np.lib.format.dtype_to_descr(self.dtype), "fortran_order": False, "shape": (rows,),
+        }).encode("latin1")
+        # Magic string, version 1.0, the length of the rest of the header, then the description ending in a newline.
+        # The whole header is a multiple of 64 bytes long so that the data that follows it is aligned
+        size = size or -(-(len(description) + 11) // 64) * 64
+        return b"\x93NUMPY\x01\x00" + struct.pack("<H", size - 10) + description.ljust(size - 11) + b"\n"
+
+    def _write_chunk(self, records):
+        self.np.array([tuple(record[field] for field in FIELDS) for record in records], dtype=self.dtype).tofile(
+            self.file)
+
+    def _finish(self):
+        self.file.seek(0)
+        self.file.write(self._header(self.written, self.header_size))
+
+
+# The sink for each file extension
+SINKS = {
+    ".csv": CsvSink,
+    ".jsonl": JsonLinesSink,
+    ".npy": NumpySink,
+}
+
+
+def open_sink(path, buffer_size=1000, resume_turn=None):
+    """
+    Open the sink for a file, chosen by its extension.
+
+    Args:
+        path: The file to write the records to, ending in .csv, .jsonl or .npy.
+        buffer_size: The number of records to keep before writing them.
+        resume_turn: The turn of the checkpoint a resumed run carries on from, the file's records up to this turn
+                     are kept.
+
+    Returns:
+        MetricsSink: The sink.
+
+    Raises:
+        ValueError: If there is no sink for the file's extension.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix not in SINKS:
+        raise ValueError(f"Can't write metrics to {path}, the file must end in {', '.join(SINKS)}")
+    return SINKS[suffix](path, buffer_size=buffer_size, resume_turn=resume_turn)
+
+
+def _lines_up_to(path, turn, turn_of, skip=0):
+    """
+    Find the lines of a text file that hold records up to a turn.
+
+    Args:
+        path: The file.
+        turn: The last turn to keep.
+        turn_of: A function taking a line, as bytes, that returns the turn of its record.
+        skip: The number of lines at the start of the file that don't hold records, they are always kept.
+
+    Returns:
+        tuple: The number of bytes the kept lines take up, and the number of records in them.
+    """
+    length = 0
+    records = 0
+    with open(path, "rb") as file:
+        for number, line in enumerate(file):
+            # A line without a newline was only partly written before the earlier run stopped
+            if not line.endswith(b"\n") or (number >= skip and turn_of(line) > turn):
+                break
+            length += len(line)
+            records += number >= skip
+    return length, records
+
+
+def _is_nan(value):
+    return isinstance(value, float) and math.isnan(value)
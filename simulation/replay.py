@@ -0,0 +1,323 @@
+"""A compact binary log of an invasion that can be played back, and jumped about in, without re-running it."""
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+
+from characters.roles import HUMAN, ZOMBIE
+from simulation.walls import WallMap
+
+MAGIC = b"ZREPLAY\x00"
+VERSION = 2
+
+# The magic number, version, width, height, whether there is a seed, the seed and the keyframe interval.  From version 2
+# the header is followed by the number of bytes in the bits of the wall map, and the bits
+HEADER = struct.Struct("<8sHIIBQI")
+# The kind of frame, the turn it is the end of and the number of bytes that follow
+FRAME = struct.Struct("<BII")
+COUNT = struct.Struct("<I")
+
+KEYFRAME = 0
+DELTA = 1
+
+# The smallest and largest step a move can be stored as, anything further is stored as a removal and an addition
+INT16_MIN = -32768
+INT16_MAX = 32767
+
+
+def _pack(typecode, values):
+    """Pack a sequence of numbers into little endian bytes."""
+    packed = array(typecode, values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack(typecode, buffer, offset, count):
+    """
+    Unpack a number of little endian numbers from a buffer.
+
+    Returns:
+        tuple: The numbers as an array and the offset of the first byte after them.
+    """
+    unpacked = array(typecode)
+    end = offset + count * unpacked.itemsize
+    unpacked.frombytes(buffer[offset:end])
+    if sys.byteorder == "big":
+        unpacked.byteswap()
+    return unpacked, end
+
+
+def board_state(board):
+    """
+    The role and location of every character on a board.
+
+    Args:
+        board: The game board.
+
+    Returns:
+        dict: The (role, x, y) of every character on the board by the character's id.
+    """
+    return {
+        character.id: (character.role, location[0], location[1])
+        for character, location in board.character_locations.items()
+    }
+
+
+class ReplayRecorder:
+    """
+    Writes the log of an invasion as it is run.
+
+    Every turn is written as the changes since the turn before: the step every character that moved took, stored as
+    a pair of 16 bit numbers, and the ids of the characters that changed role.  Every keyframe_interval turns the
+    whole board is written instead, so a replay can jump to any turn by reading the keyframe before it and applying
+    at most keyframe_interval - 1 turns of changes.
+    """
+    def __init__(self, path, keyframe_interval=100):
+        """
+        Initialise the recorder.
+
+        Args:
+            path: The file to write the log to.
+            keyframe_interval: The number of turns between each snapshot of the whole board.
+        """
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self._file = None
+        self._state = None
+
+    def start(self, engine):
+        """
+        Open the log and write the board as it is before the first turn.
+
+        Args:
+            engine: The simulation engine being recorded, after it has been populated.
+        """
+        board = engine.board
+        seed = engine.seed
+        self._file = open(self.path, "wb")
+        self._file.write(HEADER.pack(
+            MAGIC, VERSION, board.width, board.height, seed is not None, (seed or 0) % 2 ** 64, self.keyframe_interval
+        ))
+        self._file.write(COUNT.pack(len(board.walls.bits)))
+        self._file.write(board.walls.bits)
+        self._state = board_state(board)
+        self._write_keyframe(engine.turn_count)
+
+    def record_turn(self, engine):
+        """
+        Write the changes made by the turn that has just been run.
+
+        Args:
+            engine: The simulation engine being recorded.
+        """
+        state = board_state(engine.board)
+        if engine.turn_count % self.keyframe_interval == 0:
+            self._state = state
+            self._write_keyframe(engine.turn_count)
+        else:
+            self._write_delta(engine.turn_count, state)
+            self._state = state
+
+    def close(self):
+        """Finish writing the log."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write_frame(self, kind, turn, payload):
+        """Write a frame to the log."""
+        self._file.write(FRAME.pack(kind, turn, len(payload)))
+        self._file.write(payload)
+
+    def _write_keyframe(self, turn):
+        """Write the whole board."""
+        ids = list(self._state)
+        roles, xs, ys = zip(*self._state.values()) if ids else ((), (), ())
+        self._write_frame(KEYFRAME, turn, b"".join((
+            COUNT.pack(len(ids)), _pack("I", ids), _pack("B", roles), _pack("i", xs), _pack("i", ys),
+        )))
+
+    def _write_delta(self, turn, state):
+        """Write the changes between the last turn and this one."""
+        previous = self._state
+        moved, dxs, dys = [], [], []
+        changed, roles = [], []
+        added = []
+
+        for character_id, (role, x, y) in state.items():
+            before = previous.get(character_id)
+            if before is None:
+                added.append(character_id)
+                continue
+            dx, dy = x - before[1], y - before[2]
+            if not (INT16_MIN <= dx <= INT16_MAX and INT16_MIN <= dy <= INT16_MAX):
+                added.append(character_id)
+                continue
+            if dx or dy:
+                moved.append(character_id)
+                dxs.append(dx)
+                dys.append(dy)
+            if role != before[0]:
+                changed.append(character_id)
+                roles.append(role)
+
+        # Characters that jumped too far for a 16 bit step are removed and added again
+        removed = [character_id for character_id in previous if character_id not in state]
+        removed.extend(character_id for character_id in added if character_id in previous)
+        added_roles = [state[character_id][0] for character_id in added]
+        added_xs = [state[character_id][1] for character_id in added]
+        added_ys = [state[character_id][2] for character_id in added]
+
+        self._write_frame(DELTA, turn, b"".join((
+            COUNT.pack(len(moved)), _pack("I", moved), _pack("h", dxs), _pack("h", dys),
+            COUNT.pack(len(changed)), _pack("I", changed), _pack("B", roles),
+            COUNT.pack(len(removed)), _pack("I", removed),
+            COUNT.pack(len(added)), _pack("I", added), _pack("B", added_roles), _pack("i", added_xs),
+            _pack("i", added_ys),
+        )))
+
+
+class Replay:
+    """
+    A log written by ReplayRecorder, opened for playing back.
+
+    The file is memory mapped and indexed when it is opened, which only reads the header of every frame, so opening
+    even a very long replay is quick.
+    """
+    def __init__(self, path):
+        """
+        Open a replay.
+
+        Args:
+            path: The file the log was written to.
+
+        Raises:
+            ValueError: If the file isn't a replay, or was written by a newer version.
+        """
+        with open(path, "rb") as replay_file:
+            self._buffer = mmap.mmap(replay_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.width, self.height, has_seed, seed, self.keyframe_interval = HEADER.unpack_from(
+            self._buffer, 0
+        )
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a replay")
+        if version > VERSION:
+            raise ValueError(f"{path} was written by a newer version of the replay format")
+        self.seed = seed if has_seed else None
+
+        offset = HEADER.size
+        self.walls = WallMap(self.width, self.height)
+        if version >= 2:
+            (length,) = COUNT.unpack_from(self._buffer, offset)
+            offset += COUNT.size
+            self.walls.load(self._buffer[offset:offset + length])
+            offset += length
+
+        # The offset and kind of the frame for every turn, and the turns that have keyframes
+        self._frames = {}
+        self._keyframes = []
+        while offset < len(self._buffer):
+            kind, turn, length = FRAME.unpack_from(self._buffer, offset)
+            self._frames[turn] = (kind, offset + FRAME.size)
+            if kind == KEYFRAME:
+                self._keyframes.append(turn)
+            offset += FRAME.size + length
+        self.first_turn = self._keyframes[0]
+        self.last_turn = max(self._frames)
+
+    def close(self):
+        """Close the replay file."""
+        self._buffer.close()
+
+    def state_at(self, turn):
+        """
+        The role and location of every character at the end of a turn.
+
+        Only the keyframe before the turn and the changes since it are read, so this costs the same wherever the turn
+        is in the replay.
+
+        Args:
+            turn: The turn, 0 is the board before the first turn.
+
+        Returns:
+            dict: The (role, x, y) of every character by the character's id.
+
+        Raises:
+            IndexError: If the turn isn't in the replay.
+        """
+        if turn not in self._frames:
+            raise IndexError(f"Turn {turn} is not in the replay")
+        keyframe = self._keyframes[bisect_right(self._keyframes, turn) - 1]
+        state = self._read_keyframe(self._frames[keyframe][1])
+        for next_turn in range(keyframe + 1, turn + 1):
+            self.apply_turn(state, next_turn)
+        return state
+
+    def apply_turn(self, state, turn):
+        """
+        Bring the state at the end of the turn before up to the end of a turn.
+
+        Args:
+            state: The state at the end of the turn before, as returned by state_at.  It is changed in place.
+            turn: The turn to apply.
+
+        Returns:
+            dict: What every character that moved, changed role, was removed or was added was before the turn, by the
+                  character's id.  Characters that were added are given as None.
+        """
+        kind, offset = self._frames[turn]
+        if kind == KEYFRAME:
+            new_state = self._read_keyframe(offset)
+            before = {
+                character_id: state.get(character_id) for character_id in set(state) | set(new_state)
+                if state.get(character_id) != new_state.get(character_id)
+            }
+            state.clear()
+            state.update(new_state)
+            return before
+
+        buffer = self._buffer
+        before = {}
+        (count,) = COUNT.unpack_from(buffer, offset)
+        moved, offset = _unpack("I", buffer, offset + COUNT.size, count)
+        dxs, offset = _unpack("h", buffer, offset, count)
+        dys, offset = _unpack("h", buffer, offset, count)
+        for character_id, dx, dy in zip(moved, dxs, dys):
+            role, x, y = before[character_id] = state[character_id]
+            state[character_id] = (role, x + dx, y + dy)
+
+        (count,) = COUNT.unpack_from(buffer, offset)
+        converted, offset = _unpack("I", buffer, offset + COUNT.size, count)
+        roles, offset = _unpack("B", buffer, offset, count)
+        for character_id, role in zip(converted, roles):
+            _, x, y = state[character_id]
+            before.setdefault(character_id, state[character_id])
+            state[character_id] = (role, x, y)
+
+        (count,) = COUNT.unpack_from(buffer, offset)
+        removed, offset = _unpack("I", buffer, offset + COUNT.size, count)
+        for character_id in removed:
+            before.setdefault(character_id, state.pop(character_id))
+
+        (count,) = COUNT.unpack_from(buffer, offset)
+        added, offset = _unpack("I", buffer, offset + COUNT.size, count)
+        added_roles, offset = _unpack("B", buffer, offset, count)
+        added_xs, offset = _unpack("i", buffer, offset, count)
+        added_ys, offset = _unpack("i", buffer, offset, count)
+        for character_id, role, x, y in zip(added, added_roles, added_xs, added_ys):
+            before.setdefault(character_id, None)
+            state[character_id] = (role, x, y)
+
+        return before
+
+    def _read_keyframe(self, offset):
+        """Read the whole board from a keyframe."""
+        (count,) = COUNT.unpack_from(self._buffer, offset)
+        ids, offset = _unpack("I", self._buffer, offset + COUNT.size, count)
+        roles, offset = _unpack("B", self._buffer, offset, count)
+        xs, offset = _unpack("i", self._buffer, offset, count)
+        ys, offset = _unpack("i", self._buffer, offset, count)
+        return {character_id: (role, x, y) for character_id, role, x, y in zip(ids, roles, xs, ys)}
@@ -0,0 +1,188 @@
+"""Deciding how many turns of an invasion to run for each frame that is drawn."""
+import time
+
+PLAYING = "playing"
+PAUSED = "paused"
+STOPPED = "stopped"
+
+# The speeds the invasion can be played at in turns per second, faster and slower step through them
+SPEEDS = (0.5, 1, 2, 4, 8, 16, 32, 64)
+
+
+class TurnScheduler:
+    """
+    Runs the turns of an invasion at a rate that is independent of how often the screen is drawn.
+
+    There are three ways of pacing the turns:
+
+    * At a speed in turns per second.  Turns owed since the last frame are run, so the invasion keeps its speed
+      whatever the frame rate.
+    * Fast-forward, which runs a fixed number of turns every frame.
+    * To a frame budget, which runs as many turns as fit in a number of seconds every frame, so that long invasions on
+      large grids go as fast as the CPU allows while the screen is still drawn at a steady rate.
+
+    The scheduler also keeps track of whether the invasion is playing, paused or stopped.  A stopped invasion runs no
+    more turns until it is restarted with a new engine.
+    """
+    def __init__(self, engine, turns_per_second=2, turns_per_frame=None, frame_budget=None, timer=time.perf_counter):
+        """
+        Initialise the scheduler, playing.
+
+        Args:
+            engine: The simulation engine to run turns of.
+            turns_per_second: The speed of the invasion when it isn't fast-forwarded or run to a budget.
+            turns_per_frame: If given, fast-forward by this many turns every frame.
+            frame_budget: If given, run as many turns as fit in this many seconds every frame.
+            timer: The function used to measure time against the frame budget.
+        """
+        self.engine = engine
+        self.turns_per_second = turns_per_second
+        self.turns_per_frame = turns_per_frame
+        self.frame_budget = frame_budget
+        self.timer = timer
+        self.state = PLAYING
+        # The fraction of a turn that was owed but not run last frame
+        self._owed = 0.0
+
+    def play(self):
+        """Play the invasion, if it was stopped it stays stopped until it is restarted."""
+        if self.state != STOPPED:
+            self.state = PLAYING
+
+    def pause(self):
+        """Pause the invasion."""
+        if self.state != STOPPED:
+            self.state = PAUSED
+            self._owed = 0.0
+
+    def toggle_pause(self):
+        """Pause the invasion if it's playing and play it if it's paused."""
+        if self.state == PLAYING:
+            self.pause()
+        else:
+            self.play()
+
+    def stop(self):
+        """Stop the invasion, no more turns are run until it is restarted."""
+        self.state = STOPPED
+        self._owed = 0.0
+
+    def restart(self, engine):
+        """
+        Start playing a new invasion.
+
+        Args:
+            engine: The simulation engine of the new invasion.
+        """
+        self.engine = engine
+        self.state = PLAYING
+        self._owed = 0.0
+
+    def step(self):
+        """
+        Pause the invasion and run a single turn.
+
+        Returns:
+            int: The number of turns run, which is 0 if the invasion is over or stopped.
+        """
+        self.pause()
+        if self.state == STOPPED or self.engine.is_over():
+            return 0
+        self.engine.commence_turn()
+        return 1
+
+    def faster(self):
+        """Play at the next speed up, or double the fast-forward if the invasion is being fast-forwarded."""
+        if self.turns_per_frame is not None:
+            self.turns_per_frame *= 2
+        else:
+            self.turns_per_second = next((speed for speed in SPEEDS if speed > self.turns_per_second), SPEEDS[-1])
+
+    def slower(self):
+        """Play at the next speed down, or halve the fast-forward if the invasion is being fast-forwarded."""
+        if self.turns_per_frame is not None:
+            self.turns_per_frame = max(1, self.turns_per_frame // 2)
+        else:
+            self.turns_per_second = next(
+                (speed for speed in reversed(SPEEDS) if speed < self.turns_per_second), SPEEDS[0]
+            )
+
+    def fast_forward(self, turns_per_frame):
+        """
+        Run a fixed number of turns every frame.
+
+        Args:
+            turns_per_frame: The number of turns, or None to go back to playing at turns_per_second.
+        """
+        self.turns_per_frame = turns_per_frame
+        self.frame_budget = None
+
+    def run_to_budget(self, frame_budget):
+        """
+        Run as many turns as fit in a frame budget every frame.
+
+        Args:
+            frame_budget: The number of seconds of each frame to spend on turns, or None to go back to playing at
+                          turns_per_second.
+        """
+        self.frame_budget = frame_budget
+        self.turns_per_frame = None
+
+    def describe(self):
+        """
+        A short description of the pace of the invasion, such as "playing at 4 turns/s".
+
+        Returns:
+            str: The description.
+        """
+        if self.frame_budget is not None:
+            pace = f"{self.frame_budget * 1000:g} ms of turns/frame"
+        elif self.turns_per_frame is not None:
+            pace = f"{self.turns_per_frame} turns/frame"
+        else:
+            pace = f"{self.turns_per_second:g} turns/s"
+        return f"{self.state} at {pace}"
+
+    def update(self, elapsed):
+        """
+        Run the turns that are due this frame.
+
+        Args:
+            elapsed: The number of seconds since the last frame.
+
+        Returns:
+            int: The number of turns run.
+        """
+        if self.state != PLAYING:
+            return 0
+
+        if self.frame_budget is not None:
+            return self._run_to_budget()
+
+        if self.turns_per_frame is not None:
+            due = self.turns_per_frame
+        else:
+            self._owed += elapsed * self.turns_per_second
+            due = int(self._owed)
+            self._owed -= due
+            # A long stall, such as the window being dragged, shouldn't be followed by a burst of turns to catch up
+            if due > self.turns_per_second:
+                due = max(1, int(self.turns_per_second))
+                self._owed = 0.0
+
+        turns = 0
+        while turns < due and not self.engine.is_over():
+            self.engine.commence_turn()
+            turns += 1
+        return turns
+
+    def _run_to_budget(self):
+        """Run turns until the frame budget is spent, always running at least one."""
+        deadline = self.timer() + self.frame_budget
+        turns = 0
+        while not self.engine.is_over():
+            self.engine.commence_turn()
+            turns += 1
+            if self.timer() >= deadline:
+                break
+        return turns
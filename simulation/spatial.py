@@ -0,0 +1,207 @@
+"""Spatial queries over the characters on a board."""
+
+
+def pace_distance(location, other_location):
+    """
+    The number of paces between two locations.
+
+    A pace may be taken in any of the eight compass directions, so this is the Chebyshev distance between the two
+    locations.
+
+    Args:
+        location: The (x, y) coordinates of the first location.
+        other_location: The (x, y) coordinates of the second location.
+
+    Returns:
+        int: The number of paces from one location to the other.
+    """
+    return max(abs(location[0] - other_location[0]), abs(location[1] - other_location[1]))
+
+
+class SpatialIndex:
+    """
+    A bucketed grid of the characters on a board.
+
+    The board is divided into square buckets of bucket_size x bucket_size cells and each bucket records the
+    characters inside it, grouped by their role.  Queries only visit the buckets that could hold an answer, so
+    finding the nearest character of a role costs roughly the number of characters close to the location rather than
+    the number of characters on the board.
+    """
+    def __init__(self, width, height, bucket_size=8):
+        """
+        Initialise an empty spatial index.
+
+        Args:
+            width: The number of columns on the board.
+            height: The number of rows on the board.
+            bucket_size: The width and height, in cells, of each bucket.
+        """
+        self.width = width
+        self.height = height
+        self.bucket_size = bucket_size
+        self.buckets_wide = (width + bucket_size - 1) // bucket_size
+        self.buckets_high = (height + bucket_size - 1) // bucket_size
+        # Bucket coordinates -> role -> {character: location}.  Dicts are used rather than sets so that
+        # the order of the results, and so any random choice made from them, is repeatable.
+        self.buckets = {}
+
+    def _bucket_of(self, location):
+        """The coordinates of the bucket containing a location."""
+        return (location[0] // self.bucket_size, location[1] // self.bucket_size)
+
+    def add(self, character, location):
+        """
+        Record a character at a location.
+
+        Args:
+            character: The character to add.
+            location: The (x, y) coordinates of the cell the character occupies.
+        """
+        bucket = self.buckets.setdefault(self._bucket_of(location), {})
+        bucket.setdefault(character.role, {})[character] = (location[0], location[1])
+
+    def remove(self, character, location):
+        """
+        Forget about a character.
+
+        Args:
+            character: The character to remove.
+            location: The (x, y) coordinates of the cell the character was recorded at.
+        """
+        bucket_key = self._bucket_of(location)
+        bucket = self.buckets[bucket_key]
+        members = bucket[character.role]
+        del members[character]
+        if not members:
+            del bucket[character.role]
+            if not bucket:
+                del self.buckets[bucket_key]
+
+    def move(self, character, old_location, new_location):
+        """
+        Record that a character has moved.
+
+        Args:
+            character: The character that moved.
+            old_location: The (x, y) coordinates it was recorded at.
+            new_location: The (x, y) coordinates it has moved to.
+        """
+        old_bucket = self._bucket_of(old_location)
+        new_bucket = self._bucket_of(new_location)
+        if old_bucket == new_bucket:
+            self.buckets[new_bucket][character.role][character] = (new_location[0], new_location[1])
+        else:
+            self.remove(character, old_location)
+            self.add(character, new_location)
+
+    def _members(self, bucket_key, role):
+        """Yields the (character, location) pairs of a role within a bucket."""
+        bucket = self.buckets.get(bucket_key)
+        if not bucket:
+            return
+        if role is None:
+            for members in bucket.values():
+                yield from members.items()
+        elif role in bucket:
+            yield from bucket[role].items()
+
+    def _ring(self, center, radius):
+        """Yields the coordinates of the buckets that are exactly radius buckets away from center."""
+        cx, cy = center
+        if radius == 0:
+            yield center
+            return
+
+        first_x, last_x = max(cx - radius, 0), min(cx + radius, self.buckets_wide - 1)
+        # The top and bottom edges of the ring
+        for by in (cy - radius, cy + radius):
+            if 0 <= by < self.buckets_high:
+                for bx in range(first_x, last_x + 1):
+                    yield (bx, by)
+        # The left and right edges, without the corners that have already been visited
+        first_y, last_y = max(cy - radius + 1, 0), min(cy + radius - 1, self.buckets_high - 1)
+        for bx in (cx - radius, cx + radius):
+            if 0 <= bx < self.buckets_wide:
+                for by in range(first_y, last_y + 1):
+                    yield (bx, by)
+
+    def nearest(self, location, role=None, max_distance=None):
+        """
+        Find the characters of a role that are the fewest paces from a location.
+
+        Args:
+            location: The (x, y) coordinates to search from.
+            role: Only characters with this role, such as HUMAN, are considered.  All characters are considered if
+                  it is None.
+            max_distance: Characters further than this number of paces away are ignored.
+
+        Returns:
+            tuple: The number of paces to the nearest characters and a list of every character at that distance.
+                   If there is no such character the distance is None and the list is empty.
+        """
+        center = self._bucket_of(location)
+        max_radius = max(center[0], self.buckets_wide - 1 - center[0], center[1], self.buckets_high - 1 - center[1])
+        best_distance = None
+        nearest = []
+
+        for radius in range(max_radius + 1):
+            # Nothing in this ring, or beyond it, can be closer than this many paces
+            closest_possible = (radius - 1) * self.bucket_size + 1 if radius else 0
+            if best_distance is not None and closest_possible > best_distance:
+                break
+            if max_distance is not None and closest_possible > max_distance:
+                break
+
+            for bucket_key in self._ring(center, radius):
+                for character, character_location in self._members(bucket_key, role):
+                    distance = pace_distance(location, character_location)
+                    if max_distance is not None and distance > max_distance:
+                        continue
+                    if best_distance is None or distance < best_distance:
+                        best_distance = distance
+                        nearest = [character]
+                    elif distance == best_distance:
+                        nearest.append(character)
+
+        return best_distance, nearest
+
+    def _within(self, location, radius, role):
+        """Yields the (character, distance) pairs of a role that are no more than radius paces from a location."""
+        first_bucket = self._bucket_of((max(location[0] - radius, 0), max(location[1] - radius, 0)))
+        last_bucket = self._bucket_of((location[0] + radius, location[1] + radius))
+
+        for bx in range(first_bucket[0], min(last_bucket[0], self.buckets_wide - 1) + 1):
+            for by in range(first_bucket[1], min(last_bucket[1], self.buckets_high - 1) + 1):
+                for character, character_location in self._members((bx, by), role):
+                    distance = pace_distance(location, character_location)
+                    if distance <= radius:
+                        yield character, distance
+
+    def within_radius(self, location, radius, role=None):
+        """
+        Find the characters of a role that are no more than a number of paces from a location.
+
+        Args:
+            location: The (x, y) coordinates to search from.
+            radius: The greatest number of paces away a character may be.
+            role: Only characters with this role, such as HUMAN, are considered.  All characters are considered if
+                  it is None.
+
+        Returns:
+            list: The characters within the radius.
+        """
+        return [character for character, _ in self._within(location, radius, role)]
+
+    def adjacent(self, location, role=None):
+        """
+        Find the characters of a role in the eight cells surrounding a location.
+
+        Args:
+            location: The (x, y) coordinates to search around.
+            role: Only characters with this role, such as HUMAN, are considered.  All characters are considered if
+                  it is None.
+
+        Returns:
+            list: The characters in the neighbouring cells, not including the cell at the location itself.
+        """
+        return [character for character, distance in self._within(location, 1, role) if distance == 1]
@@ -0,0 +1,642 @@
+"""
+A simulation engine that splits one board between several processes.
+
+The board is cut into horizontal stripes of rows and each stripe is looked after by its own worker process.  Every
+array the turn needs lives in shared memory, so a worker reads the rows either side of its stripe (its halo) straight
+from its neighbours' memory rather than having them copied to it, and the workers meet at a barrier between each
+phase of a turn so that nobody reads a row while it is being written.
+
+A random choice can't depend on the order characters are handled in, or the stripes would change the result, so
+rather than drawing from a generator every choice is worked out from the seed, the turn and the character it is
+made for.  The same seed gives exactly the same invasion whether it runs in one process or in many.  It is not the
+invasion the VectorizedEngine plays with that seed, which draws its choices from a generator, so the two engines can
+only be compared over many seeds and never seed for seed.
+"""
+import multiprocessing
+import os
+import weakref
+from multiprocessing import shared_memory
+from threading import BrokenBarrierError
+
+import numpy as np
+
+from characters.roles import HUMAN, ZOMBIE
+from simulation.vectorized import VectorizedEngine, DIRECTION_OFFSETS, paces_to_edge, _ring_offsets
+
+# The independent streams of random numbers a turn needs
+HUMAN_WALK = 0
+HUNT_ORDER = 1
+ZOMBIE_WALK = 2
+STREAMS = 3
+
+_MASK = (1 << 64) - 1
+
+
+def _mix(values):
+    """Scramble an array of 64 bit integers with the SplitMix64 finaliser, so that nearby values look unrelated."""
+    z = values + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def random_bits(salt, turn, stream, indexes):
+    """
+    Random 64 bit integers for characters, that only depend on who they are for and not on when they are asked for.
+
+    Args:
+        salt: A random number fixed for the whole invasion, worked out from its seed.
+        turn: The turn the numbers are for.
+        stream: Which of the streams of numbers a turn needs, HUMAN_WALK, HUNT_ORDER or ZOMBIE_WALK.
+        indexes: The indexes of the characters to give a number to.
+
+    Returns:
+        np.ndarray: A uint64 for every index.
+    """
+    base = _mix(np.array([(salt + turn * STREAMS + stream) & _MASK], dtype=np.uint64))
+    with np.errstate(over="ignore"):
+        return _mix(np.asarray(indexes).astype(np.uint64) ^ base)
+
+
+def stripe_bounds(height, stripes):
+    """
+    The rows each stripe of a board is made of.
+
+    Args:
+        height: The number of rows on the board.
+        stripes: The number of stripes to cut it into, there are never more stripes than rows.
+
+    Returns:
+        list: The first row of each stripe, followed by the height of the board.
+    """
+    stripes = max(1, min(stripes, height))
+    return [height * stripe // stripes for stripe in range(stripes + 1)]
+
+
+class _NoBarrier:
+    """Stands in for a barrier when a single stripe covers the whole board."""
+    def wait(self):
+        pass
+
+
+class Stripe:
+    """
+    The part of a turn played out in one stripe of the board.
+
+    A stripe moves the humans and hunts with the zombies that are in its rows at the start of the turn, settles which
+    zombies get to the squares in its rows, and converts the humans in its rows.  Reading anything else, such as the
+    humans a zombie near its edge can see in the next stripe, is done straight from the shared arrays once the
+    barrier says that stripe has finished writing them.
+
+    Each stripe keeps a list of the characters in its rows, so a turn only costs it the work of its own characters
+    and the rows around them.  A human that walks out of the stripe, or a zombie that proposes walking out of it, is
+    posted where the stripes it could reach will pick it up.
+    """
+    def __init__(self, arrays, width, height, human_paces, zombie_paces, salt, bounds, index):
+        """
+        Initialise a stripe.
+
+        Args:
+            arrays: The arrays shared by every stripe, from StripedEngine.array_layout.
+            width: The number of columns on the board.
+            height: The number of rows on the board.
+            human_paces: The number of paces a human walks each turn.
+            zombie_paces: The number of paces a zombie walks each turn.
+            salt: The number every random choice of the invasion is worked out from.
+            bounds: The first row of every stripe, followed by the height of the board.
+            index: Which of the stripes this is.
+        """
+        self.__dict__.update(arrays)
+        self.width = width
+        self.height = height
+        self.human_paces = human_paces
+        self.zombie_paces = zombie_paces
+        self.salt = salt
+        self.index = index
+        self.top, self.bottom = bounds[index], bounds[index + 1]
+        # Characters are told apart in the hunt order by the low bits of their key
+        self.index_bits = max(1, len(self.x).bit_length())
+        # The other stripes a human or zombie could walk in from in a turn
+        self.human_neighbours = self._neighbours(bounds, human_paces)
+        self.zombie_neighbours = self._neighbours(bounds, zombie_paces)
+        # The indexes of the characters in this stripe's rows
+        self.characters = np.flatnonzero((self.y >= self.top) & (self.y < self.bottom))
+
+    def _neighbours(self, bounds, paces):
+        """The other stripes with rows no more than a number of paces from this stripe's rows."""
+        return [
+            other for other in range(len(bounds) - 1)
+            if other != self.index and bounds[other] < self.bottom + paces and bounds[other + 1] > self.top - paces
+        ]
+
+    def _in_rows(self, characters):
+        """The characters of a list that are in this stripe's rows."""
+        return characters[(self.y[characters] >= self.top) & (self.y[characters] < self.bottom)]
+
+    def _post(self, characters):
+        """Leave characters for the neighbouring stripes to pick up after the next barrier."""
+        self.posted[self.index, :len(characters)] = characters
+        self.posted_counts[self.index] = len(characters)
+
+    def _collect(self, neighbours):
+        """The characters the neighbouring stripes have posted."""
+        return np.concatenate(
+            [self.posted[other, :self.posted_counts[other]] for other in neighbours] + [np.empty(0, dtype=np.int64)]
+        )
+
+    def run_turn(self, turn, barrier):
+        """
+        Play this stripe's part of a turn.
+
+        Args:
+            turn: The number of the turn, which decides its random choices.
+            barrier: Where every stripe waits for the others to finish a phase before starting the next.
+        """
+        characters = self.characters
+        # Only the zombies that are zombies at the start of the turn hunt this turn
+        zombies = characters[self.role[characters] == ZOMBIE]
+        self.proposal[zombies] = -1
+
+        humans = characters[self.role[characters] == HUMAN]
+        self._move_humans(turn, humans)
+        self._post(humans[(self.y[humans] < self.top) | (self.y[humans] >= self.bottom)])
+        barrier.wait()
+        characters = np.concatenate([self._in_rows(characters), self._in_rows(self._collect(self.human_neighbours))])
+        self._mark_zombies(characters)
+        self._convert_humans(characters)
+        self._mark_humans(turn, characters)
+        barrier.wait()
+        self._hunt(turn, zombies)
+        proposal = self.proposal[zombies]
+        leaving = (proposal >= 0) & ((proposal < self.top * self.width) | (proposal >= self.bottom * self.width))
+        self._post(zombies[leaving])
+        barrier.wait()
+        arrivals = self._settle_claims(zombies)
+        barrier.wait()
+        # Zombies that walked out of the stripe were moved by the stripe they walked into
+        characters = np.concatenate([self._in_rows(characters), arrivals])
+        self._mark_zombies(characters)
+        self._convert_humans(characters)
+        self.characters = characters
+
+    def _move_humans(self, turn, humans):
+        """Every human walks human_paces paces in a random direction, stopping at the edge of the grid."""
+        directions = DIRECTION_OFFSETS[random_bits(self.salt, turn, HUMAN_WALK, humans) % np.uint64(8)]
+        x, y = self.x[humans], self.y[humans]
+        paces = paces_to_edge(x, y, directions, self.human_paces, self.width, self.height)
+        self.x[humans] = x + directions[:, 0] * paces
+        self.y[humans] = y + directions[:, 1] * paces
+
+    def _mark_zombies(self, characters):
+        """Record which of this stripe's squares hold a zombie."""
+        self.zombie_cells[self.top:self.bottom] = 0
+        zombies = characters[self.role[characters] == ZOMBIE]
+        self.zombie_cells[self.y[zombies], self.x[zombies]] = 1
+        self.human_counts[self.index] = np.count_nonzero(self.role[characters] == HUMAN)
+
+    def _convert_humans(self, characters):
+        """Turn the humans in this stripe that share a square with a zombie into zombies."""
+        humans = characters[self.role[characters] == HUMAN]
+        caught = humans[self.zombie_cells[self.y[humans], self.x[humans]] == 1]
+        self.role[caught] = ZOMBIE
+        self.target[caught] = -1
+        self.human_counts[self.index] -= len(caught)
+
+    def _mark_humans(self, turn, characters):
+        """
+        Record the human with the highest key in each of this stripe's squares.
+
+        Every human is given a random key each turn, and a zombie with several humans equally near hunts the one with
+        the highest key.  The index of the human is kept in the low bits of its key, so no two keys are the same.
+        """
+        self.human_keys[self.top:self.bottom] = -1
+        humans = characters[self.role[characters] == HUMAN]
+        np.maximum.at(self.human_keys, (self.y[humans], self.x[humans]), self.hunt_keys(turn, humans))
+
+    def hunt_keys(self, turn, humans):
+        """The key each human has in the hunt order of a turn."""
+        bits = self.index_bits
+        randomness = (random_bits(self.salt, turn, HUNT_ORDER, humans) >> np.uint64(bits + 1)).astype(np.int64)
+        return (randomness << bits) | humans
+
+    def nearest_humans(self, zombies):
+        """
+        Find the nearest human to each zombie.
+
+        Zombies search the rings of squares around them a pace further out each round, as they do in the vectorized
+        engine, until that would cost more than growing a distance field over the rows around the stripe.  Both ways
+        find the human with the highest key amongst the nearest, so which is used makes no difference to the result.
+
+        Args:
+            zombies: The indexes of the zombies.
+
+        Returns:
+            tuple: The number of paces to the nearest human for each zombie and the index of that human.
+        """
+        distance = np.full(len(zombies), -1, dtype=np.int64)
+        keys = np.full(len(zombies), -1, dtype=np.int64)
+        searching = np.arange(len(zombies))
+        paces = 0
+
+        while len(searching) and paces < max(self.width, self.height):
+            ring_x, ring_y = _ring_offsets(paces)
+            reach = max(paces, self.bottom - self.top)
+            if len(searching) * len(ring_x) > self.width * min(self.height, self.bottom - self.top + 2 * reach):
+                distance[searching], keys[searching] = self._nearest_by_field(zombies[searching], reach)
+                break
+
+            square_x = self.x[zombies[searching], None] + ring_x
+            square_y = self.y[zombies[searching], None] + ring_y
+            on_grid = (square_x >= 0) & (square_x < self.width) & (square_y >= 0) & (square_y < self.height)
+            found = np.where(
+                on_grid,
+                self.human_keys[np.clip(square_y, 0, self.height - 1), np.clip(square_x, 0, self.width - 1)],
+                -1,
+            ).max(axis=1)
+            done = found >= 0
+            distance[searching[done]] = paces
+            keys[searching[done]] = found[done]
+            searching = searching[~done]
+            paces += 1
+
+        return distance, np.where(keys >= 0, keys & ((1 << self.index_bits) - 1), -1)
+
+    def _nearest_by_field(self, zombies, reach):
+        """
+        Find the nearest human to each of this stripe's zombies with a distance field over the rows around the stripe.
+
+        The field covers the stripe and reach rows either side of it.  A zombie whose nearest human in those rows is
+        closer than any row left out has found its nearest human, the field is grown over twice as many rows for the
+        rest until the rows cover the whole board.
+
+        Args:
+            zombies: The indexes of the zombies, which must be in this stripe's rows.
+            reach: The number of rows either side of the stripe to start with.
+
+        Returns:
+            tuple: The number of paces to the nearest human for each zombie and that human's key.
+        """
+        distance = np.full(len(zombies), -1, dtype=np.int64)
+        keys = np.full(len(zombies), -1, dtype=np.int64)
+        searching = np.arange(len(zombies))
+        farthest = max(self.width, self.height)
+
+        while len(searching):
+            first, last = max(0, self.top - reach), min(self.height, self.bottom + reach)
+            found, found_keys = self._grow_field(zombies[searching], first, last)
+            # The number of paces to the nearest row left out, a human there can be no nearer
+            zombie_y = self.y[zombies[searching]]
+            left_out = np.minimum(zombie_y - first + 1 if first > 0 else farthest,
+                                  last - zombie_y if last < self.height else farthest)
+            if first > 0 or last < self.height:
+                settled = (found >= 0) & (found < left_out)
+            else:
+                settled = np.ones(len(found), dtype=bool)
+            distance[searching[settled]] = found[settled]
+            keys[searching[settled]] = found_keys[settled]
+            searching = searching[~settled]
+            reach *= 2
+
+        return distance, keys
+
+    def _grow_field(self, zombies, first, last):
+        """
+        Find the nearest human to each zombie amongst the humans in some rows, with a distance field grown outwards
+        from every one of them.
+
+        Each square reached is labelled with the highest key of the squares one pace nearer the humans that reach it,
+        which is the highest key of the humans it is nearest to.
+
+        Args:
+            zombies: The indexes of the zombies, which must be in the rows.
+            first: The first row the field covers.
+            last: The row after the last row the field covers.
+
+        Returns:
+            tuple: The number of paces to the nearest human for each zombie, or -1 if there are no humans in the rows,
+                   and that human's key.
+        """
+        label = self.human_keys[first:last].copy()
+        distance = np.where(label >= 0, 0, -1)
+        frontier = label >= 0
+        zombie_x, zombie_y = self.x[zombies], self.y[zombies] - first
+        paces = 0
+
+        while (distance[zombie_y, zombie_x] < 0).any() and frontier.any():
+            paces += 1
+            # The highest key in the 3x3 block around every square, spreading along one axis and then the other
+            spread = np.where(frontier, label, -1)
+            for axis in (0, 1):
+                grown = spread.copy()
+                forward = [slice(None), slice(None)]
+                backward = [slice(None), slice(None)]
+                forward[axis], backward[axis] = slice(1, None), slice(None, -1)
+                forward, backward = tuple(forward), tuple(backward)
+                np.maximum(grown[forward], spread[backward], out=grown[forward])
+                np.maximum(grown[backward], spread[forward], out=grown[backward])
+                spread = grown
+            frontier = (spread >= 0) & (distance < 0)
+            distance[frontier] = paces
+            label[frontier] = spread[frontier]
+
+        return distance[zombie_y, zombie_x], label[zombie_y, zombie_x]
+
+    def _hunt(self, turn, zombies):
+        """
+        Every zombie in this stripe at the start of the turn picks the square it will walk into.
+
+        The square is recorded as the zombie's proposal, and whether it gets there is settled by the stripe the square
+        is in once every stripe has made its proposals.
+        """
+        if len(zombies) == 0:
+            return
+
+        if self.human_counts.sum():
+            distance, nearest = self.nearest_humans(zombies)
+
+            # Keep hunting the same human for as long as it is a human and is amongst the nearest
+            target = self.target[zombies]
+            still_hunted = target >= 0
+            still_hunted[still_hunted] = self.role[target[still_hunted]] == HUMAN
+            target_distance = np.maximum(
+                np.abs(self.x[np.maximum(target, 0)] - self.x[zombies]),
+                np.abs(self.y[np.maximum(target, 0)] - self.y[zombies]),
+            )
+            target = np.where(still_hunted & (target_distance <= distance), target, nearest)
+            self.target[zombies] = target
+
+            steps = np.stack([
+                np.sign(self.x[target] - self.x[zombies]),
+                np.sign(self.y[target] - self.y[zombies]),
+            ], axis=1)
+        else:
+            steps = DIRECTION_OFFSETS[random_bits(self.salt, turn, ZOMBIE_WALK, zombies) % np.uint64(8)]
+
+        paces = paces_to_edge(self.x[zombies], self.y[zombies], steps, self.zombie_paces, self.width, self.height)
+        new_x = self.x[zombies] + steps[:, 0] * paces
+        new_y = self.y[zombies] + steps[:, 1] * paces
+        moving = ((steps[:, 0] != 0) | (steps[:, 1] != 0)) & (paces > 0)
+        # A zombie can't walk into a square that already holds one
+        moving[moving] = self.zombie_cells[new_y[moving], new_x[moving]] == 0
+        self.proposal[zombies[moving]] = new_y[moving] * self.width + new_x[moving]
+
+    def _settle_claims(self, zombies):
+        """
+        Move the zombies that proposed walking into this stripe's squares.
+
+        Of several zombies walking into the same square the one with the lowest index gets there, which is the same
+        zombie whichever stripe it came from.
+
+        Args:
+            zombies: The zombies that hunted in this stripe, the ones that hunted in the neighbouring stripes and
+                     proposed walking out of them are collected from where they were posted.
+
+        Returns:
+            np.ndarray: The indexes of the zombies that walked in from other stripes.
+        """
+        visitors = self._collect(self.zombie_neighbours)
+        claimants = np.concatenate([zombies, visitors])
+        proposal = self.proposal[claimants]
+        claimants = np.sort(claimants[(proposal >= self.top * self.width) & (proposal < self.bottom * self.width)])
+        cells, first = np.unique(self.proposal[claimants], return_index=True)
+        winners = claimants[first]
+        self.x[winners] = cells % self.width
+        self.y[winners] = cells // self.width
+        return winners[np.isin(winners, visitors)]
+
+
+def _run_worker(layout, names, settings, index, start, finish, barrier):
+    """
+    The loop of a stripe's worker process, which plays the stripe's part of every turn until told to stop.
+
+    Args:
+        layout: The shape and dtype of every shared array, from StripedEngine.array_layout.
+        names: The name of the shared memory block holding each array.
+        settings: The arguments for the Stripe other than the arrays and its index.
+        index: Which stripe the worker looks after.
+        start: The barrier every worker and the engine wait at before a turn.
+        finish: The barrier every worker and the engine wait at after a turn.
+        barrier: The barrier the workers wait at between the phases of a turn.
+    """
+    blocks = {name: shared_memory.SharedMemory(name=names[name]) for name in layout}
+    arrays = {name: np.ndarray(shape, dtype=dtype, buffer=blocks[name].buf) for name, (shape, dtype) in layout.items()}
+    stripe = Stripe(arrays, index=index, **settings)
+    try:
+        while True:
+            start.wait()
+            if arrays["control"][0] < 0:
+                break
+            stripe.run_turn(int(arrays["control"][0]), barrier)
+            finish.wait()
+    except BrokenBarrierError:
+        pass
+    except BaseException:
+        # Don't leave the other workers, or the engine, waiting for a worker that is never coming
+        for waiting in (start, finish, barrier):
+            waiting.abort()
+        raise
+    finally:
+        # A block can't be closed while an array still refers to its memory
+        stripe = arrays = None
+        for block in blocks.values():
+            block.close()
+
+
+def _release(blocks):
+    """Free shared memory blocks, whether the engine was closed or just forgotten about."""
+    for block in blocks:
+        block.close()
+        block.unlink()
+
+
+class StripedEngine(VectorizedEngine):
+    """
+    Runs a Zombie Invasion with the board split into horizontal stripes, each played by its own process.
+
+    The rules are those of the VectorizedEngine.  Where it draws random numbers from a generator this engine works
+    them out from the seed, the turn and the character, and a zombie with several humans equally near hunts the one
+    with the highest random key rather than one drawn at random, so the same seed gives the same invasion however many
+    workers run it.  A run with one worker is played in this process, without any shared memory or barriers.
+
+    The workers are started by the first turn and keep running, with the characters in shared memory, until the
+    engine is closed.  Characters can't be added while they are running.
+    """
+    def __init__(self, width=None, height=None, human_count=None, zombie_count=None, seed=None,
+                 human_paces=None, zombie_paces=None, config=None, workers=None):
+        """
+        Initialise the engine with an empty board.
+
+        Each setting that isn't given is taken from the config.
+
+        Args:
+            width: The number of columns in the grid.
+            height: The number of rows in the grid.
+            human_count: The number of humans to place on the board.
+            zombie_count: The number of zombies to place on the board.
+            seed: An optional seed so that a run can be repeated.
+            human_paces: The number of paces a human walks each turn.
+            zombie_paces: The number of paces a zombie walks each turn.
+            config: The SimulationConfig of the invasion, defaults to DEFAULT_CONFIG.
+            workers: The number of processes to split the board between, defaults to the number of CPUs.
+        """
+        super().__init__(width=width, height=height, human_count=human_count, zombie_count=zombie_count, seed=seed,
+                         human_paces=human_paces, zombie_paces=zombie_paces, config=config)
+        self.workers = workers or os.cpu_count() or 1
+        # Every random choice made during the turns is worked out from this, it comes from its own sequence so the
+        # characters are placed just as the vectorized engine places them
+        self.salt = int(np.random.SeedSequence(seed).generate_state(1, dtype=np.uint64)[0])
+        self.bounds = stripe_bounds(self.height, self.workers)
+        self._processes = []
+        self._stripe = None
+
+    def array_layout(self):
+        """
+        The arrays every stripe shares.
+
+        Returns:
+            dict: The name of each array and its shape and dtype.
+        """
+        count = len(self.x)
+        return {
+            "x": ((count,), np.int64),
+            "y": ((count,), np.int64),
+            "role": ((count,), np.int8),
+            "target": ((count,), np.int64),
+            # The row major index of the square each zombie will walk into this turn, or -1
+            "proposal": ((count,), np.int64),
+            # Which squares hold a zombie, and the key of the human to hunt in every square, in [y, x] order so that
+            # each stripe's rows are a single block of memory
+            "zombie_cells": ((self.height, self.width), np.uint8),
+            "human_keys": ((self.height, self.width), np.int64),
+            # The characters each stripe has posted for its neighbours to pick up, and how many.  Only a few characters
+            # are posted each turn, so most of these pages are never written and never take up memory
+            "posted": ((len(self.bounds) - 1, count), np.int64),
+            "posted_counts": ((len(self.bounds) - 1,), np.int64),
+            # The number of humans in each stripe
+            "human_counts": ((len(self.bounds) - 1,), np.int64),
+            # The turn for the workers to play, or -1 to stop
+            "control": ((1,), np.int64),
+        }
+
+    def _settings(self):
+        """The arguments every Stripe is created with, other than the arrays and its index."""
+        return {
+            "width": self.width,
+            "height": self.height,
+            "human_paces": self.human_paces,
+            "zombie_paces": self.zombie_paces,
+            "salt": self.salt,
+            "bounds": self.bounds,
+        }
+
+    def _start(self):
+        """Put the characters where the stripes can reach them, and start the workers."""
+        layout = self.array_layout()
+        if len(self.bounds) == 2:
+            arrays = {name: np.zeros(shape, dtype=dtype) for name, (shape, dtype) in layout.items()}
+            self._share(arrays)
+            self._stripe = Stripe(arrays, index=0, **self._settings())
+            return
+
+        blocks = {
+            name: shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize))
+            for name, (shape, dtype) in layout.items()
+        }
+        self._finalizer = weakref.finalize(self, _release, list(blocks.values()))
+        arrays = {name: np.ndarray(shape, dtype=dtype, buffer=blocks[name].buf)
+                  for name, (shape, dtype) in layout.items()}
+        self._share(arrays)
+
+        stripes = len(self.bounds) - 1
+        context = multiprocessing.get_context()
+        self._start_barrier = context.Barrier(stripes + 1)
+        self._finish_barrier = context.Barrier(stripes + 1)
+        barrier = context.Barrier(stripes)
+        names = {name: block.name for name, block in blocks.items()}
+        for index in range(stripes):
+            process = context.Process(
+                target=_run_worker,
+                args=(layout, names, self._settings(), index, self._start_barrier, self._finish_barrier, barrier),
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+
+    def _share(self, arrays):
+        """Copy the characters into the stripes' arrays and use those arrays from now on."""
+        for name in ("x", "y", "role", "target"):
+            arrays[name][:] = getattr(self, name)
+            setattr(self, name, arrays[name])
+        arrays["proposal"][:] = -1
+        self._arrays = arrays
+
+    def close(self):
+        """Stop the workers and free the shared memory, the characters are copied back to this process first."""
+        if self._stripe is None and not self._processes:
+            return
+        if self._processes:
+            self._arrays["control"][0] = -1
+            try:
+                self._start_barrier.wait()
+            except BrokenBarrierError:
+                pass
+            for process in self._processes:
+                process.join()
+            self._processes = []
+        for name in ("x", "y", "role", "target"):
+            setattr(self, name, getattr(self, name).copy())
+        self._arrays = None
+        self._stripe = None
+        finalizer = getattr(self, "_finalizer", None)
+        if finalizer is not None:
+            finalizer()
+            self._finalizer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add_characters(self, x, y, role):
+        """
+        Place characters on the board.
+
+        Args:
+            x: The x coordinates of the new characters.
+            y: The y coordinates of the new characters.
+            role: The role (HUMAN or ZOMBIE) of each new character.
+        """
+        # The shared arrays are sized for the characters there were when the workers started
+        self.close()
+        super().add_characters(x, y, role)
+
+    def commence_turn(self):
+        """Runs a single turn of the simulation, in every stripe at once."""
+        if self._stripe is None and not self._processes:
+            self._start()
+        if self._stripe is not None:
+            self._stripe.run_turn(self.turn_count, _NoBarrier())
+        else:
+            self._arrays["control"][0] = self.turn_count
+            try:
+                self._start_barrier.wait()
+                self._finish_barrier.wait()
+            except BrokenBarrierError:
+                raise RuntimeError("A stripe worker failed part way through a turn")
+        self.turn_count += 1
+
+    def run(self, max_turns=None):
+        """
+        Run turns until no humans are left, then stop the workers.
+
+        Args:
+            max_turns: An optional limit on the number of turns to run.
+
+        Returns:
+            int: The number of turns that have been run.
+        """
+        try:
+            return super().run(max_turns=max_turns)
+        finally:
+            self.close()
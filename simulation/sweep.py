@@ -0,0 +1,265 @@
+"""Monte Carlo parameter sweeps, running many invasions over a pool of processes."""
+import hashlib
+import itertools
+import math
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+from simulation.config import DEFAULT_CONFIG, SimulationConfig
+
+# The parameters each engine understands, every setting of a SimulationConfig
+ENGINE_PARAMETERS = {
+    "object": set(SimulationConfig.FIELDS),
+    "numpy": set(SimulationConfig.FIELDS),
+}
+
+# Two sided 95% critical values of Student's t distribution by degrees of freedom, beyond 30 the normal value is used
+T_CRITICAL_95 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)
+
+
+def parameter_grid(**parameter_values):
+    """
+    Every combination of a set of parameter values.
+
+    Args:
+        parameter_values: Each keyword is a parameter name and its value is the list of values to try.
+
+    Returns:
+        list: A dict of parameters for every combination, e.g.
+              parameter_grid(width=[20, 40], human_count=[60]) gives
+              [{"width": 20, "human_count": 60}, {"width": 40, "human_count": 60}]
+    """
+    names = list(parameter_values)
+    return [dict(zip(names, values)) for values in itertools.product(*parameter_values.values())]
+
+
+def replicate_seed(base_seed, configuration, replicate):
+    """
+    The seed for one replicate of one configuration.
+
+    Seeds are derived by hashing, so each replicate gets an independent stream that doesn't depend on how many
+    processes the sweep runs on or on the order the runs finish in.
+
+    Args:
+        base_seed: The seed of the whole sweep.
+        configuration: The index of the configuration in the grid.
+        replicate: The index of the replicate within the configuration.
+
+    Returns:
+        int: A 64 bit seed.
+    """
+    digest = hashlib.sha256(f"{base_seed}:{configuration}:{replicate}".encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+def run_replicate(engine, parameters, seed, max_turns=None):
+    """
+    Run a single invasion to extinction.
+
+    This is run in the worker processes, so it creates everything it needs from picklable arguments.  Everything
+    about the invasion is in its own SimulationConfig, so a worker can run invasions of any size back to back.
+
+    Args:
+        engine: The name of the engine to use, "object" or "numpy".
+        parameters: The parameters of the invasion.
+        seed: The seed for the random number generator.
+        max_turns: An optional limit on the number of turns.
+
+    Returns:
+        tuple: The number of turns taken and whether the humans were wiped out in that time.
+    """
+    config = DEFAULT_CONFIG.replace(**parameters)
+    if engine == "numpy":
+        from simulation.vectorized import VectorizedEngine
+
+        simulation = VectorizedEngine(seed=seed, config=config)
+    else:
+        from simulation.engine import SimulationEngine
+
+        simulation = SimulationEngine(seed=seed, config=config)
+
+    simulation.populate()
+    turns = simulation.run(max_turns=max_turns)
+    return turns, simulation.is_over()
+
+
+def summarise(turns):
+    """
+    Summarise the distribution of the number of turns to extinction.
+
+    Args:
+        turns: The number of turns taken by each replicate.
+
+    Returns:
+        dict: The count, mean, standard deviation, the 5th, 25th, 50th, 75th and 95th percentiles and the lower and
+              upper bounds of the 95% confidence interval of the mean.
+    """
+    count = len(turns)
+    mean = statistics.fmean(turns)
+    stdev = statistics.stdev(turns) if count > 1 else 0.0
+    half_width = confidence_half_width(turns)
+    if count > 1:
+        percentiles = statistics.quantiles(turns, n=20, method="inclusive")
+        p5, p25, p50, p75, p95 = percentiles[0], percentiles[4], percentiles[9], percentiles[14], percentiles[18]
+    else:
+        p5 = p25 = p50 = p75 = p95 = float(turns[0])
+
+    return {
+        "count": count,
+        "mean": mean,
+        "stdev": stdev,
+        "p5": p5,
+        "p25": p25,
+        "p50": p50,
+        "p75": p75,
+        "p95": p95,
+        "ci_low": mean - half_width,
+        "ci_high": mean + half_width,
+    }
+
+
+def confidence_half_width(turns):
+    """
+    Half the width of the 95% confidence interval of the mean.
+
+    Args:
+        turns: The number of turns taken by each replicate.
+
+    Returns:
+        float: The half width, which is infinite with fewer than two replicates.
+    """
+    count = len(turns)
+    if count < 2:
+        return math.inf
+    degrees_of_freedom = count - 1
+    critical = T_CRITICAL_95[degrees_of_freedom - 1] if degrees_of_freedom <= len(T_CRITICAL_95) else 1.96
+    return critical * statistics.stdev(turns) / math.sqrt(count)
+
+
+class ConfigurationResult:
+    """The replicates run for one configuration of a sweep."""
+    def __init__(self, index, parameters):
+        """
+        Initialise an empty result.
+
+        Args:
+            index: The index of the configuration in the grid.
+            parameters: The parameters of the configuration.
+        """
+        self.index = index
+        self.parameters = parameters
+        self.turns = []
+        self.unfinished = 0
+
+    def add(self, turns, finished):
+        """
+        Record the outcome of a replicate.
+
+        Args:
+            turns: The number of turns the replicate ran for.
+            finished: Whether the humans were wiped out.
+        """
+        self.turns.append(turns)
+        if not finished:
+            self.unfinished += 1
+
+    def is_settled(self, tolerance):
+        """
+        Check whether the confidence interval is tight enough to stop adding replicates.
+
+        Args:
+            tolerance: The largest acceptable half width of the confidence interval, as a fraction of the mean.
+
+        Returns:
+            bool: True if the half width of the confidence interval is no more than tolerance times the mean.
+        """
+        if len(self.turns) < 2:
+            return False
+        return confidence_half_width(self.turns) <= tolerance * statistics.fmean(self.turns)
+
+    def summary(self):
+        """
+        Summarise the configuration.
+
+        Returns:
+            dict: The parameters, the summary statistics of the turns to extinction and the number of replicates that
+                  hit the turn limit before the humans were wiped out.
+        """
+        return {"parameters": self.parameters, **summarise(self.turns), "unfinished": self.unfinished}
+
+
+def sweep(grid, replicates, engine="object", processes=None, base_seed=0, max_turns=None, ci_tolerance=None,
+          max_replicates=None):
+    """
+    Run a number of invasions for every configuration in a parameter grid.
+
+    Runs are spread over a pool of processes, one run per process at a time.  If ci_tolerance is given then
+    configurations whose confidence interval is still too wide after their replicates are given more, a batch at a
+    time, until it is tight enough or max_replicates is reached.
+
+    Args:
+        grid: A list of parameter dicts, such as the one returned by parameter_grid.
+        replicates: The number of runs of every configuration, and the size of each extra batch.
+        engine: The name of the engine to use, "object" or "numpy".
+        processes: The number of worker processes, defaults to the number of CPUs.  With one process the runs happen
+                   in this process.
+        base_seed: The seed the seed of every run is derived from.
+        max_turns: An optional limit on the number of turns of each run.
+        ci_tolerance: Keep adding replicates to a configuration until the half width of its 95% confidence interval
+                      is no more than this fraction of its mean.
+        max_replicates: The most replicates to run for a configuration when ci_tolerance is given, defaults to ten
+                        times replicates.
+
+    Returns:
+        list: A ConfigurationResult for every configuration, in the order of the grid.
+
+    Raises:
+        ValueError: If a configuration has a parameter the engine doesn't understand.
+    """
+    if engine not in ENGINE_PARAMETERS:
+        raise ValueError(f"Unknown engine {engine}")
+    for parameters in grid:
+        unknown = set(parameters) - ENGINE_PARAMETERS[engine]
+        if unknown:
+            raise ValueError(f"The {engine} engine does not understand {', '.join(sorted(unknown))}")
+
+    if max_replicates is None:
+        max_replicates = replicates * 10
+    results = [ConfigurationResult(index, parameters) for index, parameters in enumerate(grid)]
+    processes = processes or os.cpu_count()
+    executor = ProcessPoolExecutor(max_workers=processes) if processes > 1 else None
+
+    try:
+        pending = results
+        while pending:
+            jobs = []
+            for result in pending:
+                first = len(result.turns)
+                last = min(first + replicates, max_replicates) if ci_tolerance is not None else first + replicates
+                for replicate in range(first, last):
+                    seed = replicate_seed(base_seed, result.index, replicate)
+                    jobs.append((result, (engine, result.parameters, seed, max_turns)))
+
+            if executor is None:
+                outcomes = [run_replicate(*arguments) for _, arguments in jobs]
+            else:
+                outcomes = executor.map(run_replicate, *zip(*(arguments for _, arguments in jobs)))
+            for (result, _), (turns, finished) in zip(jobs, outcomes):
+                result.add(turns, finished)
+
+            if ci_tolerance is None:
+                break
+            pending = [
+                result for result in pending
+                if not result.is_settled(ci_tolerance) and len(result.turns) < max_replicates
+            ]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return results
@@ -0,0 +1,444 @@
+"""
+A simulation engine that keeps every character in NumPy arrays.
+
+The object based Board remains the reference implementation of the rules, this engine follows the same rules with
+whole-population array operations so that it can run invasions of hundreds of thousands of characters.
+"""
+import numpy as np
+
+from characters.roles import HUMAN, ZOMBIE
+from simulation.config import DEFAULT_CONFIG
+
+# The (dx, dy) of a single pace in each compass direction: N, NE, E, SE, S, SW, W, NW
+DIRECTION_OFFSETS = np.array([(0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1)], dtype=np.int64)
+
+
+class VectorizedEngine:
+    """
+    Runs a Zombie Invasion on a struct of arrays rather than on character objects.
+
+    Every character has an entry at the same index of the x, y, role and target arrays.  Characters are never
+    removed, a converted human keeps its index and only its role changes.
+
+    A turn happens in this order:
+    1. Every human walks human_paces paces in a random direction.  A pace that would leave the grid is forfeit, along
+       with every pace after it.
+    2. Humans that walked into a square holding a zombie are turned into zombies.
+    3. Every zombie picks the nearest human (in paces) to hunt, keeping the human it hunted last turn if that human is
+       amongst the nearest, and walks zombie_paces paces towards it.  A zombie may not walk into a square holding
+       another zombie or leave the grid, and if several zombies walk into the same empty square only the first of
+       them gets there.
+    4. Humans in a square that a zombie walked into are turned into zombies.
+
+    Zombies that were humans at the start of the turn don't move until the next turn.
+    """
+    def __init__(self, width=None, height=None, human_count=None, zombie_count=None, seed=None,
+                 human_paces=None, zombie_paces=None, config=None):
+        """
+        Initialise the engine with an empty board.
+
+        Each setting that isn't given is taken from the config.
+
+        Args:
+            width: The number of columns in the grid.
+            height: The number of rows in the grid.
+            human_count: The number of humans to place on the board.
+            zombie_count: The number of zombies to place on the board.
+            seed: An optional seed for the random number generator so that a run can be repeated.
+            human_paces: The number of paces a human walks each turn.
+            zombie_paces: The number of paces a zombie walks each turn.
+            config: The SimulationConfig of the invasion, defaults to DEFAULT_CONFIG.
+        """
+        self.config = (DEFAULT_CONFIG if config is None else config).replace(
+            width=width, height=height, human_count=human_count, zombie_count=zombie_count,
+            human_paces=human_paces, zombie_paces=zombie_paces,
+        )
+        self.width = self.config.width
+        self.height = self.config.height
+        self.human_count = self.config.human_count
+        self.zombie_count = self.config.zombie_count
+        self.human_paces = self.config.human_paces
+        self.zombie_paces = self.config.zombie_paces
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.turn_count = 0
+
+        self.x = np.empty(0, dtype=np.int64)
+        self.y = np.empty(0, dtype=np.int64)
+        self.role = np.empty(0, dtype=np.int8)
+        # The index of the human each zombie is hunting, or -1
+        self.target = np.empty(0, dtype=np.int64)
+
+    @classmethod
+    def from_board(cls, board, seed=None):
+        """
+        Create an engine holding the same characters as an object based board.
+
+        Args:
+            board: The Board to copy.
+            seed: An optional seed for the random number generator of the new engine.
+
+        Returns:
+            VectorizedEngine: The engine, ready to carry on the invasion from where the board is.
+        """
+        engine = cls(human_count=0, zombie_count=0, seed=seed, config=board.config)
+        characters = board.character_list
+        index_of = {character: index for index, character in enumerate(characters)}
+        locations = [board.find_character_location(character) for character in characters]
+        engine.add_characters(
+            [location[0] for location in locations],
+            [location[1] for location in locations],
+            [character.role for character in characters],
+        )
+        for index, character in enumerate(characters):
+            target = getattr(character, "target", None)
+            if target in index_of:
+                engine.target[index] = index_of[target]
+        return engine
+
+    def add_characters(self, x, y, role):
+        """
+        Place characters on the board.
+
+        Args:
+            x: The x coordinates of the new characters.
+            y: The y coordinates of the new characters.
+            role: The role (HUMAN or ZOMBIE) of each new character.
+        """
+        x = np.asarray(x, dtype=np.int64)
+        y = np.asarray(y, dtype=np.int64)
+        if ((x < 0) | (x >= self.width) | (y < 0) | (y >= self.height)).any():
+            from exceptions import InvalidCoordinateException
+
+            raise InvalidCoordinateException
+        self.x = np.concatenate([self.x, x])
+        self.y = np.concatenate([self.y, y])
+        self.role = np.concatenate([self.role, np.asarray(role, dtype=np.int8)])
+        self.target = np.concatenate([self.target, np.full(len(x), -1, dtype=np.int64)])
+
+    def populate(self):
+        """
+        Places the initial humans and zombies on the board.
+
+        Zombies will not be placed in a square that is already occupied by a Human or Zombie.
+        """
+        self.add_characters(
+            self.rng.integers(0, self.width, self.human_count),
+            self.rng.integers(0, self.height, self.human_count),
+            np.full(self.human_count, HUMAN),
+        )
+
+        occupied = np.zeros(self.width * self.height, dtype=bool)
+        occupied[self.x * self.height + self.y] = True
+        free_cells = np.flatnonzero(~occupied)
+        if self.zombie_count > len(free_cells):
+            from exceptions import InvalidCoordinateException
+
+            raise InvalidCoordinateException("There are not enough empty squares for the zombies")
+        cells = self.rng.choice(free_cells, self.zombie_count, replace=False)
+        self.add_characters(cells // self.height, cells % self.height, np.full(self.zombie_count, ZOMBIE))
+
+    def count_humans(self):
+        """
+        Count the number of humans on the board.
+
+        Returns:
+            int: The number of humans currently on the board
+        """
+        return int(np.count_nonzero(self.role == HUMAN))
+
+    def count_zombies(self):
+        """
+        Count the number of zombies on the board.
+
+        Returns:
+            int: The number of zombies currently on the board
+        """
+        return int(np.count_nonzero(self.role == ZOMBIE))
+
+    def is_over(self):
+        """
+        Check whether the invasion has finished.
+
+        Returns:
+            bool: True once there are no humans left on the board.
+        """
+        return self.count_humans() == 0
+
+    def mean_hunt_distance(self):
+        """
+        The mean number of paces between each hunting zombie and the human it is hunting.
+
+        Returns:
+            float: The mean distance, or NaN when no zombie is hunting a human.
+        """
+        hunters = np.flatnonzero((self.role == ZOMBIE) & (self.target >= 0))
+        targets = self.target[hunters]
+        still_human = self.role[targets] == HUMAN
+        hunters, targets = hunters[still_human], targets[still_human]
+        if len(hunters) == 0:
+            return float("nan")
+        distance = np.maximum(np.abs(self.x[targets] - self.x[hunters]), np.abs(self.y[targets] - self.y[hunters]))
+        return float(distance.mean())
+
+    def _occupied_by_zombies(self):
+        """A flat boolean grid that is True for every square holding a zombie."""
+        occupied = np.zeros(self.width * self.height, dtype=bool)
+        zombies = self.role == ZOMBIE
+        occupied[self.x[zombies] * self.height + self.y[zombies]] = True
+        return occupied
+
+    def _convert_humans_sharing_with_zombies(self):
+        """Turn every human that is in the same square as a zombie into a zombie."""
+        occupied = self._occupied_by_zombies()
+        humans = np.flatnonzero(self.role == HUMAN)
+        caught = humans[occupied[self.x[humans] * self.height + self.y[humans]]]
+        self.role[caught] = ZOMBIE
+        self.target[caught] = -1
+
+    def _move_humans(self):
+        """
+        Every human walks human_paces paces in a random direction, stopping at the edge of the grid.
+
+        A pace that would leave the grid is forfeit along with every pace after it, so a human walks as many paces as
+        fit between it and the edge it is heading for.
+        """
+        humans = np.flatnonzero(self.role == HUMAN)
+        directions = DIRECTION_OFFSETS[self.rng.integers(0, len(DIRECTION_OFFSETS), len(humans))]
+        x, y = self.x[humans], self.y[humans]
+        paces = paces_to_edge(x, y, directions, self.human_paces, self.width, self.height)
+        self.x[humans] = x + directions[:, 0] * paces
+        self.y[humans] = y + directions[:, 1] * paces
+
+    def _human_grid(self):
+        """
+        A grid holding the index of a human in every square that has one, and -1 elsewhere.
+
+        Where humans share a square the one recorded is chosen at random.
+        """
+        humans = self.rng.permutation(np.flatnonzero(self.role == HUMAN))
+        grid = np.full((self.width, self.height), -1, dtype=np.int64)
+        grid[self.x[humans], self.y[humans]] = humans
+        return grid
+
+    def _nearest_humans(self, zombies):
+        """
+        Find the nearest human to each zombie.
+
+        While only a few zombies are still looking, each of them checks the ring of squares that is one pace further
+        away every round.  Once checking the rings would cost more than visiting the whole grid the remaining zombies
+        share a distance field grown outwards from every human instead.
+
+        Args:
+            zombies: The indexes of the zombies.
+
+        Returns:
+            tuple: The number of paces to the nearest human for each zombie and the index of one of the nearest
+                   humans, chosen at random where there is more than one.
+        """
+        human_grid = self._human_grid()
+        distance = np.full(len(zombies), -1, dtype=np.int64)
+        nearest = np.full(len(zombies), -1, dtype=np.int64)
+        searching = np.arange(len(zombies))
+        paces = 0
+
+        while len(searching) and paces < max(self.width, self.height):
+            ring_x, ring_y = _ring_offsets(paces)
+            if len(searching) * len(ring_x) > self.width * self.height:
+                found_distance, found = self._nearest_humans_by_field(zombies[searching], human_grid)
+                distance[searching] = found_distance
+                nearest[searching] = found
+                break
+
+            square_x = self.x[zombies[searching], None] + ring_x
+            square_y = self.y[zombies[searching], None] + ring_y
+            on_grid = (square_x >= 0) & (square_x < self.width) & (square_y >= 0) & (square_y < self.height)
+            humans = np.where(
+                on_grid, human_grid[np.clip(square_x, 0, self.width - 1), np.clip(square_y, 0, self.height - 1)], -1
+            )
+
+            # Pick one of the humans found in the ring at random
+            choice = np.argmax(np.where(humans >= 0, self.rng.random(humans.shape), -1), axis=1)
+            found = humans[np.arange(len(searching)), choice]
+            done = found >= 0
+            distance[searching[done]] = paces
+            nearest[searching[done]] = found[done]
+            searching = searching[~done]
+            paces += 1
+
+        return distance, nearest
+
+    def _nearest_humans_by_field(self, zombies, human_grid):
+        """
+        Find the nearest human to each zombie with a distance field.
+
+        The distance field is built by growing outwards from every human one pace at a time, the whole grid at once,
+        until every zombie's square has been reached.
+
+        Args:
+            zombies: The indexes of the zombies.
+            human_grid: The grid of humans from _human_grid.
+
+        Returns:
+            tuple: The number of paces to the nearest human for each zombie and the index of one of the nearest
+                   humans.
+        """
+        label = human_grid.copy()
+        distance = np.where(label >= 0, 0, -1)
+        frontier = label >= 0
+        zombie_x, zombie_y = self.x[zombies], self.y[zombies]
+        paces = 0
+
+        while (distance[zombie_x, zombie_y] < 0).any() and frontier.any():
+            paces += 1
+            # A pace can be taken in any of the eight directions, so the squares one pace from the frontier are found
+            # by spreading it one square along the x axis and then one square along the y axis.  Squares reached from
+            # more than one human are labelled with one of them at random
+            spread = np.where(frontier, label, -1)
+            for axis in (0, 1):
+                grown = spread.copy()
+                for shift in self.rng.permutation([-1, 1]):
+                    size = spread.shape[axis]
+                    source = [slice(None), slice(None)]
+                    destination = [slice(None), slice(None)]
+                    source[axis] = slice(max(-shift, 0), size - max(shift, 0))
+                    destination[axis] = slice(max(shift, 0), size - max(-shift, 0))
+                    source, destination = tuple(source), tuple(destination)
+                    grown[destination] = np.where(grown[destination] < 0, spread[source], grown[destination])
+                spread = grown
+            frontier = (spread >= 0) & (distance < 0)
+            distance[frontier] = paces
+            label[frontier] = spread[frontier]
+
+        return distance[zombie_x, zombie_y], label[zombie_x, zombie_y]
+
+    def _move_zombies(self, zombies):
+        """
+        Zombies walk zombie_paces paces towards the human they are hunting.
+
+        Args:
+            zombies: The indexes of the zombies that are walking.
+        """
+        if len(zombies) == 0:
+            return
+
+        if self.count_humans():
+            distance, nearest = self._nearest_humans(zombies)
+
+            # Keep hunting the same human for as long as it is a human and is amongst the nearest
+            target = self.target[zombies]
+            still_hunted = target >= 0
+            still_hunted[still_hunted] = self.role[target[still_hunted]] == HUMAN
+            target_distance = np.maximum(
+                np.abs(self.x[np.maximum(target, 0)] - self.x[zombies]),
+                np.abs(self.y[np.maximum(target, 0)] - self.y[zombies]),
+            )
+            target = np.where(still_hunted & (target_distance <= distance), target, nearest)
+            self.target[zombies] = target
+
+            steps = np.stack([
+                np.sign(self.x[target] - self.x[zombies]),
+                np.sign(self.y[target] - self.y[zombies]),
+            ], axis=1)
+        else:
+            steps = DIRECTION_OFFSETS[self.rng.integers(0, len(DIRECTION_OFFSETS), len(zombies))]
+
+        # Like humans, zombies stop at the edge of the grid rather than giving up the whole walk
+        paces = paces_to_edge(self.x[zombies], self.y[zombies], steps, self.zombie_paces, self.width, self.height)
+        new_x = self.x[zombies] + steps[:, 0] * paces
+        new_y = self.y[zombies] + steps[:, 1] * paces
+        moving = ((steps[:, 0] != 0) | (steps[:, 1] != 0)) & (paces > 0)
+
+        # Zombies may not share a square, so a zombie can't walk into a square that already holds one and only the
+        # first of several zombies walking into the same empty square gets there
+        new_cell = np.where(moving, new_x * self.height + new_y, -1)
+        moving[moving] = ~self._occupied_by_zombies()[new_cell[moving]]
+        movers = np.flatnonzero(moving)
+        _, first = np.unique(new_cell[movers], return_index=True)
+        movers = movers[first]
+
+        self.x[zombies[movers]] = new_x[movers]
+        self.y[zombies[movers]] = new_y[movers]
+
+    def commence_turn(self):
+        """Runs a single turn of the simulation."""
+        # Humans caught this turn don't move as zombies until the next one
+        zombies = np.flatnonzero(self.role == ZOMBIE)
+
+        self._move_humans()
+        self._convert_humans_sharing_with_zombies()
+        self._move_zombies(zombies)
+        self._convert_humans_sharing_with_zombies()
+        self.turn_count += 1
+
+    def run(self, max_turns=None):
+        """
+        Run turns until no humans are left.
+
+        Args:
+            max_turns: An optional limit on the number of turns to run.
+
+        Returns:
+            int: The number of turns that have been run.
+        """
+        while not self.is_over():
+            if max_turns is not None and self.turn_count >= max_turns:
+                break
+            self.commence_turn()
+
+        return self.turn_count
+
+    def stats(self):
+        """
+        The current population statistics of the simulation.
+
+        Returns:
+            dict: The turn count and the number of humans and zombies on the board.
+        """
+        return {
+            "turns": self.turn_count,
+            "humans": self.count_humans(),
+            "zombies": self.count_zombies(),
+        }
+
+
+def paces_to_edge(x, y, directions, paces, width, height):
+    """
+    The number of paces each character can walk in a direction before the next pace would leave the grid.
+
+    A pace that would leave the grid is forfeit along with every pace after it, just as on the object based board.
+
+    Args:
+        x: The x coordinate of each character.
+        y: The y coordinate of each character.
+        directions: The (dx, dy) of a single pace for each character.
+        paces: The number of paces the characters want to walk.
+        width: The number of columns in the grid.
+        height: The number of rows in the grid.
+
+    Returns:
+        numpy.ndarray: The number of paces each character can walk, no more than paces.
+    """
+    # The paces left before the edge in the direction of travel along each axis
+    room_x = np.where(directions[:, 0] > 0, width - 1 - x, np.where(directions[:, 0] < 0, x, paces))
+    room_y = np.where(directions[:, 1] > 0, height - 1 - y, np.where(directions[:, 1] < 0, y, paces))
+    return np.minimum(np.minimum(room_x, room_y), paces)
+
+
+def _ring_offsets(paces):
+    """
+    The offsets of the squares that are exactly a number of paces away from a square.
+
+    Args:
+        paces: The number of paces.
+
+    Returns:
+        tuple: Arrays of the x and y offsets.
+    """
+    if paces == 0:
+        return np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64)
+    side = np.arange(-paces, paces + 1, dtype=np.int64)
+    inner = side[1:-1]
+    ring_x = np.concatenate([side, side, np.full(len(inner), -paces), np.full(len(inner), paces)])
+    ring_y = np.concatenate([np.full(len(side), -paces), np.full(len(side), paces), inner, inner])
+    return ring_x, ring_y
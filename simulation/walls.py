@@ -0,0 +1,151 @@
+"""Walls that block movement and line of sight."""
+from functools import lru_cache
+
+
+def bresenham(start, end):
+    """
+    The cells on the straight line between two cells.
+
+    Args:
+        start: The (x, y) coordinates of the first cell.
+        end: The (x, y) coordinates of the last cell.
+
+    Yields:
+        tuple: The (x, y) coordinates of every cell on the line, from start to end inclusive.
+    """
+    x, y = start
+    end_x, end_y = end
+    dx = abs(end_x - x)
+    dy = -abs(end_y - y)
+    step_x = 1 if x < end_x else -1
+    step_y = 1 if y < end_y else -1
+    error = dx + dy
+
+    while True:
+        yield (x, y)
+        if x == end_x and y == end_y:
+            return
+        doubled = 2 * error
+        if doubled >= dy:
+            error += dy
+            x += step_x
+        if doubled <= dx:
+            error += dx
+            y += step_y
+
+
+class WallMap:
+    """
+    The cells of a board that hold a wall.
+
+    Every cell is a single bit of a bytearray, in the same x * height + y order as the character grid, so even a very
+    large board's walls take a few kilobytes and checking a cell is one index and a mask.
+
+    Line of sight is traced with Bresenham's line algorithm.  Shooters check the same pairs of cells over and over, so
+    the answers are kept in a bounded least recently used cache that is emptied whenever a wall is added or removed.
+    """
+    def __init__(self, width, height, cache_size=65536):
+        """
+        Initialise a map with no walls.
+
+        Args:
+            width: The number of columns on the board.
+            height: The number of rows on the board.
+            cache_size: The most pairs of cells to remember line of sight between.
+        """
+        self.width = width
+        self.height = height
+        self.bits = bytearray((width * height + 7) // 8)
+        self.count = 0
+        self._line_of_sight = lru_cache(maxsize=cache_size)(self._trace)
+
+    def __len__(self):
+        """The number of walls."""
+        return self.count
+
+    def __iter__(self):
+        """The (x, y) coordinates of every wall, column by column."""
+        for index, byte in enumerate(self.bits):
+            if byte:
+                for bit in range(8):
+                    if byte & (1 << bit):
+                        yield divmod(index * 8 + bit, self.height)
+
+    def is_wall(self, x, y):
+        """
+        Check whether a cell holds a wall.
+
+        Args:
+            x: The column of the cell, it must be on the board.
+            y: The row of the cell, it must be on the board.
+
+        Returns:
+            bool: True if the cell holds a wall.
+        """
+        index = x * self.height + y
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+    def add(self, x, y):
+        """Put a wall in a cell."""
+        if not self.is_wall(x, y):
+            index = x * self.height + y
+            self.bits[index >> 3] |= 1 << (index & 7)
+            self.count += 1
+            self._line_of_sight.cache_clear()
+
+    def remove(self, x, y):
+        """Take the wall out of a cell."""
+        if self.is_wall(x, y):
+            index = x * self.height + y
+            self.bits[index >> 3] &= ~(1 << (index & 7))
+            self.count -= 1
+            self._line_of_sight.cache_clear()
+
+    def load(self, bits):
+        """
+        Replace every wall with those in the bits of another map of the same size.
+
+        Args:
+            bits: The bits attribute of the other map.
+        """
+        self.bits = bytearray(bits)
+        self.count = sum(bin(byte).count("1") for byte in self.bits)
+        self._line_of_sight.cache_clear()
+
+    def line_of_sight(self, start, end):
+        """
+        Check whether one cell can be seen from another.
+
+        The cells themselves may hold walls, only the cells between them can block the view.  The line is always traced
+        from the lower of the two cells, so the answer is the same whichever way round they are asked.
+
+        Args:
+            start: The (x, y) coordinates of one cell.
+            end: The (x, y) coordinates of the other.
+
+        Returns:
+            bool: True if no wall lies on the line between the cells.
+        """
+        start = (start[0], start[1])
+        end = (end[0], end[1])
+        if end < start:
+            start, end = end, start
+        return self._line_of_sight(start, end)
+
+    def cache_info(self):
+        """
+        How well the line of sight cache is working.
+
+        Returns:
+            The hits, misses, maximum size and current size of the cache, as returned by functools.lru_cache.
+        """
+        return self._line_of_sight.cache_info()
+
+    def _trace(self, start, end):
+        """Walk the line between two cells looking for a wall."""
+        if not self.count:
+            return True
+        for x, y in bresenham(start, end):
+            if (x, y) != start and (x, y) != end and self.is_wall(x, y):
+                return False
+        return True
@@ -0,0 +1,210 @@
+"""Running an invasion on a background thread, publishing a snapshot of the board after every batch of turns."""
+import queue
+import threading
+import time
+from types import MappingProxyType
+
+from simulation.replay import board_state
+
+
+class Frame:
+    """
+    A snapshot of an invasion, taken between turns on the worker thread.
+
+    A frame can't be changed once it is made, so the thread drawing it can hold on to it for as long as it likes while
+    the worker carries on running turns.
+    """
+    __slots__ = ("turn", "state", "walls", "humans", "zombies", "conversions", "over", "description")
+
+    def __init__(self, turn, state, walls, humans, zombies, conversions, over, description):
+        """
+        Initialise a frame.
+
+        Args:
+            turn: The number of turns that had been run.
+            state: The (role, x, y) of every character by the character's id, as from board_state.
+            walls: The (x, y) coordinates of every cell holding a wall.
+            humans: The number of humans on the board.
+            zombies: The number of zombies on the board.
+            conversions: The number of humans turned into zombies during the last turn, or None before the first.
+            over: Whether the invasion has finished.
+            description: The scheduler's description of the pace of the invasion.
+        """
+        values = {
+            "turn": turn,
+            "state": MappingProxyType(state),
+            "walls": frozenset(walls),
+            "humans": humans,
+            "zombies": zombies,
+            "conversions": conversions,
+            "over": over,
+            "description": description,
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def capture(cls, scheduler, walls=None):
+        """
+        Take a snapshot of the invasion a scheduler is running.
+
+        Args:
+            scheduler: The TurnScheduler running the invasion.
+            walls: The wall cells of the board, if they are already known, as they don't change during an invasion.
+
+        Returns:
+            Frame: The snapshot.
+        """
+        engine = scheduler.engine
+        board = engine.board
+        turn_stats = engine.turn_stats
+        return cls(
+            turn=engine.turn_count,
+            state=board_state(board),
+            walls=board.walls if walls is None else walls,
+            humans=board.count_humans(),
+            zombies=board.count_zombies(),
+            conversions=turn_stats.conversions if turn_stats is not None else None,
+            over=engine.is_over(),
+            description=scheduler.describe(),
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError("A Frame can't be changed")
+
+    def __delattr__(self, name):
+        raise AttributeError("A Frame can't be changed")
+
+
+class SimulationWorker:
+    """
+    Runs the turns of a TurnScheduler on a thread of its own.
+
+    The thread that owns the window never touches the engine.  It sends commands with submit, which the worker runs
+    between turns, and draws whatever frame was published last, so a slow turn on a large board doesn't hold up
+    input or drawing.  A new frame is only published after a command or a turn has changed something.
+
+    Turns run in Python hold the GIL, but it is handed over to the window's thread every few milliseconds whatever
+    the turn is doing, so the window stays responsive however long a turn takes.
+
+    While the worker is running, the scheduler, its engine and the engine's board must only be used from commands.
+    """
+    def __init__(self, scheduler, tick=1 / 30, on_update=None, timer=time.perf_counter):
+        """
+        Initialise the worker, taking the first frame.  The thread isn't started until start is called.
+
+        Args:
+            scheduler: The TurnScheduler running the invasion.
+            tick: The number of seconds between each time the worker asks the scheduler for the turns that are due.
+            on_update: An optional function called with the scheduler on the worker thread after every update, such
+                       as to notice that the invasion is over.
+            timer: The function used to measure the time between updates.
+        """
+        self.scheduler = scheduler
+        self.tick = tick
+        self.on_update = on_update
+        self.timer = timer
+        self._commands = queue.SimpleQueue()
+        self._stopping = threading.Event()
+        self._thread = None
+        self._error = None
+        self._walls = None
+        self._walls_of = None
+        self._frame = self._capture()
+
+    def _capture(self):
+        """Take a frame of the scheduler's invasion, only working out the walls again for a new engine."""
+        if self._walls_of is not self.scheduler.engine:
+            self._walls_of = self.scheduler.engine
+            self._walls = frozenset(self.scheduler.engine.board.walls)
+        return Frame.capture(self.scheduler, self._walls)
+
+    def start(self):
+        """Start running turns on the worker thread."""
+        self._thread = threading.Thread(target=self._run, name="simulation-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stop the worker, waiting for the turn it is running to finish.
+
+        Args:
+            timeout: The most seconds to wait for the worker thread to finish.
+
+        Raises:
+            Exception: Any exception a turn or command raised on the worker thread.
+        """
+        self._stopping.set()
+        self._commands.put(None)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.check()
+
+    def check(self):
+        """
+        Raise any exception a turn or command raised on the worker thread, which stops the worker.
+
+        Raises:
+            Exception: The exception.
+        """
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def submit(self, command):
+        """
+        Run a command on the worker thread before the next turn.
+
+        Args:
+            command: A function that is called with the scheduler, such as TurnScheduler.toggle_pause.
+        """
+        self._commands.put(command)
+
+    def latest(self):
+        """
+        The frame that was published last, this never waits for the worker.
+
+        Returns:
+            Frame: The frame.
+        """
+        return self._frame
+
+    def _run(self):
+        """Run commands and turns until the worker is stopped."""
+        last = self.timer()
+        try:
+            while not self._stopping.is_set():
+                changed = self._run_commands(timeout=self.tick)
+                if self._stopping.is_set():
+                    break
+                now = self.timer()
+                changed = self.scheduler.update(now - last) > 0 or changed
+                last = now
+                if self.on_update is not None:
+                    self.on_update(self.scheduler)
+                # A command or on_update may have changed the pace without changing the board
+                if changed or self.scheduler.describe() != self._frame.description:
+                    self._frame = self._capture()
+        except Exception as error:
+            self._error = error
+
+    def _run_commands(self, timeout):
+        """
+        Run the commands that have been submitted, waiting up to a timeout for the first if there are none.
+
+        Returns:
+            bool: True if any commands were run.
+        """
+        try:
+            command = self._commands.get(timeout=timeout)
+        except queue.Empty:
+            return False
+        while True:
+            if command is None:
+                return True
+            command(self.scheduler)
+            try:
+                command = self._commands.get_nowait()
+            except queue.Empty:
+                return True
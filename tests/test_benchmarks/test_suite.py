@@ -0,0 +1,60 @@
+"""Tests for the benchmark suite."""
+import pytest
+
+from benchmarks.suite import Scenario, PhaseClock, run_scenario, run_suite, compare
+
+
+def test_run_scenario():
+    """A scenario reports its throughput and breaks the cost of a turn down into phases."""
+    result = run_scenario(Scenario("tiny", 10, 10, 5, 3, phase_turns=2), seed=3)
+
+    assert result["scenario"] == "tiny"
+    assert result["extinct"]
+    assert result["turns_to_extinction"] == result["turns"]
+    assert result["turns_per_second"] > 0
+    phases = {"human_moves", "zombie_moves", "apply_moves", "conversions", "other"}
+    assert set(result["phase_seconds_per_turn"]) <= phases
+    assert "human_moves" in result["phase_seconds_per_turn"]
+
+
+def test_phases_are_restored():
+    """Timing the phases of a turn leaves the timed methods as they were."""
+    from characters.human import Human
+
+    commence_turn = Human.__dict__["commence_turn"]
+    run_scenario(Scenario("tiny", 10, 10, 5, 1, turns=2, phase_turns=2), seed=3)
+
+    assert Human.__dict__["commence_turn"] is commence_turn
+
+
+def test_run_suite_in_process():
+    """The suite records the details of the machine alongside the results."""
+    results = run_suite(["default"], isolate=False)
+
+    assert results["version"] == 1
+    assert [result["scenario"] for result in results["scenarios"]] == ["default"]
+
+
+def test_phase_clock_nesting():
+    """Time spent in a nested phase is only charged to the nested phase."""
+    clock = PhaseClock()
+    clock.enter("outer")
+    clock.enter("inner")
+    clock.exit()
+    clock.exit()
+
+    assert set(clock.totals) == {"outer", "inner"}
+
+
+@pytest.mark.parametrize("now, verdict", [(100, "same"), (105, "same"), (150, "faster"), (50, "slower")])
+def test_compare(now, verdict):
+    """Scenarios are compared by their turns per second, within a tolerance."""
+    baseline = {"scenarios": [{"scenario": "default", "engine": "object", "turns_per_second": 100}]}
+    results = {"scenarios": [{"scenario": "default", "engine": "object", "turns_per_second": now},
+                             {"scenario": "small", "engine": "object", "turns_per_second": now}]}
+
+    comparisons = compare(results, baseline, tolerance=0.1)
+
+    assert len(comparisons) == 1
+    assert comparisons[0]["verdict"] == verdict
+    assert comparisons[0]["ratio"] == pytest.approx(now / 100)
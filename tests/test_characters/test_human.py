@@ -17,34 +17,6 @@ def test_human_location():
     assert Human(location=(2,3)).location == (2,3)
 
 
-@pytest.mark.parametrize(
-    ("expected"),
-    [
-        ("assets/character-human1.png"),
-        ("assets/character-human2.png"),
-    ]
-)
-def test_image_assets(expected):
-    """Tests function that returns on the potential 'human' image assets available."""
-    assets = Human.image_assets()
-
-    assert expected in assets
-
-
-@pytest.mark.parametrize(
-    ("not_expected"),
-    [
-        ("assets/character-base.jpg"),
-        ("assets/character-zombie.png"),
-    ]
-)
-def test_image_assets_missing(not_expected):
-    """Tests function does not return assets for other character types."""
-    assets = Human.image_assets()
-
-    assert not_expected not in assets
-
-
 def test_human_will_share_space():
     """Test that humans can share space with other humans and zombies."""
     human1 = Human(location=(0, 0))
@@ -63,14 +35,14 @@ def test_human_will_share_space():
 @pytest.mark.parametrize(
     ("direction","expected_destination"),
     [
-        ["N", [10,7]],
-        ["NE", [13,7]],
-        ["E", [13,10]],
-        ["SE", [13,13]],
-        ["S", [10,13]],
-        ["SW", [7,13]],
-        ["W", [7,10]],
-        ["NW", [7,7]],
+        ["N", (10, 7)],
+        ["NE", (13, 7)],
+        ["E", (13, 10)],
+        ["SE", (13, 13)],
+        ["S", (10, 13)],
+        ["SW", (7, 13)],
+        ["W", (7, 10)],
+        ["NW", (7, 7)],
     ]
 )
 def test_human_movement(direction, expected_destination):
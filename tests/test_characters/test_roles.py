@@ -0,0 +1,19 @@
+"""Tests for the character roles."""
+from characters.human import Human
+from characters.roles import HUMAN, ZOMBIE, SHARES_SPACE, BLOCKED_BY
+from characters.zombie import Zombie
+
+
+def test_characters_have_roles():
+    """Every character class plays a role."""
+    assert Human(location=[0, 0]).role == HUMAN
+    assert Zombie(location=[0, 0]).role == ZOMBIE
+
+
+def test_blocked_by():
+    """A role is blocked by every role that it, or that, won't share a square with."""
+    assert BLOCKED_BY[HUMAN] == ()
+    assert BLOCKED_BY[ZOMBIE] == (ZOMBIE,)
+    for role, blocked_by in enumerate(BLOCKED_BY):
+        for other in range(len(SHARES_SPACE)):
+            assert (other in blocked_by) == (not (SHARES_SPACE[role][other] and SHARES_SPACE[other][role]))
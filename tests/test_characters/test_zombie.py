@@ -5,6 +5,8 @@ import pytest
 
 from characters.zombie import Zombie
 from characters.human import Human
+from characters.roles import ZOMBIE
+from ui.board import GameBoard
 
 
 def test_zombie_instantiation():
@@ -17,33 +19,6 @@ def test_zombie_location():
     assert Zombie(location=(2,3)).location == (2,3)
 
 
-@pytest.mark.parametrize(
-    ("expected"),
-    [
-        ("assets/character-zombie.png"),
-    ]
-)
-def test_image_assets(expected):
-    """Tests function that returns on the potential 'zombie' image assets available."""
-    assets = Zombie.image_assets()
-
-    assert expected in assets
-
-
-@pytest.mark.parametrize(
-    ("not_expected"),
-    [
-        ("assets/character-base.jpg"),
-        ("assets/character-human1.png"),
-    ]
-)
-def test_image_assets_missing(not_expected):
-    """Tests function does not return assets for other character types."""
-    assets = Zombie.image_assets()
-
-    assert not_expected not in assets
-
-
 def test_zombie_will_share_space():
     """Test that zombies will not share space with any other characters."""
     zombie = Zombie()
@@ -72,45 +47,101 @@ def test_zombie_will_not_share_space_with_zombie():
 def test_find_nearest_human():
     """Test finding the nearest human on the board."""
     zombie = Zombie(location=[10, 10])
-    board = MagicMock()
+    board = GameBoard()
+    board.add_character(zombie)
     
     # Create some humans at different distances
-    human1 = Human(location=[12, 10])  # 2 units away
-    human2 = Human(location=[10, 15])  # 5 units away
-    human3 = Human(location=[8, 8])    # ~2.8 units away
+    human1 = Human(location=[12, 10])  # 2 paces away
+    human2 = Human(location=[10, 15])  # 5 paces away
+    human3 = Human(location=[7, 7])    # 3 paces away
     
-    board.character_list = [human1, human2, human3]
+    for human in [human1, human2, human3]:
+        board.add_character(human)
     
     nearest = zombie._find_nearest_human(board)
-    assert nearest == [12, 10]  # human1 should be nearest
+    assert nearest == (12, 10)  # human1 should be nearest
+    assert zombie.target is human1
+
+
+def test_find_nearest_human_is_measured_in_paces():
+    """Diagonal paces count the same as any other pace when measuring the distance to a human."""
+    zombie = Zombie(location=[10, 10])
+    board = GameBoard()
+    board.add_character(zombie)
+
+    diagonal_human = Human(location=[13, 13])  # 3 paces away
+    straight_human = Human(location=[6, 10])   # 4 paces away
+    board.add_character(diagonal_human)
+    board.add_character(straight_human)
+
+    assert zombie._find_nearest_human(board) == (13, 13)
+
+
+def test_find_nearest_human_keeps_hunting_target():
+    """If the human hunted last turn is amongst the nearest humans the zombie continues to hunt it."""
+    zombie = Zombie(location=[10, 10])
+    board = GameBoard()
+    board.add_character(zombie)
+
+    human1 = Human(location=[12, 10])
+    human2 = Human(location=[8, 10])
+    board.add_character(human1)
+    board.add_character(human2)
+
+    for target in [human1, human2]:
+        zombie.target = target
+        for _ in range(5):
+            zombie._find_nearest_human(board)
+            assert zombie.target is target
+
+
+def test_find_nearest_human_no_humans():
+    """There is nothing to hunt on a board without humans."""
+    zombie = Zombie(location=[10, 10])
+    board = GameBoard()
+    board.add_character(zombie)
+
+    assert zombie._find_nearest_human(board) is None
+    assert zombie.target is None
 
 
 def test_movement_direction_towards_human():
     """Test that zombie moves towards nearest human."""
     zombie = Zombie(location=[10, 10])
-    board = MagicMock()
+    board = GameBoard()
+    board.add_character(zombie)
     
     # Place a human to the northeast
     human = Human(location=[12, 8])
-    board.character_list = [human]
+    board.add_character(human)
+    
+    # Zombie should move northeast, a diagonal pace closes the distance as quickly as any other
+    assert zombie.movement_direction(board) == "NE"
     
-    # Zombie should move east (horizontal distance is greater)
+    # Place a human directly to the east
+    human.location = [14, 10]
+    board.move_character(human)
+    
+    # Zombie should move east
     assert zombie.movement_direction(board) == "E"
     
     # Place a human to the northwest
     human.location = [8, 8]
+    board.move_character(human)
     
-    # Zombie should move west
-    assert zombie.movement_direction(board) == "W"
+    # Zombie should move northwest
+    assert zombie.movement_direction(board) == "NW"
     
     # Place a human directly above
     human.location = [10, 8]
+    board.move_character(human)
     
     # Zombie should move north
     assert zombie.movement_direction(board) == "N"
     
     # Place a human directly below
     human.location = [10, 12]
+    board.move_character(human)
     
     # Zombie should move south
     assert zombie.movement_direction(board) == "S"
@@ -119,34 +150,71 @@ def test_movement_direction_towards_human():
 def test_movement_direction_no_humans():
     """Test that zombie moves randomly when no humans exist."""
     zombie = Zombie(location=[10, 10])
-    board = MagicMock()
-    board.characters = []
+    board = GameBoard()
+    board.add_character(zombie)
     
     # Should return one of the valid directions
     direction = zombie.movement_direction(board)
     assert direction in ["N", "NE", "E", "SE", "S", "SW", "W", "NW"]
 
 
+@pytest.mark.parametrize("cells_per_zombie", [0, 1000])
 @pytest.mark.parametrize(
     ("human_location", "expected_direction", "expected_destination"),
     [
-        [[13, 10], "E", [11, 10]],  # Move east towards human
-        [[7, 10], "W", [9, 10]],    # Move west towards human
-        [[10, 7], "N", [10, 9]],    # Move north towards human
-        [[10, 13], "S", [10, 11]],  # Move south towards human
+        [[13, 10], "E", (11, 10)],  # Move east towards human
+        [[7, 10], "W", (9, 10)],    # Move west towards human
+        [[10, 7], "N", (10, 9)],    # Move north towards human
+        [[10, 13], "S", (10, 11)],  # Move south towards human
+        [[14, 13], "SE", (11, 11)], # Move south east towards human
+        [[5, 7], "NW", (9, 9)],     # Move north west towards human
     ]
 )
-def test_zombie_movement_towards_human(human_location, expected_direction, expected_destination):
-    """Check the zombie moves towards the human."""
+def test_zombie_movement_towards_human(human_location, expected_direction, expected_destination, cells_per_zombie):
+    """Check the zombie moves towards the human, whether or not the board shares a distance field."""
     zombie = Zombie(location=[10, 10])
-    board = MagicMock()
+    board = GameBoard()
+    board.distance_field_cells_per_zombie = cells_per_zombie
+    board.add_character(zombie)
     
     # Place a human at the specified location
     human = Human(location=human_location)
-    board.character_list = [human]
+    board.add_character(human)
     
     # Move the zombie
     zombie.move(board)
     
     # Check final position
-    assert zombie.location == expected_destination 
\ No newline at end of file
+    assert zombie.location == expected_destination 
+
+
+def test_convert():
+    """A human turned into a zombie is the same character, behaving as a zombie."""
+    human = Human(location=[3, 4])
+    human.id = 7
+
+    zombie = Zombie.convert(human)
+
+    assert zombie is human
+    assert isinstance(zombie, Zombie)
+    assert zombie.role == ZOMBIE
+    assert (zombie.id, zombie.location, zombie.target) == (7, (3, 4), None)
+
+
+@pytest.mark.parametrize("cells_per_zombie", [0, 1000])
+def test_zombie_stops_hunting_a_human_behind_a_wall(cells_per_zombie):
+    """A human near in a straight line but far on foot stops being hunted, whether or not there is a distance field."""
+    board = GameBoard(width=12, height=12)
+    board.distance_field_cells_per_zombie = cells_per_zombie
+    board.add_walls((6, 0), (6, 10))
+    zombie = Zombie(location=[5, 5])
+    behind_the_wall = Human(location=[7, 5])
+    reachable = Human(location=[2, 5])
+    for character in (zombie, behind_the_wall, reachable):
+        board.add_character(character)
+    assert (board.distance_field() is not None) == bool(cells_per_zombie)
+    zombie.target = behind_the_wall
+
+    zombie._find_nearest_human(board)
+
+    assert zombie.target is reachable
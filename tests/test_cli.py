@@ -0,0 +1,160 @@
+"""Tests for the command line entry point."""
+import pytest
+
+from cli import build_parser, main
+
+
+def test_run_headless(capsys):
+    """A headless run prints the turn count and population statistics."""
+    main(["run", "--headless", "--seed", "1", "--width", "10", "--height", "10", "--humans", "5"])
+
+    output = capsys.readouterr().out
+    assert "Turns:" in output
+    assert "Humans: 0" in output
+    assert "Zombies: 8" in output
+
+
+def test_run_headless_max_turns(capsys):
+    """A headless run can be stopped early."""
+    main(["run", "--headless", "--seed", "1", "--max-turns", "1"])
+
+    output = capsys.readouterr().out
+    assert "Stopped after 1 turns" in output
+    assert "Turns: 1" in output
+
+
+def test_run_headless_walls(capsys, tmp_path):
+    """Walls can be drawn on the grid of a headless run."""
+    from simulation.checkpoint import load_checkpoint
+
+    path = tmp_path / "run.checkpoint"
+    main(["run", "--headless", "--seed", "1", "--max-turns", "3", "--wall", "5,0:5,10", "--wall", "20,4",
+          "--checkpoint", str(path)])
+
+    walls = load_checkpoint(path).board.walls
+    assert sorted(walls) == [(5, y) for y in range(11)] + [(20, 4)]
+
+
+@pytest.mark.parametrize("wall", ["5", "1,2:3", "a,b:c,d", "1,2:3,4:5,6"])
+def test_invalid_wall(wall):
+    """A wall must be given as the two cells at its ends, or a single cell."""
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(["run", "--wall", wall])
+
+
+def test_run_headless_record(capsys, tmp_path):
+    """A headless run can record a replay of the invasion."""
+    from simulation.replay import Replay
+
+    path = tmp_path / "run.replay"
+    main(["run", "--headless", "--seed", "1", "--max-turns", "7", "--record", str(path)])
+
+    replay = Replay(path)
+    assert replay.last_turn == 7
+    assert replay.seed == 1
+    replay.close()
+
+
+def test_run_headless_checkpoint_and_resume(capsys, tmp_path):
+    """A headless run saved to a checkpoint finishes the same way when it is resumed."""
+    path = tmp_path / "run.checkpoint"
+    arguments = ["run", "--headless", "--seed", "2", "--width", "20", "--height", "20", "--humans", "100"]
+    main(arguments)
+    uninterrupted = capsys.readouterr().out
+
+    main(arguments + ["--max-turns", "5", "--checkpoint", str(path), "--checkpoint-every", "2"])
+    capsys.readouterr()
+    main(["run", "--headless", "--resume", str(path)])
+
+    assert capsys.readouterr().out == uninterrupted
+
+
+def test_command_required():
+    """The command line requires a sub command."""
+    with pytest.raises(SystemExit):
+        build_parser().parse_args([])
+
+
+def test_run_headless_numpy_engine(capsys):
+    """A headless run can use the NumPy engine."""
+    pytest.importorskip("numpy")
+
+    main(["run", "--headless", "--engine", "numpy", "--seed", "1", "--width", "10", "--height", "10"])
+
+    output = capsys.readouterr().out
+    assert "Humans: 0" in output
+
+
+def test_run_headless_striped_engine(capsys):
+    """A headless run can split the board between worker processes."""
+    pytest.importorskip("numpy")
+
+    main(["run", "--headless", "--engine", "striped", "--workers", "2", "--seed", "1", "--width", "10", "--height",
+          "10"])
+
+    output = capsys.readouterr().out
+    assert "Humans: 0" in output
+
+
+def test_run_headless_metrics(capsys, tmp_path):
+    """A headless run can stream the metrics of every turn to files."""
+    csv_path = tmp_path / "metrics.csv"
+    jsonl_path = tmp_path / "metrics.jsonl"
+
+    main(["run", "--headless", "--seed", "1", "--max-turns", "12", "--metrics", str(csv_path), "--metrics",
+          str(jsonl_path)])
+
+    assert len(csv_path.read_text().splitlines()) == 13
+    assert len(jsonl_path.read_text().splitlines()) == 12
+    assert "Turns: 12" in capsys.readouterr().out
+
+
+def test_run_headless_metrics_resume(capsys, tmp_path):
+    """A resumed run carries on the metrics files, so they still hold every turn."""
+    path = tmp_path / "run.checkpoint"
+    csv_path = tmp_path / "metrics.csv"
+    arguments = ["run", "--headless", "--seed", "2", "--width", "30", "--height", "30", "--humans", "300",
+                 "--metrics", str(csv_path)]
+
+    main(arguments + ["--max-turns", "8", "--checkpoint", str(path), "--checkpoint-every", "3"])
+    main(["run", "--headless", "--resume", str(path), "--max-turns", "14", "--metrics", str(csv_path)])
+
+    assert "Turns: 14" in capsys.readouterr().out
+    lines = csv_path.read_text().splitlines()
+    assert lines[0].startswith("turn,")
+    assert [int(line.split(",")[0]) for line in lines[1:]] == list(range(1, 15))
+
+
+def test_run_headless_instrumented(capsys):
+    """A headless run can be instrumented, its board has no drawing to time."""
+    main(["run", "--headless", "--seed", "1", "--width", "10", "--height", "10", "--max-turns", "3", "--instrument"])
+
+    assert "_apply_moves" in capsys.readouterr().out
+
+
+def test_sweep(capsys):
+    """A sweep prints a line for every configuration."""
+    main(["sweep", "--width", "10", "15", "--height", "10", "--humans", "10", "--replicates", "2",
+          "--processes", "1"])
+
+    output = capsys.readouterr().out.splitlines()
+    assert len(output) == 3
+    assert output[1].startswith("width=10 height=10 human_count=10 zombie_count=3")
+
+
+@pytest.mark.parametrize("engine", ["numpy", "striped"])
+@pytest.mark.parametrize("option", [
+    ["--resume", "run.checkpoint"],
+    ["--record", "run.replay"],
+    ["--checkpoint", "run.checkpoint"],
+    ["--wall", "5,0:5,10"],
+    ["--instrument"],
+    ["--profile-turns", "5"],
+])
+def test_array_engines_refuse_object_engine_options(capsys, engine, option):
+    """Options only the object engine supports are refused for the array engines rather than ignored."""
+    with pytest.raises(SystemExit) as exited:
+        main(["run", "--headless", "--engine", engine] + option)
+
+    assert exited.value.code == 2
+    assert f"{option[0]} can only be used with --engine object" in capsys.readouterr().err
@@ -0,0 +1,131 @@
+"""Tests for checkpoints and forking."""
+import pytest
+
+from characters.zombie import Zombie
+from simulation.checkpoint import save_checkpoint, load_checkpoint, fork
+from simulation.config import SimulationConfig
+from simulation.engine import SimulationEngine
+from simulation.replay import board_state
+from ui.board import GameBoard
+
+
+def new_engine(cells_per_zombie=20):
+    engine = SimulationEngine(GameBoard(width=40, height=40), human_count=300, zombie_count=6, seed=9)
+    engine.board.distance_field_cells_per_zombie = cells_per_zombie
+    engine.populate()
+    return engine
+
+
+@pytest.mark.parametrize("cells_per_zombie", [20, 1000])
+def test_resume_plays_out_the_same(tmp_path, cells_per_zombie):
+    """A run resumed from a checkpoint plays out exactly as the original run does."""
+    path = tmp_path / "run.checkpoint"
+    engine = new_engine(cells_per_zombie)
+    engine.run(max_turns=10)
+    save_checkpoint(engine, path)
+
+    resumed = load_checkpoint(path)
+    resumed.board.distance_field_cells_per_zombie = cells_per_zombie
+
+    assert resumed.turn_count == 10
+    assert board_state(resumed.board) == board_state(engine.board)
+
+    engine.run()
+    resumed.run()
+
+    assert resumed.turn_count == engine.turn_count
+    assert board_state(resumed.board) == board_state(engine.board)
+
+
+def test_hunt_targets_are_restored(tmp_path):
+    """Zombies carry on hunting the same humans after a resume."""
+    path = tmp_path / "run.checkpoint"
+    engine = new_engine()
+    engine.run(max_turns=5)
+    save_checkpoint(engine, path)
+
+    resumed = load_checkpoint(path)
+
+    def targets(board):
+        # A target that has since been turned into a zombie will be hunted afresh, so it isn't kept
+        return {
+            character.id: character.target.id if character.target in board.character_locations else None
+            for character in board.character_list if isinstance(character, Zombie)
+        }
+
+    assert targets(resumed.board) == targets(engine.board)
+    assert any(target is not None for target in targets(resumed.board).values())
+
+
+def test_new_characters_get_new_ids(tmp_path):
+    """Characters added after a resume don't reuse the ids of characters already on the board."""
+    path = tmp_path / "run.checkpoint"
+    engine = new_engine()
+    save_checkpoint(engine, path)
+
+    resumed = load_checkpoint(path)
+    zombie = Zombie(location=[0, 0])
+    resumed.board.add_character(zombie)
+
+    assert zombie.id == engine.board.next_id
+
+
+def test_walls_are_restored(tmp_path):
+    """The walls are saved with the characters, so a run with walls plays out the same when it is resumed."""
+    path = tmp_path / "run.checkpoint"
+    engine = SimulationEngine(GameBoard(width=40, height=40), human_count=300, zombie_count=6, seed=9)
+    engine.board.add_walls((10, 0), (10, 30))
+    engine.board.add_walls((30, 39), (20, 10))
+    engine.populate()
+    engine.run(max_turns=10)
+    save_checkpoint(engine, path)
+
+    resumed = load_checkpoint(path)
+
+    assert sorted(resumed.board.walls) == sorted(engine.board.walls)
+    engine.run()
+    resumed.run()
+    assert resumed.turn_count == engine.turn_count
+    assert board_state(resumed.board) == board_state(engine.board)
+
+
+def test_config_is_restored(tmp_path):
+    """A run with its own paces carries on with the same paces when it is resumed."""
+    path = tmp_path / "run.checkpoint"
+    config = SimulationConfig(width=30, height=20, human_count=100, zombie_count=4, human_paces=1, zombie_paces=2)
+    engine = SimulationEngine(seed=3, config=config)
+    engine.populate()
+    engine.run(max_turns=5)
+    save_checkpoint(engine, path)
+
+    resumed = load_checkpoint(path)
+
+    assert resumed.board.config == config
+    assert all(character.config == config for character in resumed.board.character_list)
+    engine.run()
+    resumed.run()
+    assert resumed.turn_count == engine.turn_count
+    assert board_state(resumed.board) == board_state(engine.board)
+
+
+def test_not_a_checkpoint(tmp_path):
+    """Loading a file that isn't a checkpoint is an error."""
+    path = tmp_path / "other.checkpoint"
+    path.write_bytes(b"\x00" * 64)
+
+    with pytest.raises(ValueError):
+        load_checkpoint(path)
+
+
+def test_fork():
+    """Forked continuations start from the current turn, and one that isn't reseeded matches the original run."""
+    engine = new_engine()
+    engine.run(max_turns=10)
+
+    results = fork(engine, [None, 1, 1], processes=2)
+
+    assert engine.turn_count == 10
+    engine.run()
+    assert results[0] == engine.stats()
+    assert results[1] == results[2]
+    assert all(result["turns"] > 10 for result in results)
@@ -0,0 +1,95 @@
+"""Tests for the Simulation Config."""
+import pickle
+
+import pytest
+
+from characters.human import Human
+from characters.zombie import Zombie
+from constants import GRID_WIDTH, GRID_HEIGHT, HUMAN_PACES
+from simulation.board import Board
+from simulation.config import DEFAULT_CONFIG, SimulationConfig
+from simulation.engine import SimulationEngine
+
+
+def test_defaults_come_from_constants():
+    """A config made without any settings has the values in constants."""
+    assert DEFAULT_CONFIG.width == GRID_WIDTH
+    assert DEFAULT_CONFIG.height == GRID_HEIGHT
+    assert DEFAULT_CONFIG.human_paces == HUMAN_PACES
+    assert DEFAULT_CONFIG == SimulationConfig()
+
+
+def test_derived_tables():
+    """The cell count and the steps of a turn's walk are worked out when the config is made."""
+    config = SimulationConfig(width=7, height=3, human_paces=2, zombie_paces=1)
+
+    assert config.cells == 21
+    assert config.human_steps["NE"] == (2, -2)
+    assert config.human_steps["W"] == (-2, 0)
+    assert config.zombie_steps["S"] == (0, 1)
+
+
+def test_config_cannot_be_changed():
+    """Settings can't be changed in place, replace makes a new config instead."""
+    config = SimulationConfig(width=10, height=10)
+
+    with pytest.raises(AttributeError):
+        config.width = 20
+    with pytest.raises(AttributeError):
+        config.depth = 1
+
+    wider = config.replace(width=20, height=None)
+    assert (wider.width, wider.height, wider.cells) == (20, 10, 200)
+    assert config.width == 10
+    assert config.replace(width=10) is config
+    with pytest.raises(TypeError):
+        config.replace(depth=1)
+
+
+def test_invalid_settings():
+    """A config must have some cells and can't have a negative population or number of paces."""
+    with pytest.raises(ValueError):
+        SimulationConfig(width=0)
+    with pytest.raises(ValueError):
+        SimulationConfig(zombie_paces=-1)
+
+
+def test_config_can_be_pickled():
+    """Configs can be sent to worker processes."""
+    config = SimulationConfig(width=12, height=9, human_paces=5)
+
+    copy = pickle.loads(pickle.dumps(config))
+
+    assert copy == config
+    assert hash(copy) == hash(config)
+    assert copy.human_steps == config.human_steps
+
+
+def test_characters_walk_by_their_boards_config():
+    """Characters on boards with different configs walk different distances in the same process."""
+    boards = [Board(config=SimulationConfig(width=20, height=20, human_paces=paces)) for paces in (1, 4)]
+    humans = [Human(location=[10, 10]) for _ in boards]
+    for board, human in zip(boards, humans):
+        board.add_character(human)
+
+    assert [human.destination("E") for human in humans] == [(11, 10), (14, 10)]
+
+    zombie = Zombie(location=[5, 5])
+    assert zombie.destination("N") == (5, 4)
+
+
+def test_engines_with_different_configs_side_by_side():
+    """Two engines with different configs can run turn for turn in the same process."""
+    small = SimulationEngine(seed=1, config=SimulationConfig(width=10, height=8, human_count=20, zombie_count=2))
+    large = SimulationEngine(seed=1, config=SimulationConfig(width=50, height=40, human_count=200, zombie_count=3))
+    small.populate()
+    large.populate()
+
+    for _ in range(5):
+        small.commence_turn()
+        large.commence_turn()
+
+    assert (small.board.width, large.board.width) == (10, 50)
+    assert small.board.count_humans() + small.board.count_zombies() == 22
+    assert large.board.count_humans() + large.board.count_zombies() == 203
+    assert all(0 <= x < 10 and 0 <= y < 8 for x, y in small.board.character_locations.values())
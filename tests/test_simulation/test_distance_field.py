@@ -0,0 +1,138 @@
+"""Tests for the Distance Field."""
+import random
+
+import pytest
+
+from simulation.distance_field import DistanceField, WalkingSearch
+from simulation.spatial import pace_distance
+
+
+def test_distances_are_measured_in_paces():
+    """Without walls the distance to a source is the number of paces to it."""
+    field = DistanceField(10, 8, [("a", (2, 3))])
+
+    for x in range(10):
+        for y in range(8):
+            assert field.distance_at((x, y)) == pace_distance((x, y), (2, 3))
+            assert field.label_at((x, y)) == "a"
+
+
+def test_labels_nearest_source():
+    """Each cell is labelled with the source nearest to it."""
+    rng = random.Random(3)
+    sources = [(name, (rng.randrange(30), rng.randrange(20))) for name in "abcdef"]
+    field = DistanceField(30, 20, sources)
+
+    for x in range(30):
+        for y in range(20):
+            expected = min(pace_distance((x, y), location) for _, location in sources)
+            assert field.distance_at((x, y)) == expected
+            label_location = dict(sources)[field.label_at((x, y))]
+            assert pace_distance((x, y), label_location) == expected
+
+
+def test_no_sources():
+    """Without any sources nothing can be reached."""
+    field = DistanceField(5, 5, [])
+
+    assert field.distance_at((2, 2)) is None
+    assert field.label_at((2, 2)) is None
+    assert field.downhill((2, 2)) is None
+
+
+def test_impassable_cells_are_routed_around():
+    """Cells that can't be walked through are not entered and the distance is measured around them."""
+    # A wall along x == 2 with a gap at the bottom
+    field = DistanceField(5, 5, [("a", (0, 0))], is_passable=lambda x, y: x != 2 or y == 4)
+
+    assert field.distance_at((2, 0)) is None
+    assert field.distance_at((4, 0)) == 8
+    assert field.distance_at((3, 0)) == 8
+    assert field.downhill((3, 0)) in [(0, 1), (1, 1)]
+
+
+def test_stop_after():
+    """The search stops once the requested locations and their neighbours have been reached."""
+    field = DistanceField(50, 1, [("a", (0, 0))], stop_after=[(10, 0)])
+
+    assert field.distance_at((10, 0)) == 10
+    assert field.distance_at((11, 0)) == 11
+    assert field.distance_at((13, 0)) is None
+
+
+@pytest.mark.parametrize(
+    ("location", "towards", "expected"),
+    [
+        [(5, 5), (9, 5), (1, 0)],
+        [(5, 5), (9, 9), (1, 1)],
+        [(5, 5), (9, 8), (1, 1)],
+        [(5, 5), (5, 1), (0, -1)],
+    ]
+)
+def test_downhill(location, towards, expected):
+    """The step taken is the one that gets closest to the source."""
+    field = DistanceField(12, 12, [("a", towards)])
+
+    assert field.downhill(location, towards=towards) == expected
+
+
+def test_is_nearest():
+    """A source is amongst the nearest if it is no further away than the nearest source."""
+    field = DistanceField(20, 20, [("a", (3, 5)), ("b", (7, 5))])
+
+    assert field.is_nearest((5, 5), (3, 5))
+    assert field.is_nearest((5, 5), (7, 5))
+    assert not field.is_nearest((5, 5), (9, 5))
+
+
+def test_is_nearest_walks_around_walls():
+    """A source near in a straight line but further to walk around a wall isn't amongst the nearest."""
+    # A wall along x == 2 with a gap at the bottom
+    field = DistanceField(5, 5, [("across", (3, 0)), ("below", (0, 4))], is_passable=lambda x, y: x != 2 or y == 4)
+
+    assert field.distance_at((1, 0)) == 4
+    assert field.is_nearest((1, 0), (0, 4))
+    assert not field.is_nearest((1, 0), (3, 0))
+
+
+def test_walking_search_goes_around_walls():
+    """The nearest target is the fewest paces away walking around the walls, and the first step heads around them."""
+    # A wall along x == 2 with a gap at the bottom, the target straight across it is further to walk than the one below
+    targets = {(4, 0): ["across"], (0, 4): ["below"]}
+    search = WalkingSearch(5, 5, (0, 0), lambda x, y: targets.get((x, y), ()),
+                           is_passable=lambda x, y: x != 2 or y == 4)
+
+    assert (search.distance, search.nearest) == (4, ["below"])
+    assert search.first_step((0, 4)) == (0, 1)
+    assert search.first_step((4, 0)) is None
+
+
+def test_walking_search_only_visits_nearby_cells():
+    """The search stops at the nearest target, however large the board is."""
+    visited = []
+
+    def targets_at(x, y):
+        visited.append((x, y))
+        return ["near"] if (x, y) == (1003, 1000) else ()
+
+    search = WalkingSearch(100000, 100000, (1000, 1000), targets_at)
+
+    assert (search.distance, search.nearest) == (3, ["near"])
+    assert search.first_step((1003, 1000)) == (1, 0)
+    assert len(visited) == 7 * 7
+
+
+def test_walking_search_with_no_reachable_target():
+    """A target that can't be reached isn't found."""
+    search = WalkingSearch(5, 5, (0, 0), lambda x, y: ["walled off"] if (x, y) == (4, 4) else (),
+                           is_passable=lambda x, y: x != 2)
+
+    assert (search.distance, search.nearest) == (None, [])
+
+
+def test_walking_search_gives_up_after_max_paces():
+    """A target further than max_paces away is treated as out of reach."""
+    targets_at = lambda x, y: ["far"] if (x, y) == (4, 0) else ()
+
+    assert WalkingSearch(5, 5, (0, 0), targets_at, max_paces=3).distance is None
+    assert WalkingSearch(5, 5, (0, 0), targets_at, max_paces=4).distance == 4
@@ -0,0 +1,100 @@
+"""Tests for the headless Simulation Engine."""
+import random
+
+from simulation.board import Board
+from simulation.engine import SimulationEngine
+from ui.board import GameBoard
+
+
+def test_engine_creates_headless_board():
+    """If no board is given the engine creates one that can't be drawn."""
+    engine = SimulationEngine()
+
+    assert isinstance(engine.board, Board)
+    assert not isinstance(engine.board, GameBoard)
+    assert engine.turn_count == 0
+
+
+def test_populate():
+    """Check the engine places the requested number of humans and zombies."""
+    engine = SimulationEngine(human_count=10, zombie_count=2, seed=1)
+    engine.populate()
+
+    assert engine.board.count_humans() == 10
+    assert engine.board.count_zombies() == 2
+
+
+def test_run_to_extinction():
+    """A run ends when there are no humans left and reports the number of turns taken."""
+    engine = SimulationEngine(GameBoard(width=10, height=10), human_count=5, zombie_count=3, seed=3)
+    engine.populate()
+
+    turns = engine.run(max_turns=10000)
+
+    assert engine.is_over()
+    assert turns == engine.turn_count
+    assert engine.stats() == {"turns": turns, "humans": 0, "zombies": 8}
+
+
+def test_turn_stats():
+    """After every turn the engine records the populations and the number of humans caught during it."""
+    engine = SimulationEngine(GameBoard(width=10, height=10), human_count=20, zombie_count=3, seed=3)
+    engine.populate()
+    assert engine.turn_stats is None
+
+    humans = engine.board.count_humans()
+    while not engine.is_over():
+        engine.commence_turn()
+        stats = engine.turn_stats
+        assert stats.turn == engine.turn_count
+        assert (stats.humans, stats.zombies) == (engine.board.count_humans(), engine.board.count_zombies())
+        assert stats.conversions == humans - stats.humans
+        assert stats.kills == 0
+        humans = stats.humans
+    assert stats.as_dict() == {"turn": engine.turn_count, "humans": 0, "zombies": 23, "conversions": stats.conversions,
+                               "kills": 0}
+
+
+def test_run_max_turns():
+    """The number of turns can be limited."""
+    engine = SimulationEngine(human_count=60, zombie_count=1, seed=1)
+    engine.populate()
+
+    assert engine.run(max_turns=2) == 2
+
+
+def test_seeded_runs_are_repeatable():
+    """Two runs with the same seed take the same number of turns."""
+    results = []
+    for _ in range(2):
+        engine = SimulationEngine(GameBoard(width=15, height=15), human_count=10, zombie_count=2, seed=42)
+        engine.populate()
+        results.append(engine.run(max_turns=10000))
+
+    assert results[0] == results[1]
+
+
+def test_runs_do_not_use_the_global_random_generator():
+    """A seeded run has its own random number generator, so it neither changes nor depends on the global one."""
+    random.seed(5)
+    expected = random.random()
+
+    random.seed(5)
+    engine = SimulationEngine(human_count=10, zombie_count=2, seed=1)
+    engine.populate()
+    engine.run(max_turns=5)
+
+    assert random.random() == expected
+
+
+def test_seed_is_chosen_when_not_given():
+    """A run without a seed is given one, so it can still be repeated."""
+    engine = SimulationEngine(human_count=10, zombie_count=2)
+    engine.populate()
+    engine.run(max_turns=5)
+
+    repeat = SimulationEngine(human_count=10, zombie_count=2, seed=engine.seed)
+    repeat.populate()
+    repeat.run(max_turns=5)
+
+    assert repeat.stats() == engine.stats()
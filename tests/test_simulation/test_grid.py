@@ -0,0 +1,68 @@
+"""Tests for the Chunked Grid."""
+import tracemalloc
+
+import pytest
+
+from characters.human import Human
+from characters.roles import HUMAN, ZOMBIE
+from characters.zombie import Zombie
+from simulation.grid import ChunkedGrid
+from ui.board import GameBoard
+
+
+def test_tiles_come_and_go_with_the_characters():
+    """A tile only exists while a character is in it."""
+    grid = ChunkedGrid(100, 100, 2, chunk_size=10)
+    human = Human(location=[15, 25])
+    zombie = Zombie(location=[15, 26])
+
+    grid.add(human, 15, 25)
+    grid.add(zombie, 15, 26)
+    assert list(grid.tiles) == [(1, 2)]
+    assert grid.cell(15, 25) == [human]
+    assert grid.count(HUMAN, 15, 25) == 1
+    assert grid.count(ZOMBIE, 15, 25) == 0
+
+    grid.remove(human, 15, 25)
+    assert grid.cell(15, 25) == ()
+    assert list(grid.tiles) == [(1, 2)]
+
+    grid.remove(zombie, 15, 26)
+    assert grid.tiles == {}
+    assert grid.count(ZOMBIE, 15, 26) == 0
+
+    with pytest.raises(ValueError):
+        grid.remove(zombie, 15, 26)
+
+
+def test_indexing_reads_like_a_list_of_lists():
+    """grid[x][y] is the characters in a cell, and the grid has width columns of height cells."""
+    grid = ChunkedGrid(7, 3, 2, chunk_size=2)
+    human = Human(location=[6, 2])
+    grid.add(human, 6, 2)
+
+    assert len(grid) == 7
+    assert all(len(column) == 3 for column in grid)
+    assert grid[6][2] == [human]
+    assert grid[0][0] == []
+    assert [cell for column in grid for cell in column if cell] == [[human]]
+    with pytest.raises(IndexError):
+        grid[7]
+    with pytest.raises(IndexError):
+        grid[0][3]
+
+
+def test_huge_empty_board_is_cheap():
+    """The memory a board takes depends on where its characters are rather than on its size."""
+    tracemalloc.start()
+    try:
+        board = GameBoard(width=10000, height=10000)
+        for x in range(0, 10000, 1000):
+            board.add_character(Human(location=[x, x]))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(board.character_grid.tiles) == 10
+    # The walls take a bit per cell, everything else only takes memory where there are characters
+    assert peak < 20 * 1024 * 1024
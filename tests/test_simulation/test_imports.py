@@ -0,0 +1,51 @@
+"""Tests for what importing the simulation costs."""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Every sweep worker and headless run pays for these imports before its first turn
+CORE_MODULES = [
+    "characters.human",
+    "characters.zombie",
+    "simulation.board",
+    "simulation.engine",
+    "simulation.checkpoint",
+    "simulation.sweep",
+]
+
+# The most time importing the core modules may take, generous enough for a slow CI machine
+IMPORT_BUDGET_SECONDS = 0.5
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+for module in {modules!r}:
+    __import__(module)
+print(json.dumps({{"seconds": time.perf_counter() - start, "modules": sorted(sys.modules)}}))
+"""
+
+
+def import_core():
+    """Import the core modules in a fresh interpreter, returning how long it took and every module it loaded."""
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(modules=CORE_MODULES)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def test_core_does_not_import_pygame_or_the_ui():
+    """The rules can be imported without pygame, or anything that draws, being loaded."""
+    modules = import_core()["modules"]
+
+    assert not [module for module in modules if module.split(".")[0] in ("pygame", "ui", "app")]
+
+
+def test_core_imports_within_budget():
+    """Importing the core modules is quick, taking the best of a few tries so a busy machine doesn't fail it."""
+    seconds = min(import_core()["seconds"] for _ in range(3))
+
+    assert seconds < IMPORT_BUDGET_SECONDS
@@ -0,0 +1,114 @@
+"""Tests for the turn Instrumentation."""
+from unittest.mock import patch
+
+import pytest
+
+from characters.human import Human
+from characters.zombie import Zombie
+from simulation.engine import SimulationEngine
+from simulation.instrumentation import Instrumentation, PhaseClock
+from ui.board import GameBoard
+
+
+@pytest.fixture
+def engine():
+    engine = SimulationEngine(GameBoard(width=20, height=20), human_count=30, zombie_count=5, seed=2)
+    engine.populate()
+    return engine
+
+
+def test_phases_of_each_turn(engine):
+    """The time of every turn is broken down into its phases."""
+    instrumentation = Instrumentation()
+    instrumentation.attach(engine.board)
+    try:
+        engine.run(max_turns=3)
+    finally:
+        instrumentation.detach()
+
+    assert len(instrumentation.turns) == 3
+    assert {"human_movement", "zombie_movement", "zombie_target_selection", "move_validation"} <= set(
+        instrumentation.summary()
+    )
+    # Humans and then zombies walk in every turn
+    assert instrumentation.calls["_apply_moves"] == 3 * 2
+    assert instrumentation.calls["_check_space_sharing"] > 0
+
+
+def test_detach_restores_methods(engine):
+    """Once detached the board and the characters run their original methods."""
+    decide = Human.__dict__["decide"]
+    find_nearest_human = Zombie.__dict__["_find_nearest_human"]
+    instrumentation = Instrumentation()
+    instrumentation.attach(engine.board)
+    instrumentation.detach()
+
+    assert Human.__dict__["decide"] is decide
+    assert Zombie.__dict__["_find_nearest_human"] is find_nearest_human
+    assert "move_character" not in vars(engine.board)
+    assert "commence_turn" not in vars(engine.board)
+
+
+def test_attach_twice(engine):
+    """An instrumentation can only be attached to one board at a time."""
+    instrumentation = Instrumentation()
+    instrumentation.attach(engine.board)
+    try:
+        with pytest.raises(RuntimeError):
+            instrumentation.attach(GameBoard())
+    finally:
+        instrumentation.detach()
+
+
+def test_profile_window(engine, tmp_path):
+    """A profile covers the number of turns asked for and is written to a file."""
+    path = tmp_path / "profile.txt"
+    instrumentation = Instrumentation()
+    instrumentation.attach(engine.board)
+    try:
+        instrumentation.profile(2, path=str(path))
+        assert instrumentation.is_profiling()
+        engine.run(max_turns=3)
+    finally:
+        instrumentation.detach()
+
+    assert not instrumentation.is_profiling()
+    assert len(instrumentation.reports) == 1
+    assert "Largest allocations by line" in path.read_text()
+
+
+def test_phase_clock_charges_nested_phase_only():
+    """Time spent in a nested phase isn't also charged to the phase around it."""
+    ticks = iter([0, 1, 3, 4])
+    clock = PhaseClock()
+
+    with patch("simulation.instrumentation.time.perf_counter", lambda: next(ticks)):
+        clock.enter("outer")
+        clock.enter("inner")
+        clock.exit()
+        clock.exit()
+
+    assert clock.totals == {"outer": 2, "inner": 2}
+
+
+def test_draw_is_timed_a_frame_at_a_time(engine):
+    """Frames drawn while attached are timed and reported alongside the phases of the turns."""
+    instrumentation = Instrumentation()
+    drawn = []
+    draw = instrumentation.time_draw(lambda: drawn.append(True) or ["rect"])
+
+    assert draw() == ["rect"]
+    assert instrumentation.draw_summary() is None
+
+    instrumentation.attach(engine.board)
+    try:
+        engine.run(max_turns=2)
+        draw()
+        draw()
+    finally:
+        instrumentation.detach()
+
+    assert len(drawn) == 3
+    assert len(instrumentation.frames) == 2
+    assert instrumentation.draw_summary() >= 0
+    assert "ms/frame" in instrumentation.format_summary()
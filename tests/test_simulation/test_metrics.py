@@ -0,0 +1,150 @@
+"""Tests for streaming the metrics of every turn."""
+import csv
+import json
+import math
+
+import pytest
+
+from simulation.config import SimulationConfig
+from simulation.engine import SimulationEngine
+from simulation.metrics import FIELDS, CsvSink, JsonLinesSink, export_metrics, open_sink, turn_records
+
+CONFIG = SimulationConfig(width=20, height=20, human_count=60, zombie_count=3)
+
+
+def engine(seed=5):
+    """A populated object engine on a small board."""
+    simulation = SimulationEngine(seed=seed, config=CONFIG)
+    simulation.populate()
+    return simulation
+
+
+def test_turn_records():
+    """A record is yielded for every turn, matching the populations the engine ends the turn with."""
+    simulation = engine()
+    records = []
+    for record in turn_records(simulation, max_turns=10):
+        assert (record["humans"], record["zombies"]) == (simulation.board.count_humans(),
+                                                         simulation.board.count_zombies())
+        records.append(record)
+
+    assert [record["turn"] for record in records] == list(range(1, 11))
+    assert all(set(record) == set(FIELDS) for record in records)
+    assert all(record["seconds"] >= 0 for record in records)
+    # Every human lost was converted
+    assert sum(record["conversions"] + record["kills"] for record in records) == 60 - records[-1]["humans"]
+
+
+def test_records_stop_at_extinction():
+    """The records run out when the last human is caught."""
+    simulation = engine()
+
+    records = list(turn_records(simulation))
+
+    assert records[-1]["humans"] == 0
+    assert records[-1]["turn"] == simulation.turn_count
+    assert math.isnan(records[-1]["mean_hunt_distance"])
+
+
+def test_mean_hunt_distance():
+    """The mean hunt distance is the mean number of paces from each hunting zombie to its human."""
+    simulation = engine()
+    simulation.commence_turn()
+    board = simulation.board
+    distances = [
+        max(abs(a - b) for a, b in zip(board.character_locations[zombie], board.character_locations[zombie.target]))
+        for zombie in board.character_list if getattr(zombie, "target", None) is not None and zombie.target.role == 0
+    ]
+
+    assert distances
+    assert simulation.mean_hunt_distance() == pytest.approx(sum(distances) / len(distances))
+
+
+def test_sinks_write_the_same_records(tmp_path):
+    """The CSV and JSON Lines files hold every record, written in chunks."""
+    records = list(turn_records(engine(), max_turns=15))
+    sinks = [CsvSink(tmp_path / "metrics.csv", buffer_size=10),
+             JsonLinesSink(tmp_path / "metrics.jsonl", buffer_size=10)]
+
+    assert export_metrics(iter(records), sinks) == 15
+
+    with open(tmp_path / "metrics.csv", newline="") as metrics:
+        rows = list(csv.DictReader(metrics))
+    assert [int(row["humans"]) for row in rows] == [record["humans"] for record in records]
+    assert list(rows[0]) == list(FIELDS)
+    lines = (tmp_path / "metrics.jsonl").read_text().splitlines()
+    assert [json.loads(line)["zombies"] for line in lines] == [record["zombies"] for record in records]
+
+
+def test_sink_buffers_until_full(tmp_path):
+    """Nothing is written until the buffer fills, then the whole chunk is written at once."""
+    path = tmp_path / "metrics.jsonl"
+    records = list(turn_records(engine(), max_turns=5))
+
+    with JsonLinesSink(path, buffer_size=3) as sink:
+        sink.write(records[0])
+        sink.write(records[1])
+        assert path.read_text() == ""
+        sink.write(records[2])
+        assert len(path.read_text().splitlines()) == 3
+        sink.write(records[3])
+    assert len(path.read_text().splitlines()) == 4
+
+
+def test_numpy_sink(tmp_path):
+    """The .npy file reads back as a table with a column for every field."""
+    np = pytest.importorskip("numpy")
+    path = tmp_path / "metrics.npy"
+    records = list(turn_records(engine(), max_turns=15))
+
+    export_metrics(iter(records), [open_sink(path, buffer_size=7)])
+
+    table = np.load(path)
+    assert table.dtype.names == FIELDS
+    assert table["turn"].tolist() == list(range(1, 16))
+    assert table["humans"].tolist() == [record["humans"] for record in records]
+    assert np.load(path, mmap_mode="r")["seconds"].tolist() == [record["seconds"] for record in records]
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".jsonl", ".npy"])
+def test_sink_resumes_from_a_turn(tmp_path, suffix):
+    """A resumed sink keeps the records up to the checkpoint's turn and writes the rest after them."""
+    if suffix == ".npy":
+        np = pytest.importorskip("numpy")
+    path = tmp_path / f"metrics{suffix}"
+    records = list(turn_records(engine(), max_turns=15))
+    # The first run got past its last checkpoint, at turn 10, before it stopped
+    export_metrics(iter(records[:13]), [open_sink(path, buffer_size=4)])
+
+    export_metrics(iter(records[10:]), [open_sink(path, buffer_size=4, resume_turn=10)])
+
+    if suffix == ".csv":
+        with open(path, newline="") as metrics:
+            turns = [int(row["turn"]) for row in csv.DictReader(metrics)]
+    elif suffix == ".jsonl":
+        turns = [json.loads(line)["turn"] for line in path.read_text().splitlines()]
+    else:
+        turns = np.load(path)["turn"].tolist()
+    assert turns == list(range(1, 16))
+
+
+def test_array_engine_records():
+    """The array engines yield the same fields, counting the humans they lose as conversions."""
+    pytest.importorskip("numpy")
+    from simulation.vectorized import VectorizedEngine
+
+    simulation = VectorizedEngine(seed=2, config=CONFIG)
+    simulation.populate()
+
+    records = list(turn_records(simulation))
+
+    assert records[-1]["humans"] == 0
+    assert sum(record["conversions"] for record in records) == 60
+    assert all(set(record) == set(FIELDS) for record in records)
+    assert not math.isnan(records[0]["mean_hunt_distance"])
+
+
+def test_unknown_extension(tmp_path):
+    """A sink can't be chosen for a file with an unknown extension."""
+    with pytest.raises(ValueError):
+        open_sink(tmp_path / "metrics.txt")
@@ -0,0 +1,109 @@
+"""Tests for recording and playing back replays."""
+import pytest
+
+from simulation.engine import SimulationEngine
+from simulation.replay import Replay, board_state, HUMAN, ZOMBIE
+from ui.board import GameBoard
+
+
+def record(path, turns, keyframe_interval=10, seed=4):
+    """Record a run, returning the state of the board at the end of every turn."""
+    engine = SimulationEngine(GameBoard(width=30, height=30), human_count=80, zombie_count=5, seed=seed)
+    engine.populate()
+    recorder = engine.record(path, keyframe_interval=keyframe_interval)
+    states = {0: board_state(engine.board)}
+    for _ in range(turns):
+        engine.commence_turn()
+        states[engine.turn_count] = board_state(engine.board)
+    recorder.close()
+    return states
+
+
+def test_state_at_every_turn(tmp_path):
+    """Seeking to any turn gives the board as it was at the end of that turn."""
+    path = tmp_path / "run.replay"
+    states = record(path, 35)
+    replay = Replay(path)
+
+    assert (replay.first_turn, replay.last_turn, replay.seed) == (0, 35, 4)
+    for turn, state in states.items():
+        assert replay.state_at(turn) == state
+    # Seeking backwards works just as well as seeking forwards
+    assert replay.state_at(3) == states[3]
+    replay.close()
+
+
+def test_apply_turn(tmp_path):
+    """Playing a replay a turn at a time gives the same boards as the run that was recorded."""
+    path = tmp_path / "run.replay"
+    states = record(path, 25)
+    replay = Replay(path)
+    state = replay.state_at(0)
+
+    for turn in range(1, 26):
+        before = replay.apply_turn(state, turn)
+        assert state == states[turn]
+        assert all(states[turn - 1].get(character_id) == previous for character_id, previous in before.items())
+    replay.close()
+
+
+def test_walls_are_recorded(tmp_path):
+    """A replay holds the walls of the board it was recorded from."""
+    path = tmp_path / "run.replay"
+    engine = SimulationEngine(GameBoard(width=30, height=30), human_count=80, zombie_count=5, seed=4)
+    engine.board.add_walls((3, 3), (20, 3))
+    engine.populate()
+    engine.record(path).close()
+
+    replay = Replay(path)
+    assert sorted(replay.walls) == sorted(engine.board.walls)
+    assert replay.state_at(0) == board_state(engine.board)
+    replay.close()
+
+
+def test_conversions_keep_their_id(tmp_path):
+    """A human that is turned into a zombie is recorded as a change of role rather than a new character."""
+    path = tmp_path / "run.replay"
+    states = record(path, 30)
+
+    assert set(states[0]) == set(states[30])
+    converted = [character_id for character_id, (role, _, _) in states[0].items()
+                 if role == HUMAN and states[30][character_id][0] == ZOMBIE]
+    assert converted
+
+
+def test_same_seed_same_replay(tmp_path):
+    """A run with the same seed writes exactly the same replay."""
+    record(tmp_path / "first.replay", 20)
+    record(tmp_path / "second.replay", 20)
+
+    assert (tmp_path / "first.replay").read_bytes() == (tmp_path / "second.replay").read_bytes()
+
+
+def test_moves_are_compact(tmp_path):
+    """Between keyframes each move takes a handful of bytes."""
+    path = tmp_path / "run.replay"
+    record(path, 20, keyframe_interval=1000)
+
+    # 85 characters for 20 turns, at an id and two 16 bit steps for every move
+    assert path.stat().st_size < 85 * 20 * 8 + 2000
+
+
+def test_turn_not_in_replay(tmp_path):
+    """Seeking past the end of the replay is an error."""
+    path = tmp_path / "run.replay"
+    record(path, 5)
+    replay = Replay(path)
+
+    with pytest.raises(IndexError):
+        replay.state_at(6)
+    replay.close()
+
+
+def test_not_a_replay(tmp_path):
+    """Opening a file that isn't a replay is an error."""
+    path = tmp_path / "other.replay"
+    path.write_bytes(b"\x00" * 64)
+
+    with pytest.raises(ValueError):
+        Replay(path)
@@ -0,0 +1,107 @@
+"""Tests for the Turn Scheduler."""
+import pytest
+
+from simulation.engine import SimulationEngine
+from simulation.scheduler import TurnScheduler, PLAYING, PAUSED, STOPPED
+
+
+@pytest.fixture
+def engine():
+    engine = SimulationEngine(human_count=20, zombie_count=2, seed=3)
+    engine.populate()
+    return engine
+
+
+def test_turns_follow_speed_not_frame_rate(engine):
+    """At a speed in turns per second the number of turns doesn't depend on how often frames are drawn."""
+    scheduler = TurnScheduler(engine, turns_per_second=4)
+
+    # Ten frames a second for a second
+    turns = sum(scheduler.update(0.1) for _ in range(10))
+
+    assert turns == 4
+    assert engine.turn_count == 4
+
+
+def test_long_stall_does_not_cause_a_burst(engine):
+    """A frame that takes a long time doesn't make the scheduler try to catch up all the missed turns."""
+    scheduler = TurnScheduler(engine, turns_per_second=2)
+
+    assert scheduler.update(30) == 2
+
+
+def test_fast_forward(engine):
+    """Fast-forwarding runs a fixed number of turns every frame."""
+    scheduler = TurnScheduler(engine, turns_per_frame=5)
+
+    assert scheduler.update(0.01) == 5
+    assert scheduler.update(0.01) == 5
+
+
+def test_frame_budget(engine):
+    """Running to a budget runs turns until the budget is spent."""
+    ticks = iter(range(100))
+    scheduler = TurnScheduler(engine, frame_budget=3, timer=lambda: next(ticks))
+
+    # The deadline is worked out at tick 0, then every turn takes one tick
+    assert scheduler.update(0.01) == 3
+
+
+def test_turns_stop_when_the_invasion_is_over():
+    """No turns are run once the humans have been wiped out."""
+    engine = SimulationEngine(human_count=0, zombie_count=1, seed=1)
+    engine.populate()
+    scheduler = TurnScheduler(engine, turns_per_frame=5)
+
+    assert scheduler.update(0.1) == 0
+    assert scheduler.step() == 0
+
+
+def test_pause_play_and_step(engine):
+    """A paused invasion only moves on a turn at a time when it's stepped."""
+    scheduler = TurnScheduler(engine, turns_per_frame=5)
+    scheduler.toggle_pause()
+
+    assert scheduler.state == PAUSED
+    assert scheduler.update(1) == 0
+    assert scheduler.step() == 1
+    assert engine.turn_count == 1
+
+    scheduler.toggle_pause()
+
+    assert scheduler.state == PLAYING
+    assert scheduler.update(1) == 5
+
+
+def test_stop_and_restart(engine):
+    """A stopped invasion can't be played again, only restarted."""
+    scheduler = TurnScheduler(engine, turns_per_frame=1)
+    scheduler.stop()
+    scheduler.play()
+
+    assert scheduler.state == STOPPED
+    assert scheduler.update(1) == 0
+    assert scheduler.step() == 0
+
+    new_engine = SimulationEngine(human_count=5, zombie_count=1, seed=1)
+    new_engine.populate()
+    scheduler.restart(new_engine)
+
+    assert scheduler.state == PLAYING
+    assert scheduler.update(1) == 1
+    assert new_engine.turn_count == 1
+
+
+def test_faster_and_slower(engine):
+    """The speed steps through the list of speeds, or doubles and halves the fast-forward."""
+    scheduler = TurnScheduler(engine, turns_per_second=2)
+    scheduler.faster()
+    assert scheduler.turns_per_second == 4
+    scheduler.slower()
+    scheduler.slower()
+    assert scheduler.turns_per_second == 1
+
+    scheduler.fast_forward(4)
+    scheduler.faster()
+    assert scheduler.turns_per_frame == 8
+    assert scheduler.describe() == "playing at 8 turns/frame"
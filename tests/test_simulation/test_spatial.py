@@ -0,0 +1,144 @@
+"""Tests for the Spatial Index."""
+import random
+
+import pytest
+
+from characters.human import Human
+from characters.roles import HUMAN, ZOMBIE
+from characters.zombie import Zombie
+from simulation.spatial import SpatialIndex, pace_distance
+
+
+@pytest.mark.parametrize(
+    ("location", "other_location", "expected"),
+    [
+        [(0, 0), (0, 0), 0],
+        [(0, 0), (3, 0), 3],
+        [(0, 0), (3, 3), 3],
+        [(5, 5), (2, 9), 4],
+    ]
+)
+def test_pace_distance(location, other_location, expected):
+    """The distance between two locations is measured in paces in any of the eight compass directions."""
+    assert pace_distance(location, other_location) == expected
+
+
+def test_nearest():
+    """The nearest character of a type is found."""
+    index = SpatialIndex(40, 20)
+    human = Human(location=(30, 5))
+    zombie = Zombie(location=(11, 10))
+    index.add(human, human.location)
+    index.add(zombie, zombie.location)
+
+    assert index.nearest((10, 10), HUMAN) == (20, [human])
+    assert index.nearest((10, 10), ZOMBIE) == (1, [zombie])
+    assert index.nearest((10, 10)) == (1, [zombie])
+
+
+def test_nearest_returns_all_ties():
+    """Every character at the nearest distance is returned."""
+    index = SpatialIndex(40, 20)
+    humans = [Human(location=location) for location in [(7, 10), (13, 13), (10, 7), (20, 10)]]
+    for human in humans:
+        index.add(human, human.location)
+
+    distance, nearest = index.nearest((10, 10), HUMAN)
+
+    assert distance == 3
+    assert set(nearest) == set(humans[:3])
+
+
+def test_nearest_none_found():
+    """If there are no characters of the type the distance is None."""
+    index = SpatialIndex(40, 20)
+    zombie = Zombie(location=(1, 1))
+    index.add(zombie, zombie.location)
+
+    assert index.nearest((10, 10), HUMAN) == (None, [])
+
+
+def test_nearest_max_distance():
+    """Characters beyond the maximum distance are ignored."""
+    index = SpatialIndex(40, 20)
+    human = Human(location=(15, 10))
+    index.add(human, human.location)
+
+    assert index.nearest((10, 10), HUMAN, max_distance=4) == (None, [])
+    assert index.nearest((10, 10), HUMAN, max_distance=5) == (5, [human])
+
+
+def test_nearest_matches_brute_force():
+    """The nearest characters match those found by checking every character."""
+    rng = random.Random(7)
+    index = SpatialIndex(100, 60, bucket_size=4)
+    humans = []
+    for _ in range(50):
+        human = Human(location=(rng.randrange(100), rng.randrange(60)))
+        index.add(human, human.location)
+        humans.append(human)
+
+    for _ in range(100):
+        location = (rng.randrange(100), rng.randrange(60))
+        expected_distance = min(pace_distance(location, human.location) for human in humans)
+        expected = {human for human in humans if pace_distance(location, human.location) == expected_distance}
+
+        distance, nearest = index.nearest(location, HUMAN)
+
+        assert distance == expected_distance
+        assert set(nearest) == expected
+
+
+def test_move_and_remove():
+    """Characters can be moved between buckets and removed."""
+    index = SpatialIndex(40, 20)
+    human = Human(location=(1, 1))
+    index.add(human, (1, 1))
+
+    index.move(human, (1, 1), (30, 15))
+    assert index.nearest((30, 14), HUMAN) == (1, [human])
+
+    index.remove(human, (30, 15))
+    assert index.nearest((30, 14), HUMAN) == (None, [])
+    assert index.buckets == {}
+
+
+def test_within_radius():
+    """Only the characters within the radius are found."""
+    index = SpatialIndex(40, 20)
+    near = Human(location=(12, 12))
+    far = Human(location=(13, 10))
+    zombie = Zombie(location=(10, 10))
+    for character in [near, far, zombie]:
+        index.add(character, character.location)
+
+    assert index.within_radius((10, 10), 2, HUMAN) == [near]
+    assert set(index.within_radius((10, 10), 3)) == {near, far, zombie}
+
+
+def test_adjacent():
+    """Only characters in the eight surrounding cells are adjacent."""
+    index = SpatialIndex(40, 20)
+    same_cell = Human(location=(0, 0))
+    adjacent = Human(location=(1, 1))
+    not_adjacent = Human(location=(2, 0))
+    for character in [same_cell, adjacent, not_adjacent]:
+        index.add(character, character.location)
+
+    assert index.adjacent((0, 0), HUMAN) == [adjacent]
+
+
+def test_buckets_are_keyed_by_role():
+    """Characters are grouped by their role, so a converted human is found as a zombie once it is re-added."""
+    index = SpatialIndex(40, 20)
+    human = Human(location=(3, 3))
+    index.add(human, human.location)
+    assert list(index.buckets[(0, 0)]) == [HUMAN]
+
+    index.remove(human, human.location)
+    zombie = Zombie.convert(human)
+    index.add(zombie, zombie.location)
+
+    assert list(index.buckets[(0, 0)]) == [ZOMBIE]
+    assert index.nearest((5, 5), HUMAN) == (None, [])
+    assert index.nearest((5, 5), ZOMBIE) == (2, [zombie])
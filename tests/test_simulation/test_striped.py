@@ -0,0 +1,161 @@
+"""Tests for the Striped Engine."""
+import statistics
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from characters.roles import HUMAN, ZOMBIE
+from simulation.config import SimulationConfig
+from simulation.striped import Stripe, StripedEngine, stripe_bounds
+from simulation.vectorized import VectorizedEngine
+
+# Stripes two rows high, which humans and zombies walk straight across
+THIN_STRIPES = SimulationConfig(width=30, height=12, human_count=150, zombie_count=4, human_paces=2, zombie_paces=3)
+
+
+def run_turns(workers, turns=None, config=None):
+    """Run an invasion, recording the characters after every turn."""
+    if config is None:
+        engine = StripedEngine(width=60, height=45, human_count=400, zombie_count=6, seed=11, workers=workers)
+    else:
+        engine = StripedEngine(seed=11, config=config, workers=workers)
+    engine.populate()
+    history = []
+    try:
+        while not engine.is_over() and (turns is None or engine.turn_count < turns):
+            engine.commence_turn()
+            history.append((engine.x.copy(), engine.y.copy(), engine.role.copy(), engine.target.copy()))
+    finally:
+        engine.close()
+    return history
+
+
+def test_stripe_bounds():
+    """The stripes cover every row once, and there are never more stripes than rows."""
+    assert stripe_bounds(10, 3) == [0, 3, 6, 10]
+    assert stripe_bounds(2, 8) == [0, 1, 2]
+    assert stripe_bounds(5, 1) == [0, 5]
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_same_invasion_however_many_workers(workers):
+    """Every character is in the same place, with the same role and target, after every turn."""
+    expected = run_turns(1)
+    history = run_turns(workers)
+
+    assert len(history) == len(expected)
+    for turn, (arrays, expected_arrays) in enumerate(zip(history, expected)):
+        for array, expected_array in zip(arrays, expected_arrays):
+            assert (array == expected_array).all(), f"turn {turn}"
+
+
+def test_invasion_is_pinned():
+    """
+    A seed plays out the same invasion as it always has, so a change to the random choices can't go unnoticed.
+
+    This is the striped engine's own invasion for the seed, the VectorizedEngine plays a different one.
+    """
+    engine = StripedEngine(width=12, height=12, human_count=20, zombie_count=2, seed=7, workers=1)
+    engine.populate()
+    humans = []
+    try:
+        while not engine.is_over():
+            engine.commence_turn()
+            humans.append(engine.count_humans())
+            if engine.turn_count == 5:
+                assert engine.x.tolist() == [8, 11, 2, 11, 3, 11, 5, 5, 2, 4, 5, 1, 7, 3, 3, 8, 3, 4, 3, 11, 7, 3]
+                assert engine.y.tolist() == [3, 0, 1, 1, 5, 6, 11, 8, 7, 10, 8, 6, 0, 5, 6, 6, 8, 5, 3, 8, 6, 9]
+                assert engine.role.tolist() == [0, 0, 0, 0, 1, 0, 0, 1, 1, 1, 1, 0, 0, 1, 1, 0, 1, 1, 0, 0, 1, 1]
+                assert engine.target.tolist() == [
+                    -1, -1, -1, -1, 13, -1, -1, 13, 11, 6, 13, -1, -1, -1, 13, -1, 11, 13, -1, -1, 15, 6,
+                ]
+    finally:
+        engine.close()
+
+    assert humans == [18, 16, 14, 12, 11, 9, 7, 6, 4, 3, 3, 2, 1, 0]
+
+
+def test_same_invasion_with_stripes_thinner_than_a_walk():
+    """Characters that walk past the stripe next to theirs are still picked up by the stripe they end up in."""
+    expected = run_turns(1, config=THIN_STRIPES)
+    history = run_turns(6, config=THIN_STRIPES)
+
+    assert len(history) == len(expected)
+    for turn, (arrays, expected_arrays) in enumerate(zip(history, expected)):
+        for array, expected_array in zip(arrays, expected_arrays):
+            assert (array == expected_array).all(), f"turn {turn}"
+
+
+def test_field_around_a_stripe_finds_far_humans():
+    """A field over the rows around a stripe grows until it finds the nearest humans, however far away they are."""
+    engine = StripedEngine(width=40, height=60, human_count=6, zombie_count=80, seed=3, workers=1)
+    engine.populate()
+    engine._start()
+    whole = engine._stripe
+    whole._mark_humans(0, np.arange(len(engine.x)))
+    bounds = stripe_bounds(60, 12)
+    stripe = Stripe(engine._arrays, index=5, **dict(engine._settings(), bounds=bounds))
+    zombies = stripe.characters[engine.role[stripe.characters] == ZOMBIE]
+
+    distance, keys = stripe._nearest_by_field(zombies, reach=1)
+    expected_distance, expected_keys = whole._nearest_by_field(zombies, reach=60)
+
+    assert len(zombies)
+    assert distance.tolist() == expected_distance.tolist()
+    assert keys.tolist() == expected_keys.tolist()
+    engine.close()
+
+
+def test_nearest_humans_by_ring_and_field_agree():
+    """Searching the rings around a zombie finds the same human as the distance field does."""
+    engine = StripedEngine(width=40, height=30, human_count=25, zombie_count=150, seed=2, workers=1)
+    engine.populate()
+    engine._start()
+    stripe = engine._stripe
+    stripe._mark_humans(0, np.arange(len(engine.x)))
+    zombies = np.flatnonzero(engine.role == ZOMBIE)
+
+    # A zombie on its own always searches the rings, all of them together are cheaper to find with the field
+    by_ring = [stripe.nearest_humans(np.array([zombie])) for zombie in zombies]
+    distance, nearest = stripe.nearest_humans(zombies)
+
+    assert [int(found[0][0]) for found in by_ring] == distance.tolist()
+    assert [int(found[1][0]) for found in by_ring] == nearest.tolist()
+    assert (engine.role[nearest] == HUMAN).all()
+    engine.close()
+
+
+def test_close_keeps_the_characters():
+    """After the workers stop the characters are still there, and more turns can be run."""
+    engine = StripedEngine(width=20, height=20, human_count=50, zombie_count=3, seed=4, workers=2)
+    engine.populate()
+    engine.commence_turn()
+    humans = engine.count_humans()
+    engine.close()
+
+    assert engine.count_humans() == humans
+    assert engine.count_humans() + engine.count_zombies() == 53
+    engine.run(max_turns=3)
+    assert engine.turn_count == 3
+
+
+def test_same_rules_as_vectorized_engine():
+    """
+    On the default board the invasion takes about as many turns as it does with the vectorized engine.
+
+    The random choices are made differently, so the two engines can't be compared seed for seed, only over many
+    seeds.
+    """
+    striped_turns = []
+    vectorized_turns = []
+    for seed in range(20):
+        engine = StripedEngine(seed=seed, workers=1)
+        engine.populate()
+        striped_turns.append(engine.run(max_turns=2000))
+
+        vectorized = VectorizedEngine(seed=seed)
+        vectorized.populate()
+        vectorized_turns.append(vectorized.run(max_turns=2000))
+
+    assert statistics.mean(striped_turns) == pytest.approx(statistics.mean(vectorized_turns), rel=0.25)
@@ -0,0 +1,124 @@
+"""Tests for the Monte Carlo parameter sweep."""
+import pytest
+
+from simulation.sweep import parameter_grid, replicate_seed, run_replicate, summarise, sweep, confidence_half_width
+
+
+def test_parameter_grid():
+    """Every combination of the parameter values is produced."""
+    grid = parameter_grid(width=[20, 40], human_count=[30, 60])
+
+    assert grid == [
+        {"width": 20, "human_count": 30},
+        {"width": 20, "human_count": 60},
+        {"width": 40, "human_count": 30},
+        {"width": 40, "human_count": 60},
+    ]
+
+
+def test_replicate_seed():
+    """Seeds are repeatable and differ between configurations and replicates."""
+    seeds = {replicate_seed(0, configuration, replicate) for configuration in range(10) for replicate in range(10)}
+
+    assert replicate_seed(0, 3, 4) == replicate_seed(0, 3, 4)
+    assert replicate_seed(1, 3, 4) != replicate_seed(0, 3, 4)
+    assert len(seeds) == 100
+
+
+def test_summarise():
+    """The summary holds the mean, the percentiles and a confidence interval around the mean."""
+    summary = summarise([10, 20, 30, 40, 50])
+
+    assert summary["count"] == 5
+    assert summary["mean"] == 30
+    assert summary["p50"] == 30
+    assert summary["p5"] == pytest.approx(12)
+    assert summary["p95"] == pytest.approx(48)
+    # t(4) = 2.776, stdev = 15.81
+    assert summary["ci_low"] == pytest.approx(30 - 2.776 * 15.811 / 5 ** 0.5, rel=1e-3)
+    assert summary["ci_high"] == pytest.approx(30 + 2.776 * 15.811 / 5 ** 0.5, rel=1e-3)
+
+
+def test_confidence_half_width_single_replicate():
+    """A single replicate says nothing about the confidence interval."""
+    assert confidence_half_width([10]) == float("inf")
+
+
+def test_sweep():
+    """Every configuration is run the requested number of times, and the runs are repeatable."""
+    grid = parameter_grid(width=[10, 15], height=[10], human_count=[10], zombie_count=[2])
+
+    results = sweep(grid, 3, processes=1, base_seed=5, max_turns=1000)
+    repeated = sweep(grid, 3, processes=1, base_seed=5, max_turns=1000)
+
+    assert [result.parameters for result in results] == grid
+    assert [len(result.turns) for result in results] == [3, 3]
+    assert [result.turns for result in results] == [result.turns for result in repeated]
+    assert all(result.unfinished == 0 for result in results)
+
+
+def test_sweep_process_pool_matches_single_process():
+    """Runs get the same seeds however many processes the sweep is spread over."""
+    grid = parameter_grid(width=[10], height=[10], human_count=[10, 20], zombie_count=[2])
+
+    single = sweep(grid, 4, processes=1, base_seed=1, max_turns=1000)
+    pooled = sweep(grid, 4, processes=2, base_seed=1, max_turns=1000)
+
+    assert [result.turns for result in single] == [result.turns for result in pooled]
+
+
+def test_sweep_stops_when_settled():
+    """With a loose tolerance no more replicates are added, with an impossible one replicates stop at the limit."""
+    grid = parameter_grid(width=[10], height=[10], human_count=[10], zombie_count=[2])
+
+    loose = sweep(grid, 5, processes=1, ci_tolerance=10, max_replicates=20)
+    tight = sweep(grid, 5, processes=1, ci_tolerance=0, max_replicates=20)
+
+    assert len(loose[0].turns) == 5
+    assert len(tight[0].turns) == 20
+
+
+def test_sweep_unfinished_runs():
+    """Runs that hit the turn limit are counted."""
+    grid = parameter_grid(human_count=[60], zombie_count=[1])
+
+    results = sweep(grid, 2, processes=1, max_turns=1)
+
+    assert results[0].turns == [1, 1]
+    assert results[0].unfinished == 2
+
+
+def test_sweep_numpy_engine():
+    """The NumPy engine can be swept over the pace parameters."""
+    pytest.importorskip("numpy")
+    grid = parameter_grid(width=[10], height=[10], human_paces=[1, 3])
+
+    results = sweep(grid, 2, engine="numpy", processes=1, max_turns=1000)
+
+    assert [len(result.turns) for result in results] == [2, 2]
+
+
+def test_sweep_unknown_parameter():
+    """Only the settings of a SimulationConfig can be swept."""
+    with pytest.raises(ValueError):
+        sweep(parameter_grid(speed=[1]), 1, processes=1)
+
+
+def test_sweep_object_engine_paces():
+    """The object engine can be swept over the pace parameters too."""
+    grid = parameter_grid(width=[10], height=[10], human_paces=[1, 3], zombie_paces=[1, 2])
+
+    results = sweep(grid, 2, processes=1, max_turns=1000)
+
+    assert [len(result.turns) for result in results] == [2, 2, 2, 2]
+
+
+def test_run_replicate_back_to_back():
+    """Invasions of different sizes run one after another in the same process don't affect each other."""
+    small = {"width": 8, "height": 6, "human_count": 10, "zombie_count": 2}
+    large = {"width": 30, "height": 25, "human_count": 80, "zombie_count": 4, "human_paces": 1}
+
+    first = run_replicate("object", small, seed=5)
+    run_replicate("object", large, seed=6)
+
+    assert run_replicate("object", small, seed=5) == first
@@ -0,0 +1,207 @@
+"""Tests for the NumPy Vectorized Engine."""
+import statistics
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from characters.human import Human
+from characters.zombie import Zombie
+from exceptions import InvalidCoordinateException
+from simulation.engine import SimulationEngine
+from simulation.vectorized import VectorizedEngine, HUMAN, ZOMBIE
+from ui.board import GameBoard
+
+
+def brute_force_distances(engine, zombies):
+    """The number of paces from each zombie to the nearest human, checking every human."""
+    humans = np.flatnonzero(engine.role == HUMAN)
+    return np.maximum(
+        np.abs(engine.x[zombies, None] - engine.x[None, humans]),
+        np.abs(engine.y[zombies, None] - engine.y[None, humans]),
+    ).min(axis=1)
+
+
+def test_populate():
+    """Check the engine places the requested number of humans and zombies, and zombies don't share squares."""
+    engine = VectorizedEngine(human_count=60, zombie_count=30, seed=1)
+    engine.populate()
+
+    assert engine.count_humans() == 60
+    assert engine.count_zombies() == 30
+    cells = set(zip(engine.x.tolist(), engine.y.tolist()))
+    zombie_cells = set(zip(engine.x[engine.role == ZOMBIE].tolist(), engine.y[engine.role == ZOMBIE].tolist()))
+    human_cells = set(zip(engine.x[engine.role == HUMAN].tolist(), engine.y[engine.role == HUMAN].tolist()))
+    assert len(zombie_cells) == 30
+    assert not zombie_cells & human_cells
+    assert len(cells) == len(zombie_cells) + len(human_cells)
+
+
+def test_populate_too_many_zombies():
+    """There must be an empty square for every zombie."""
+    engine = VectorizedEngine(width=2, height=2, human_count=0, zombie_count=5, seed=1)
+
+    with pytest.raises(InvalidCoordinateException):
+        engine.populate()
+
+
+def test_add_characters_invalid_location():
+    """Characters can't be placed off the grid."""
+    engine = VectorizedEngine(width=5, height=5, seed=1)
+
+    with pytest.raises(InvalidCoordinateException):
+        engine.add_characters([5], [0], [HUMAN])
+
+
+@pytest.mark.parametrize(("human_count", "zombie_count"), [[50, 5], [5, 400]])
+def test_nearest_humans(human_count, zombie_count):
+    """
+    The nearest human found for every zombie is the same distance away as the nearest found by checking every human.
+
+    With a few zombies each one searches the squares around it, with lots of zombies they share a distance field.
+    """
+    engine = VectorizedEngine(width=30, height=30, human_count=human_count, zombie_count=zombie_count, seed=4)
+    engine.populate()
+    zombies = np.flatnonzero(engine.role == ZOMBIE)
+
+    distance, nearest = engine._nearest_humans(zombies)
+
+    assert (distance == brute_force_distances(engine, zombies)).all()
+    assert (engine.role[nearest] == HUMAN).all()
+    assert (np.maximum(np.abs(engine.x[nearest] - engine.x[zombies]),
+                       np.abs(engine.y[nearest] - engine.y[zombies])) == distance).all()
+
+
+def test_humans_stay_on_grid():
+    """A human stops at the edge of the grid, otherwise a human walks HUMAN_PACES paces."""
+    engine = VectorizedEngine(width=5, height=5, human_count=200, zombie_count=0, seed=2, human_paces=3)
+    engine.populate()
+
+    for _ in range(10):
+        x, y = engine.x.copy(), engine.y.copy()
+        engine.commence_turn()
+        assert ((engine.x >= 0) & (engine.x < 5) & (engine.y >= 0) & (engine.y < 5)).all()
+        paces = np.maximum(np.abs(engine.x - x), np.abs(engine.y - y))
+        assert (paces <= 3).all()
+        # A human that walked fewer paces stopped at the edge
+        short = paces < 3
+        assert ((engine.x[short] == 0) | (engine.x[short] == 4) | (engine.y[short] == 0) | (engine.y[short] == 4)).all()
+
+
+def test_zombie_catches_human():
+    """A zombie walks towards the nearest human and turns it into a zombie when it reaches its square."""
+    engine = VectorizedEngine(width=10, height=10, seed=1, human_paces=0)
+    engine.add_characters([2, 8], [2, 8], [HUMAN, ZOMBIE])
+
+    for expected in range(7, 2, -1):
+        engine.commence_turn()
+        assert (engine.x[1], engine.y[1]) == (expected, expected)
+        assert engine.target[1] == 0
+
+    engine.commence_turn()
+    assert engine.count_humans() == 0
+    assert engine.is_over()
+
+
+@pytest.mark.parametrize("engine_name", ["numpy", "striped"])
+def test_zombie_stops_at_the_edge(engine_name):
+    """A zombie walking more paces than fit before the edge walks as far as it can, as it does on the object board."""
+    from simulation.config import SimulationConfig
+    from simulation.striped import StripedEngine
+
+    config = SimulationConfig(width=10, height=10, human_count=0, zombie_count=0, human_paces=0, zombie_paces=3)
+    board = GameBoard(config=config)
+    board.add_character(Human(location=[0, 5]))
+    board.add_character(Zombie(location=[1, 5]))
+    reference = SimulationEngine(board, seed=1)
+    reference.commence_turn()
+    assert board.count_humans() == 0
+    assert board.find_character_location(board.character_list[1]) == (0, 5)
+
+    if engine_name == "numpy":
+        engine = VectorizedEngine(seed=1, config=config)
+    else:
+        engine = StripedEngine(seed=1, config=config, workers=1)
+    engine.add_characters([0, 1], [5, 5], [HUMAN, ZOMBIE])
+    engine.commence_turn()
+
+    assert (engine.x[1], engine.y[1]) == (0, 5)
+    assert engine.count_humans() == 0
+    if engine_name == "striped":
+        engine.close()
+
+
+def test_human_walks_into_zombie():
+    """A human that walks into a zombie's square becomes a zombie, and doesn't move as a zombie that turn."""
+    engine = VectorizedEngine(width=3, height=3, seed=1, human_paces=1)
+    # The human is surrounded by zombies so wherever it walks it is caught
+    x, y = zip(*[(1, 1)] + [(i, j) for i in range(3) for j in range(3) if (i, j) != (1, 1)])
+    engine.add_characters(x, y, [HUMAN] + [ZOMBIE] * 8)
+
+    engine.commence_turn()
+
+    assert engine.count_humans() == 0
+    assert (engine.x[0], engine.y[0]) != (1, 1)
+
+
+def test_zombies_do_not_share_squares():
+    """However crowded the board gets a zombie never walks into a square holding another zombie."""
+    engine = VectorizedEngine(width=20, height=20, human_count=40, zombie_count=40, seed=9)
+    engine.populate()
+
+    while not engine.is_over():
+        zombies = np.flatnonzero(engine.role == ZOMBIE)
+        x, y = engine.x.copy(), engine.y.copy()
+        engine.commence_turn()
+
+        # Humans that are caught share a square with the zombie that caught them, so only the squares that zombies
+        # walked into are checked
+        cells = engine.x[zombies] * engine.height + engine.y[zombies]
+        moved = (engine.x[zombies] != x[zombies]) | (engine.y[zombies] != y[zombies])
+        for cell in cells[moved]:
+            assert np.count_nonzero(cells == cell) == 1
+        assert engine.turn_count < 1000
+
+
+def test_seeded_runs_are_repeatable():
+    """Two runs with the same seed take the same number of turns."""
+    results = []
+    for _ in range(2):
+        engine = VectorizedEngine(width=30, height=30, human_count=50, zombie_count=2, seed=42)
+        engine.populate()
+        results.append(engine.run(max_turns=10000))
+
+    assert results[0] == results[1]
+
+
+def test_from_board():
+    """An engine can carry on from where an object based board is."""
+    board = GameBoard(width=10, height=10)
+    human = Human(location=[1, 2])
+    zombie = Zombie(location=[5, 6])
+    board.add_character(human)
+    board.add_character(zombie)
+    zombie.target = human
+
+    engine = VectorizedEngine.from_board(board)
+
+    assert engine.x.tolist() == [1, 5]
+    assert engine.y.tolist() == [2, 6]
+    assert engine.role.tolist() == [HUMAN, ZOMBIE]
+    assert engine.target.tolist() == [-1, 0]
+
+
+def test_same_rules_as_reference_board():
+    """On the default board the invasion takes about as many turns as it does with the object based board."""
+    vectorized_turns = []
+    reference_turns = []
+    for seed in range(20):
+        engine = VectorizedEngine(seed=seed)
+        engine.populate()
+        vectorized_turns.append(engine.run(max_turns=2000))
+
+        reference = SimulationEngine(seed=seed)
+        reference.populate()
+        reference_turns.append(reference.run(max_turns=2000))
+
+    assert statistics.mean(vectorized_turns) == pytest.approx(statistics.mean(reference_turns), rel=0.25)
@@ -0,0 +1,110 @@
+"""Tests for the Wall Map."""
+import random
+
+import pytest
+
+from simulation.spatial import pace_distance
+from simulation.walls import WallMap, bresenham
+
+
+@pytest.mark.parametrize(
+    ("start", "end"),
+    [
+        [(0, 0), (5, 0)],
+        [(0, 0), (0, -4)],
+        [(2, 2), (7, 7)],
+        [(7, 1), (0, 4)],
+        [(3, 3), (3, 3)],
+    ]
+)
+def test_bresenham_takes_a_pace_at_a_time(start, end):
+    """A line runs from start to end, and every cell on it is a single pace from the one before."""
+    cells = list(bresenham(start, end))
+
+    assert cells[0] == start
+    assert cells[-1] == end
+    assert len(cells) == pace_distance(start, end) + 1
+    assert all(pace_distance(a, b) == 1 for a, b in zip(cells, cells[1:]))
+
+
+def test_walls_are_packed_into_bits():
+    """Every cell takes a single bit."""
+    walls = WallMap(100, 30)
+    walls.add(0, 0)
+    walls.add(99, 29)
+    walls.add(50, 10)
+    walls.add(50, 10)
+
+    assert len(walls.bits) == 375
+    assert len(walls) == 3
+    assert walls.is_wall(50, 10)
+    assert not walls.is_wall(50, 11)
+    assert sorted(walls) == [(0, 0), (50, 10), (99, 29)]
+
+    walls.remove(50, 10)
+    assert len(walls) == 2
+    assert not walls.is_wall(50, 10)
+
+
+def test_load():
+    """A map can be loaded from the bits of another."""
+    rng = random.Random(2)
+    walls = WallMap(13, 7)
+    for _ in range(20):
+        walls.add(rng.randrange(13), rng.randrange(7))
+
+    copy = WallMap(13, 7)
+    copy.load(walls.bits)
+
+    assert len(copy) == len(walls)
+    assert sorted(copy) == sorted(walls)
+
+
+def test_line_of_sight():
+    """Only a wall between the two cells blocks the view."""
+    walls = WallMap(10, 10)
+    walls.add(5, 5)
+
+    assert not walls.line_of_sight((3, 3), (7, 7))
+    assert not walls.line_of_sight((5, 0), (5, 9))
+    assert walls.line_of_sight((3, 4), (7, 4))
+    # A wall at either end doesn't block the view
+    assert walls.line_of_sight((5, 5), (8, 8))
+    assert walls.line_of_sight((2, 2), (5, 5))
+
+
+def test_line_of_sight_is_symmetric():
+    """A cell can be seen from another exactly when the other can be seen from it."""
+    rng = random.Random(5)
+    walls = WallMap(20, 20)
+    for _ in range(60):
+        walls.add(rng.randrange(20), rng.randrange(20))
+
+    for _ in range(500):
+        a = (rng.randrange(20), rng.randrange(20))
+        b = (rng.randrange(20), rng.randrange(20))
+        assert walls.line_of_sight(a, b) == walls.line_of_sight(b, a)
+
+
+def test_line_of_sight_is_cached():
+    """Asking again, either way round, is answered from the cache until the walls change."""
+    walls = WallMap(10, 10)
+    walls.add(5, 5)
+
+    assert not walls.line_of_sight((3, 3), (7, 7))
+    assert not walls.line_of_sight([7, 7], [3, 3])
+    assert walls.cache_info().hits == 1
+
+    walls.remove(5, 5)
+    assert walls.cache_info().currsize == 0
+    assert walls.line_of_sight((3, 3), (7, 7))
+
+
+def test_line_of_sight_cache_is_bounded():
+    """The cache never holds more pairs than its size."""
+    walls = WallMap(10, 10, cache_size=8)
+    for x in range(10):
+        for y in range(10):
+            walls.line_of_sight((0, 0), (x, y))
+
+    assert walls.cache_info().currsize == 8
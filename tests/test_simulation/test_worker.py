@@ -0,0 +1,129 @@
+"""Tests for running an invasion on a background worker."""
+import threading
+import time
+
+import pytest
+
+from simulation.board import Board
+from simulation.engine import SimulationEngine
+from simulation.replay import board_state
+from simulation.scheduler import TurnScheduler, STOPPED
+from simulation.worker import Frame, SimulationWorker
+
+
+def scheduler(turns_per_frame=1, seed=3):
+    """A scheduler fast-forwarding a small invasion."""
+    engine = SimulationEngine(Board(width=20, height=20), human_count=40, zombie_count=3, seed=seed)
+    engine.populate()
+    return TurnScheduler(engine, turns_per_frame=turns_per_frame)
+
+
+def wait_for(condition, timeout=5):
+    """Wait until a condition is true, failing the test if it takes too long."""
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_frame_is_a_snapshot():
+    """A frame holds the board as it was when it was taken, and can't be changed."""
+    turns = scheduler()
+    frame = Frame.capture(turns)
+    state = board_state(turns.engine.board)
+
+    turns.engine.commence_turn()
+
+    assert frame.turn == 0
+    assert dict(frame.state) == state
+    assert (frame.humans, frame.zombies, frame.conversions, frame.over) == (40, 3, None, False)
+    with pytest.raises(AttributeError):
+        frame.turn = 1
+    with pytest.raises(TypeError):
+        frame.state[0] = (0, 0, 0)
+
+
+def test_worker_publishes_frames():
+    """The worker runs turns on its own thread and publishes a frame of the board after them."""
+    turns = scheduler()
+    worker = SimulationWorker(turns, tick=0.001)
+    assert worker.latest().turn == 0
+
+    worker.start()
+    wait_for(lambda: worker.latest().turn >= 5)
+    worker.submit(TurnScheduler.pause)
+    wait_for(lambda: worker.latest().description.startswith("paused"))
+    worker.stop()
+
+    frame = worker.latest()
+    assert frame.turn == turns.engine.turn_count
+    assert dict(frame.state) == board_state(turns.engine.board)
+
+
+def test_commands_run_between_turns():
+    """Commands are run on the worker thread, and stepping a paused invasion publishes the turn."""
+    turns = scheduler()
+    turns.pause()
+    threads = []
+    worker = SimulationWorker(turns, tick=0.001)
+    worker.start()
+
+    worker.submit(lambda scheduler: threads.append(threading.current_thread()))
+    worker.submit(TurnScheduler.step)
+    wait_for(lambda: worker.latest().turn == 1)
+    worker.stop()
+
+    assert len(threads) == 1 and threads[0] is not threading.main_thread()
+    assert turns.engine.turn_count == 1
+
+
+def test_latest_does_not_wait_for_a_slow_turn():
+    """The latest frame can be read while a slow turn is being run."""
+    turns = scheduler()
+    started = threading.Event()
+    release = threading.Event()
+    commence_turn = turns.engine.commence_turn
+
+    def slow_turn():
+        started.set()
+        release.wait(5)
+        commence_turn()
+
+    turns.engine.commence_turn = slow_turn
+    worker = SimulationWorker(turns, tick=0.001)
+    worker.start()
+    started.wait(5)
+
+    start = time.perf_counter()
+    frame = worker.latest()
+    worker.submit(TurnScheduler.pause)
+    assert time.perf_counter() - start < 0.05
+    assert frame.turn == 0
+
+    release.set()
+    wait_for(lambda: worker.latest().description.startswith("paused"))
+    worker.stop()
+    assert worker.latest().turn == 1
+
+
+def test_on_update_and_errors():
+    """on_update is called after every update, and an error on the worker thread is raised by check."""
+    turns = scheduler(turns_per_frame=100)
+    over = []
+
+    def on_update(scheduler):
+        if scheduler.engine.is_over() and not over:
+            over.append(scheduler.engine.turn_count)
+            scheduler.stop()
+
+    worker = SimulationWorker(turns, tick=0.001, on_update=on_update)
+    worker.start()
+    wait_for(lambda: worker.latest().over and worker.latest().description.startswith(STOPPED))
+    assert worker.latest().turn == over[0]
+
+    def fail(scheduler):
+        raise ValueError("broken")
+
+    worker.submit(fail)
+    with pytest.raises(ValueError):
+        worker.stop()
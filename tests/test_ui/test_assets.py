@@ -0,0 +1,70 @@
+from unittest.mock import patch
+
+import pygame
+import pytest
+
+from characters.human import Human
+from characters.zombie import Zombie
+from ui.assets import SpriteAtlas
+
+
+@pytest.fixture
+def atlas():
+    return SpriteAtlas()
+
+
+def test_image_is_loaded_once(atlas):
+    """Every character drawn with an image shares the one copy loaded from disk."""
+    with patch("pygame.image.load", wraps=pygame.image.load) as load:
+        first = atlas.image("assets/character-zombie.png")
+        second = atlas.image("assets/character-zombie.png")
+
+    assert first is second
+    assert load.call_count == 1
+
+
+def test_scaled_image_is_cached(atlas):
+    """Scaled images are only rebuilt when the size they're drawn at changes."""
+    small = atlas.scaled("assets/character-zombie.png", 20)
+
+    assert atlas.scaled("assets/character-zombie.png", 20) is small
+
+    large = atlas.scaled("assets/character-zombie.png", 40)
+
+    assert large is not small
+    assert max(large.get_size()) == 40
+
+
+@pytest.mark.parametrize("path", ["assets/character-human1.png", "assets/character-base.jpg"])
+def test_scaled_image_keeps_aspect_ratio(atlas, path):
+    """Images are scaled to fit the square without being stretched."""
+    original = atlas.image(path)
+    scaled = atlas.scaled(path, 30)
+
+    assert max(scaled.get_size()) == 30
+    assert scaled.get_width() / scaled.get_height() == pytest.approx(
+        original.get_width() / original.get_height(), rel=0.1
+    )
+
+
+def test_paths_are_cached(atlas):
+    """The asset directory is only searched the first time a pattern is used."""
+    with patch("glob.glob", return_value=["assets/character-human1.png"]) as search:
+        atlas.paths("assets/character-human*")
+        paths = atlas.paths("assets/character-human*")
+
+    assert paths == ["assets/character-human1.png"]
+    assert search.call_count == 1
+
+
+@pytest.mark.parametrize(("character", "expected", "not_expected"), [
+    (Human, ["assets/character-human1.png", "assets/character-human2.png"],
+     ["assets/character-base.jpg", "assets/character-zombie.png"]),
+    (Zombie, ["assets/character-zombie.png"], ["assets/character-base.jpg", "assets/character-human1.png"]),
+])
+def test_character_images(atlas, character, expected, not_expected):
+    """Each kind of character is drawn with its own images and not with anyone else's."""
+    paths = atlas.paths(character.image_pattern)
+
+    assert all(path in paths for path in expected)
+    assert not any(path in paths for path in not_expected)
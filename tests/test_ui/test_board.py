@@ -6,7 +6,9 @@ import pytest
 import pygame
 
 from characters.human import Human
+from characters.roles import HUMAN, ZOMBIE
 from characters.zombie import Zombie
+from simulation.config import DIRECTIONS, SimulationConfig
 from ui.board import GameBoard
 from exceptions import InvalidCoordinateException, CharacterNotFoundException
 
@@ -47,15 +49,13 @@ def test_character_grid_setup(mock_screen, X, Y):
       [],[],[],[],[],[],[],[],[],[],
     ]
     """
-    with patch("ui.board.GRID_WIDTH", X):
-        with patch("ui.board.GRID_HEIGHT", Y):
-            board = GameBoard(screen=mock_screen)
+    board = GameBoard(screen=mock_screen, config=SimulationConfig(width=X, height=Y))
 
-            # there should be X 'columns' to the grid
-            assert len(board.character_grid) == X
-            # and each 'columns' should have Y rows
-            for col in board.character_grid:
-                assert len(col) == Y
+    # there should be X 'columns' to the grid
+    assert len(board.character_grid) == X
+    # and each 'columns' should have Y rows
+    for col in board.character_grid:
+        assert len(col) == Y
 
 def test_add_character(mock_screen):
     """
@@ -98,13 +98,11 @@ def test_location_to_screen_coordinates(mock_screen):
     Args:
         mock_screen (Mock): A mocked screen object.
     """
-    with patch("ui.board.GRID_WIDTH", 9):
-        with patch("ui.board.GRID_HEIGHT", 9):
-            board = GameBoard(screen=mock_screen)
-            # Remember grid indexing starts at 0, so the middle grid square is at index 4, not 5
-            result = board.location_to_screen_coordinates(location=(4,4))
+    board = GameBoard(screen=mock_screen, config=SimulationConfig(width=9, height=9))
+    # Remember grid indexing starts at 0, so the middle grid square is at index 4, not 5
+    result = board.location_to_screen_coordinates(location=(4,4))
 
-            assert result == (640, 360)
+    assert result == (640, 360)
 
 def test_move_character(mock_screen):
     """
@@ -142,16 +140,14 @@ def test_move_character_out_of_bounds_positive(mock_screen):
     Args:
         mock_screen (Mock): A mocked screen object.
     """
-    with patch("ui.board.GRID_WIDTH", 6):
-        with patch("ui.board.GRID_HEIGHT", 6):
-            board = GameBoard(screen=mock_screen)
-            character = Human(location=[5,5])
-            board.add_character(character)
+    board = GameBoard(screen=mock_screen, config=SimulationConfig(width=6, height=6))
+    character = Human(location=[5,5])
+    board.add_character(character)
 
-            character.location = (7,7)
+    character.location = (7,7)
 
-            with pytest.raises(InvalidCoordinateException):
-                board.move_character(character)
+    with pytest.raises(InvalidCoordinateException):
+        board.move_character(character)
 
     # It should still be in the old location
     assert board.character_grid[5][5] == [character]
@@ -169,16 +165,14 @@ def test_move_character_out_of_bounds_negative(mock_screen):
     Args:
         mock_screen (Mock): A mocked screen object.
     """
-    with patch("ui.board.GRID_WIDTH", 6):
-        with patch("ui.board.GRID_HEIGHT", 6):
-            board = GameBoard(screen=mock_screen)
-            character = Human(location=[5,5])
-            board.add_character(character)
+    board = GameBoard(screen=mock_screen, config=SimulationConfig(width=6, height=6))
+    character = Human(location=[5,5])
+    board.add_character(character)
 
-            character.location = (-1,-1)
+    character.location = (-1,-1)
 
-            with pytest.raises(InvalidCoordinateException):
-                board.move_character(character)
+    with pytest.raises(InvalidCoordinateException):
+        board.move_character(character)
 
     # It should still be in the old location
     assert board.character_grid[5][5] == [character]
@@ -226,6 +220,18 @@ def test_add_character_invalid_location():
         board.add_character(human)
 
 
+@pytest.mark.parametrize("location", [(10, 0), (9, 12), (0, 10)])
+def test_zombie_placed_just_off_the_board(location):
+    """A zombie placed just past the right or bottom edge of the grid is refused, not added off the board."""
+    board = GameBoard(width=10, height=10)
+
+    with pytest.raises(InvalidCoordinateException):
+        board.add_character(Zombie(location=location), is_initial_placement=True)
+
+    assert board.character_list == []
+    assert board.count_zombies() == 0
+
+
 def test_space_sharing_humans():
     """Test that humans can share space with other humans."""
     screen = MagicMock()
@@ -306,13 +312,10 @@ def test_convert_human_to_zombie():
     # Convert the human to a zombie
     zombie = board._convert_human_to_zombie(human)
     
-    # Check that the human is removed
-    assert human not in board.character_list
-    assert human not in board.character_grid[5][5]
-    
-    # Check that the zombie is added
-    assert zombie in board.character_list
-    assert zombie in board.character_grid[5][5]
+    # Check that the human has become the zombie, in its place on the board
+    assert zombie is human
+    assert board.character_list == [zombie]
+    assert board.character_grid[5][5] == [zombie]
     assert isinstance(zombie, Zombie)
     assert zombie.location == (5, 5)
 
@@ -336,8 +339,8 @@ def test_zombie_moves_to_human():
     board.move_character(zombie)
     
     # Check that the human is converted to a zombie
-    assert human not in board.character_list
-    assert human not in board.character_grid[5][5]
+    assert isinstance(human, Zombie)
+    assert human in board.character_grid[5][5]
     assert len(board.character_grid[5][5]) == 2  # Both zombies should be there
     assert all(isinstance(char, Zombie) for char in board.character_grid[5][5])
 
@@ -361,8 +364,9 @@ def test_human_moves_to_zombie():
     board.move_character(human)
     
     # Check that the human is converted to a zombie
-    assert human not in board.character_list
-    assert human not in board.character_grid[6][6]
+    assert isinstance(human, Zombie)
+    assert human in board.character_grid[6][6]
+    assert board.character_grid[5][5] == []
     assert len(board.character_grid[6][6]) == 2  # Both zombies should be there
     assert all(isinstance(char, Zombie) for char in board.character_grid[6][6])
 
@@ -388,8 +392,8 @@ def test_multiple_humans_convert_to_zombies():
     board.move_character(zombie)
     
     # Check that both humans are converted to zombies
-    assert human1 not in board.character_list
-    assert human2 not in board.character_list
+    assert isinstance(human1, Zombie)
+    assert isinstance(human2, Zombie)
     assert len(board.character_grid[5][5]) == 3  # All three zombies should be there
     assert all(isinstance(char, Zombie) for char in board.character_grid[5][5])
 
@@ -453,3 +457,370 @@ def test_count_characters():
     # Check updated counts
     assert board.count_humans() == 1
     assert board.count_zombies() == 4
+
+
+def test_find_character_location_after_move(mock_screen):
+    """The location of a character is kept up to date as it moves around the board."""
+    board = GameBoard(screen=mock_screen)
+    human = Human(location=[5, 5])
+    board.add_character(human)
+
+    human.location = [7, 8]
+    board.move_character(human)
+
+    assert board.find_character_location(human) == (7, 8)
+
+
+def test_find_character_location_after_failed_move(mock_screen):
+    """A move that is not allowed does not change the recorded location of a character."""
+    board = GameBoard(screen=mock_screen)
+    zombie1 = Zombie(location=[5, 5])
+    zombie2 = Zombie(location=[6, 6])
+    board.add_character(zombie1)
+    board.add_character(zombie2)
+
+    zombie1.location = [6, 6]
+    with pytest.raises(InvalidCoordinateException):
+        board.move_character(zombie1)
+
+    assert board.find_character_location(zombie1) == (5, 5)
+
+
+def test_find_character_location_after_conversion(mock_screen):
+    """A converted human can be found where it was, and anything hunting it still refers to it."""
+    board = GameBoard(screen=mock_screen)
+    human = Human(location=[5, 5])
+    hunter = Zombie(location=[7, 7])
+    board.add_character(human)
+    board.add_character(hunter)
+    hunter.target = human
+
+    zombie = board._convert_human_to_zombie(human)
+
+    assert board.find_character_location(zombie) == (5, 5)
+    assert hunter.target is zombie
+    assert zombie.target is None
+    assert board.nearest_characters((7, 7), HUMAN) == (None, [])
+    assert board.nearest_characters((7, 7), ZOMBIE)[1] == [hunter]
+
+
+def test_character_locations_match_grid():
+    """After a number of turns every character is recorded in the cell of the grid that holds it."""
+    board = GameBoard(width=10, height=10)
+    for x in range(10):
+        board.add_character(Human(location=[x, x]))
+    board.add_character(Zombie(location=[0, 9]), is_initial_placement=True)
+
+    for _ in range(5):
+        board.commence_turn()
+
+    assert set(board.character_locations) == set(board.character_list)
+    for character, (x, y) in board.character_locations.items():
+        assert character in board.character_grid[x][y]
+
+
+def test_nearest_characters_follows_moves(mock_screen):
+    """Spatial queries on the board reflect characters moving and being converted."""
+    board = GameBoard(screen=mock_screen)
+    human = Human(location=[5, 5])
+    zombie = Zombie(location=[20, 5])
+    board.add_character(human)
+    board.add_character(zombie)
+
+    assert board.nearest_characters((19, 5), HUMAN) == (14, [human])
+
+    human.location = [18, 5]
+    board.move_character(human)
+    assert board.nearest_characters((19, 5), HUMAN) == (1, [human])
+    assert set(board.adjacent_characters((19, 5))) == {human, zombie}
+
+    zombie.location = [18, 5]
+    board.move_character(zombie)
+    assert board.nearest_characters((19, 5), HUMAN) == (None, [])
+    assert len(board.characters_within((19, 5), 1, ZOMBIE)) == 2
+
+
+def test_distance_field():
+    """With enough zombies the board builds a distance field from the humans that every zombie shares."""
+    board = GameBoard(width=10, height=10)
+    board.distance_field_cells_per_zombie = 1000
+    human = Human(location=[2, 2])
+    zombie = Zombie(location=[8, 5])
+    board.add_character(human)
+    board.add_character(zombie)
+
+    field = board.distance_field()
+
+    assert field.distance_at((8, 5)) == 6
+    assert field.label_at((8, 5)) is human
+    # The same field is used until the board changes
+    assert board.distance_field() is field
+
+    human.location = [5, 5]
+    board.move_character(human)
+    assert board.distance_field().distance_at((8, 5)) == 3
+
+
+def test_distance_field_too_few_zombies():
+    """Without enough zombies to make it worthwhile no distance field is built."""
+    board = GameBoard(width=10, height=10)
+    board.add_character(Human(location=[2, 2]))
+    board.add_character(Zombie(location=[8, 5]))
+
+    assert board.distance_field() is None
+
+
+def test_walls_block_placement():
+    """Nothing can be placed in a wall, and a wall can't be put where a character is standing."""
+    board = GameBoard(width=10, height=10)
+    board.add_walls((2, 0), (2, 9))
+    board.add_character(Human(location=[5, 5]))
+
+    assert len(board.walls) == 10
+    with pytest.raises(InvalidCoordinateException):
+        board.add_character(Human(location=[2, 4]))
+    with pytest.raises(InvalidCoordinateException):
+        board.add_wall((5, 5))
+    with pytest.raises(InvalidCoordinateException):
+        board.add_walls((4, 5), (6, 5))
+    assert not board.walls.is_wall(4, 5)
+
+
+def test_walk_stops_at_a_wall():
+    """A walk goes a pace at a time and stops before the first pace that would leave the grid or hit a wall."""
+    board = GameBoard(width=10, height=10)
+    board.add_wall((5, 2))
+
+    assert board.walk((2, 2), (5, 2)) == (4, 2)
+    assert board.walk((4, 2), (7, 2)) == (4, 2)
+    assert board.walk((1, 1), (-2, -2)) == (0, 0)
+    assert board.walk((2, 5), (5, 5)) == (5, 5)
+
+
+def test_move_character_cannot_pass_through_a_wall():
+    """A move whose destination is clear but whose path crosses a wall is refused."""
+    board = GameBoard(width=10, height=10)
+    board.add_wall((4, 2))
+    human = Human(location=[3, 2])
+    board.add_character(human)
+
+    human.location = [6, 2]
+    with pytest.raises(InvalidCoordinateException):
+        board.move_character(human)
+    assert board.find_character_location(human) == (3, 2)
+
+
+def test_human_forfeits_paces_after_a_wall():
+    """A human stops at the last cell before a wall and the rest of its paces are forfeit."""
+    board = GameBoard(width=10, height=10)
+    board.add_wall((4, 2))
+    human = Human(location=[2, 2])
+    human.movement_direction = Mock(return_value="E")
+    board.add_character(human)
+
+    human.commence_turn(board)
+
+    assert human.location == (3, 2)
+    assert board.find_character_location(human) == (3, 2)
+
+
+@pytest.mark.parametrize("cells_per_zombie", [0, 1000])
+def test_zombie_walks_around_a_wall(cells_per_zombie):
+    """A zombie finds its way around a wall to the human on the other side of it."""
+    board = GameBoard(width=10, height=10)
+    board.distance_field_cells_per_zombie = cells_per_zombie
+    board.add_walls((5, 0), (5, 7))
+    human = Human(location=[8, 2])
+    zombie = Zombie(location=[2, 2])
+    board.add_character(human)
+    board.add_character(zombie)
+
+    for _ in range(20):
+        zombie.commence_turn(board)
+        assert not board.walls.is_wall(*board.find_character_location(zombie))
+        if board.count_humans() == 0:
+            break
+
+    assert board.count_humans() == 0
+
+
+def test_few_zombies_do_not_build_a_field_for_walls():
+    """A wall doesn't make a board with few zombies build a distance field over every cell."""
+    board = GameBoard(width=200, height=200)
+    board.add_wall((100, 100))
+    human = Human(location=[10, 14])
+    zombie = Zombie(location=[10, 10])
+    board.add_character(human)
+    board.add_character(zombie)
+
+    assert board.distance_field() is None
+    assert zombie._find_nearest_human(board) == (10, 14)
+    assert zombie.target is human
+
+
+def test_line_of_sight():
+    """A wall between two cells breaks the line of sight."""
+    board = GameBoard(width=10, height=10)
+    board.add_wall((5, 5))
+
+    assert not board.line_of_sight((3, 5), (8, 5))
+    assert board.line_of_sight((3, 4), (8, 4))
+
+
+def test_role_counts_follow_the_characters():
+    """The count of each role in every cell is kept in step with the characters in it."""
+    from characters.roles import HUMAN, ZOMBIE
+
+    board = GameBoard(width=10, height=10)
+    human = Human(location=[2, 2])
+    other_human = Human(location=[2, 2])
+    zombie = Zombie(location=[4, 4])
+    for character in (human, other_human, zombie):
+        board.add_character(character)
+
+    assert board.role_count_at((2, 2), HUMAN) == 2
+    assert board.role_count_at((4, 4), ZOMBIE) == 1
+
+    human.location = [3, 3]
+    board.move_character(human)
+    assert board.role_count_at((2, 2), HUMAN) == 1
+    assert board.role_count_at((3, 3), HUMAN) == 1
+
+    zombie.location = [3, 3]
+    board.move_character(zombie)
+    assert board.role_count_at((3, 3), HUMAN) == 0
+    assert board.role_count_at((3, 3), ZOMBIE) == 2
+    assert board.role_count_at((4, 4), ZOMBIE) == 0
+
+    for x in range(10):
+        for y in range(10):
+            for role in (HUMAN, ZOMBIE):
+                expected = sum(1 for character in board.character_grid[x][y] if character.role == role)
+                assert board.role_count_at((x, y), role) == expected
+
+
+def test_population_is_counted_as_characters_come_and_go():
+    """The board keeps count of its humans and zombies as they are added, converted and killed."""
+    board = GameBoard(width=10, height=10)
+    humans = [Human(location=[x, 1]) for x in range(4)]
+    zombie = Zombie(location=[0, 2])
+    for character in humans + [zombie]:
+        board.add_character(character)
+    assert (board.count_humans(), board.count_zombies()) == (4, 1)
+
+    zombie.location = [0, 1]
+    board.move_character(zombie)
+    assert (board.count_humans(), board.count_zombies(), board.conversions) == (3, 2, 1)
+
+    board.kill_character(zombie)
+    assert (board.count_humans(), board.count_zombies(), board.kills) == (3, 1, 1)
+    assert zombie not in board.character_list
+    assert board.character_grid[0][1] == [character for character in board.character_list if character.id == 0]
+    with pytest.raises(CharacterNotFoundException):
+        board.kill_character(zombie)
+
+
+def test_every_character_decides_once_per_turn():
+    """However many conversions a turn brings, every character takes exactly one turn."""
+    board = GameBoard(width=10, height=10)
+    for x in range(10):
+        board.add_character(Human(location=[x, x]))
+    board.add_character(Zombie(location=[0, 9]), is_initial_placement=True)
+    board.add_character(Zombie(location=[9, 0]), is_initial_placement=True)
+
+    for _ in range(5):
+        roles = {character: character.role for character in board.character_list}
+        decided = []
+        for character in board.character_list:
+            decide = type(character).decide
+            character.decide = lambda board, *args, character=character, decide=decide: (
+                decided.append(character) or decide(character, board, *args)
+            )
+        board.commence_turn()
+        for character in board.character_list:
+            del character.decide
+
+        # Humans caught during the turn took their turn as humans, and not again as zombies
+        assert sorted(decided, key=lambda character: character.id) == sorted(roles, key=lambda character: character.id)
+
+
+def test_zombies_walking_into_the_same_square():
+    """Of two zombies walking into the same empty square only the first to decide gets there."""
+    board = GameBoard(width=10, height=10)
+    first = Zombie(location=[2, 2])
+    second = Zombie(location=[4, 2])
+    board.add_character(first)
+    board.add_character(second)
+    first.decide = Mock(return_value=(3, 2))
+    second.decide = Mock(return_value=(3, 2))
+
+    board.commence_turn()
+
+    assert board.find_character_location(first) == (3, 2)
+    assert board.find_character_location(second) == (4, 2)
+    assert second.location == (4, 2)
+
+
+def test_zombie_cannot_follow_a_zombie():
+    """A zombie can't walk into a square that held a zombie before anyone walked, even if that zombie walks away."""
+    board = GameBoard(width=10, height=10)
+    leader = Zombie(location=[3, 2])
+    follower = Zombie(location=[2, 2])
+    board.add_character(follower)
+    board.add_character(leader)
+    follower.decide = Mock(return_value=(3, 2))
+    leader.decide = Mock(return_value=(4, 2))
+
+    board.commence_turn()
+
+    assert board.find_character_location(leader) == (4, 2)
+    assert board.find_character_location(follower) == (2, 2)
+
+
+def test_humans_walk_before_zombies_decide():
+    """Zombies hunt the humans where they are after the humans have walked, and catch them in one sweep."""
+    board = GameBoard(width=10, height=10)
+    human = Human(location=[5, 5])
+    other_human = Human(location=[5, 5])
+    zombie = Zombie(location=[7, 5])
+    for character in (human, other_human, zombie):
+        board.add_character(character)
+    human.decide = Mock(return_value=(6, 5))
+    other_human.decide = Mock(return_value=(6, 5))
+
+    board.commence_turn()
+
+    assert isinstance(human, Zombie)
+    assert isinstance(other_human, Zombie)
+    assert board.find_character_location(zombie) == (6, 5)
+    assert board.conversions == 2
+
+
+def test_human_directions_are_drawn_together():
+    """The directions of every human are drawn from the board's generator at once, at the start of their turn."""
+    board = GameBoard(width=30, height=30)
+    for x in range(20):
+        board.add_character(Human(location=[x, x]))
+    board.add_character(Zombie(location=[29, 0]), is_initial_placement=True)
+    board.random = Mock(wraps=board.random)
+
+    board.commence_turn()
+
+    board.random.choices.assert_called_once()
+    assert board.random.choices.call_args.kwargs["k"] == 20
+    # The zombie may still choose between humans, but no direction is drawn on its own
+    assert all(call.args[0] != DIRECTIONS for call in board.random.choice.call_args_list)
+
+
+def test_locations_are_tuples():
+    """Characters hold their location as an (x, y) tuple, however it was given, and keep it as one as they move."""
+    board = GameBoard(width=10, height=10)
+    human = Human(location=[4, 4])
+    board.add_character(human)
+
+    assert human.location == (4, 4)
+    previous = human.location
+    human.commence_turn(board)
+    assert isinstance(human.location, tuple)
+    assert human.previous_location is previous
+    assert board.find_character_location(human) == human.location
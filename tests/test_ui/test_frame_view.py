@@ -0,0 +1,101 @@
+"""Tests for the Frame View."""
+import pygame
+
+from characters.human import Human
+from characters.zombie import Zombie
+from simulation.board import Board
+from simulation.engine import SimulationEngine
+from simulation.scheduler import TurnScheduler
+from simulation.worker import Frame
+from ui.frame_view import FrameView
+
+
+def capture(board):
+    """A frame of a board, as the worker would publish it."""
+    return Frame.capture(TurnScheduler(SimulationEngine(board, human_count=0, zombie_count=0)))
+
+
+def test_view_draws_only_changed_cells():
+    """The first frame is drawn whole, after that only the cells whose occupants changed are drawn."""
+    board = Board(width=10, height=10)
+    board.add_walls((5, 0), (5, 3))
+    engine = SimulationEngine(board, human_count=10, zombie_count=2, seed=1)
+    engine.populate()
+    scheduler = TurnScheduler(engine)
+    view = FrameView(pygame.Surface((400, 300)), 10, 10)
+
+    view.show(Frame.capture(scheduler))
+    assert view.draw() == [view.screen.get_rect()]
+    # Showing the same frame again draws nothing
+    view.show(view.frame)
+    assert view.draw() == []
+
+    before = dict(view.frame.state)
+    engine.commence_turn()
+    view.show(Frame.capture(scheduler))
+    after = view.frame.state
+    changed = set()
+    for character_id in set(before) | set(after):
+        if before.get(character_id) != after.get(character_id):
+            changed |= {state[1:] for state in (before.get(character_id), after.get(character_id)) if state}
+
+    assert len(view.draw()) == len(changed)
+    assert all(ids == {character_id for character_id, state in after.items() if state[1:] == cell}
+               for cell, ids in view._cells.items())
+
+
+def test_view_redraws_the_cells_a_character_left_and_entered():
+    """After the first frame only the cells a character left or entered are drawn again."""
+    board = Board(width=10, height=10)
+    human = Human(location=[2, 2])
+    board.add_character(human)
+    board.add_character(Zombie(location=[8, 5]))
+    view = FrameView(pygame.Surface((400, 300)), 10, 10)
+    view.show(capture(board))
+    view.draw()
+
+    human.location = [3, 3]
+    board.move_character(human)
+    view.show(capture(board))
+    rects = view.draw()
+
+    assert sorted(rects) == sorted([view.layout.cell_rect(2, 2), view.layout.cell_rect(3, 3)])
+
+
+def test_drawing_changed_cells_matches_full_redraw():
+    """Redrawing only the changed cells leaves the screen looking the same as redrawing all of it."""
+    screen = pygame.Surface((400, 300))
+    board = Board(width=10, height=10)
+    human = Human(location=[2, 2])
+    board.add_character(human)
+    board.add_character(Zombie(location=[3, 3]))
+    view = FrameView(screen, 10, 10)
+    view.show(capture(board))
+    view.draw()
+
+    human.location = [5, 2]
+    board.move_character(human)
+    view.show(capture(board))
+    view.draw()
+    incremental = screen.copy()
+
+    view.layout.invalidate()
+    view.draw()
+
+    assert pygame.image.tobytes(incremental, "RGB") == pygame.image.tobytes(screen, "RGB")
+
+
+def test_walls_are_drawn():
+    """Walls are part of the background, which is drawn again when they change."""
+    from constants import WALL_COLOR
+
+    screen = pygame.Surface((400, 300))
+    board = Board(width=10, height=10)
+    view = FrameView(screen, 10, 10)
+    view.show(capture(board))
+    view.draw()
+    board.add_wall((4, 4))
+    view.show(capture(board))
+
+    assert view.draw() == [screen.get_rect()]
+    assert screen.get_at(tuple(int(value) for value in view.layout.screen_coordinates((4, 4))))[:3] == WALL_COLOR
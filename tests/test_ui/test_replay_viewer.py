@@ -0,0 +1,30 @@
+"""Tests for the Replay Viewer."""
+import pygame
+
+from simulation.engine import SimulationEngine
+from simulation.replay import Replay
+from ui.board import GameBoard
+from ui.replay_viewer import ReplayViewer
+
+
+def test_viewer_plays_and_seeks(tmp_path):
+    """The viewer steps through the replay, seeks to any turn and draws only the cells that changed."""
+    path = tmp_path / "run.replay"
+    engine = SimulationEngine(GameBoard(width=10, height=10), human_count=10, zombie_count=2, seed=1)
+    engine.populate()
+    recorder = engine.record(path, keyframe_interval=4)
+    engine.run(max_turns=10)
+    recorder.close()
+
+    replay = Replay(path)
+    viewer = ReplayViewer(pygame.Surface((400, 300)), replay)
+
+    assert viewer.draw() == [viewer.screen.get_rect()]
+    viewer.commence_turn()
+    assert viewer.turn_count == 1
+    assert 0 < len(viewer.draw()) <= 2 * 12
+
+    viewer.seek(100)
+    assert viewer.is_over()
+    assert viewer.stats() == {"turns": 10, **{key: value for key, value in engine.stats().items() if key != "turns"}}
+    replay.close()
@@ -0,0 +1,94 @@
+"""The images used to draw the characters."""
+import glob
+
+
+class SpriteAtlas:
+    """
+    A cache of every image used to draw characters, shared between all of them.
+
+    Each image is loaded from disk once and then kept scaled to the size characters are currently drawn at, so drawing
+    a character is a single blit.  The scaled images are only rebuilt when the size changes, such as when the window
+    is resized.
+    """
+    def __init__(self):
+        """Initialise an empty atlas."""
+        self.size = None
+        self._paths = {}
+        self._images = {}
+        self._scaled = {}
+
+    def paths(self, pattern):
+        """
+        The asset files matching a glob pattern.
+
+        Args:
+            pattern: The glob pattern, such as "assets/character-human*".
+
+        Returns:
+            list: The paths of the matching files, the disk is only searched the first time a pattern is used.
+        """
+        if pattern not in self._paths:
+            self._paths[pattern] = sorted(glob.glob(pattern))
+        return list(self._paths[pattern])
+
+    def image(self, path):
+        """
+        The full size image from an asset file.
+
+        Args:
+            path: The path of the asset file.
+
+        Returns:
+            pygame.Surface: The image, loaded from disk the first time it is asked for.
+        """
+        if path not in self._images:
+            import pygame
+
+            image = pygame.image.load(path)
+            # Converting the image to the pixel format of the display makes blitting it much faster, but can only be
+            # done once there is a display
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha()
+            self._images[path] = image
+        return self._images[path]
+
+    def rescale(self, size):
+        """
+        Scale every image that has been loaded to a new size.
+
+        Args:
+            size: The size of the square each image must fit in.
+        """
+        self.size = size
+        self._scaled = {path: self._scale(image, size) for path, image in self._images.items()}
+
+    def scaled(self, path, size):
+        """
+        The image from an asset file scaled to fit within a square.
+
+        Args:
+            path: The path of the asset file.
+            size: The size of the square the image must fit in.
+
+        Returns:
+            pygame.Surface: The scaled image, shared by every character drawn with it.
+        """
+        if size != self.size:
+            self.rescale(size)
+        if path not in self._scaled:
+            self._scaled[path] = self._scale(self.image(path), size)
+        return self._scaled[path]
+
+    @staticmethod
+    def _scale(image, size):
+        """Scale an image to fit within a square, keeping its aspect ratio."""
+        from pygame import transform
+
+        largest_dimension = max(image.get_width(), image.get_height())
+        new_width = size * (image.get_width() / largest_dimension)
+        new_height = size * (image.get_height() / largest_dimension)
+        return transform.scale(image, (new_width, new_height))
+
+
+# The atlas shared by every board
+sprite_atlas = SpriteAtlas()
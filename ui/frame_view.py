@@ -0,0 +1,109 @@
+"""Drawing the frames a SimulationWorker publishes."""
+from characters.human import Human
+from characters.zombie import Zombie
+from characters.roles import HUMAN, ZOMBIE
+from ui.assets import sprite_atlas
+from ui.layout import GridLayout
+
+# The glob pattern of the images each role is drawn with
+ROLE_IMAGES = {HUMAN: Human.image_pattern, ZOMBIE: Zombie.image_pattern}
+
+
+class FrameView:
+    """
+    Draws the latest frame of an invasion that is being run on another thread.
+
+    The view never looks at the board itself, only at the frames it is shown.  Showing a frame compares it with the
+    last one, so only the cells whose occupants changed in between are drawn again.
+    """
+    def __init__(self, screen, width, height, atlas=sprite_atlas):
+        """
+        Initialise the view with nothing shown.
+
+        Args:
+            screen: The screen to draw on.
+            width: The number of columns in the grid.
+            height: The number of rows in the grid.
+            atlas: The images to draw the characters with.
+        """
+        self.screen = screen
+        self.atlas = atlas
+        self.layout = GridLayout(screen, width, height)
+        self.frame = None
+        # The ids of the characters in every occupied cell, so a cell can be redrawn without searching the frame
+        self._cells = {}
+        self._dirty_cells = set()
+
+    def show(self, frame):
+        """
+        Show a frame, the next call to draw draws it.
+
+        Args:
+            frame: The Frame to show.
+        """
+        if frame is self.frame:
+            return
+        previous = self.frame
+        self.frame = frame
+        if previous is None or frame.walls != previous.walls:
+            # The background has to be drawn again, and everything on it
+            self._cells = {}
+            for character_id, (_, x, y) in frame.state.items():
+                self._cells.setdefault((x, y), set()).add(character_id)
+            self.layout.invalidate()
+            return
+
+        old_state = previous.state
+        for character_id, current in frame.state.items():
+            before = old_state.get(character_id)
+            if before != current:
+                self._move(character_id, before, current)
+        for character_id, before in old_state.items():
+            if character_id not in frame.state:
+                self._move(character_id, before, None)
+
+    def _move(self, character_id, before, current):
+        """Record that a character has left one cell and entered another, or changed role."""
+        if before is not None:
+            cell = (before[1], before[2])
+            self._cells[cell].discard(character_id)
+            self._dirty_cells.add(cell)
+        if current is not None:
+            cell = (current[1], current[2])
+            self._cells.setdefault(cell, set()).add(character_id)
+            self._dirty_cells.add(cell)
+
+    def draw(self):
+        """
+        Draw the frame being shown.
+
+        Returns:
+            list: The pygame.Rect of every area of the screen that was drawn on, to pass to pygame.display.update.
+        """
+        state = self.frame.state
+        if self.layout.is_stale():
+            self.layout.build_background(self.frame.walls)
+            self.screen.blit(self.layout.background, (0, 0))
+            for character_id, (role, x, y) in state.items():
+                self._draw_character(character_id, role, x, y)
+            self._dirty_cells.clear()
+            return [self.screen.get_rect()]
+
+        rects = []
+        for x, y in self._dirty_cells:
+            rect = self.layout.cell_rect(x, y)
+            self.screen.blit(self.layout.background, rect, rect)
+            for character_id in self._cells.get((x, y), ()):
+                self._draw_character(character_id, state[character_id][0], x, y)
+            rects.append(rect)
+        self._dirty_cells.clear()
+        return rects
+
+    def _draw_character(self, character_id, role, x, y):
+        """Draw a character centred in its grid square."""
+        # The image is picked by id rather than at random so that drawing never uses up random numbers the
+        # simulation needs, and a character looks the same every time a run is repeated
+        paths = self.atlas.paths(ROLE_IMAGES[role])
+        image = self.atlas.scaled(paths[character_id % len(paths)], self.layout.square_width-4)
+        centre_x, centre_y = self.layout.screen_coordinates((x, y))
+        self.screen.blit(image, (centre_x - image.get_width()/2, centre_y - image.get_height()/2))
@@ -0,0 +1,137 @@
+"""Where the grid and each of its squares sit on the screen."""
+from constants import GRID_COLOR, BACKGROUND_COLOR, WALL_COLOR
+
+
+class GridLayout:
+    """
+    The position of the grid on the screen, and a background surface with the grid already drawn on it.
+
+    The grid is centred on the screen and its squares are as large as will fit with a 10 pixel margin.  The screen
+    position of the centre of every column and row is worked out once, so placing a character is two list lookups.
+    """
+    def __init__(self, screen, width, height):
+        """
+        Initialise the layout.
+
+        Args:
+            screen: The screen the grid is drawn on.
+            width: The number of columns in the grid.
+            height: The number of rows in the grid.
+        """
+        self.screen = screen
+        self.width = width
+        self.height = height
+        grid_width = (self.screen.get_width()-20)/self.width
+        grid_height = (self.screen.get_height()-20)/self.height
+        self.square_width = min(grid_width, grid_height)
+        self.center_point = None
+        self.background = None
+        self.column_centres = None
+        self.row_centres = None
+        self._size = None
+
+    def top_left(self):
+        """
+        Calculates the pixel coordinates of the top left corner of the grid.
+
+        Returns:
+            A tuple of the coordinates of the top left corner of the grid on the screen.
+        """
+        # Calculate the exact center of the screen
+        self.center_point = (self.screen.get_width() / 2, self.screen.get_height() / 2)
+        # Find the top left by shifting LEFT half of the width of the grid
+        # and UP half the height of the grid
+        return (
+            self.center_point[0] - (self.width * self.square_width) / 2,
+            self.center_point[1] - (self.height * self.square_width) / 2
+        )
+
+    def build_offsets(self):
+        """Work out the screen position of the centre of every column and row."""
+        top_left = self.top_left()
+        # Top left of the Grid
+        # Plus the width of each square multiplied by the grid coordinate
+        # Plus Half the square with, in order to put the coordinate in the middle of the square
+        half_square = self.square_width / 2
+        self.column_centres = [top_left[0] + (x * self.square_width) + half_square for x in range(self.width)]
+        self.row_centres = [top_left[1] + (y * self.square_width) + half_square for y in range(self.height)]
+
+    def is_stale(self):
+        """
+        Check whether the background needs drawing, either for the first time or because the screen changed size.
+
+        Returns:
+            bool: True if build_background needs to be called before the background is used.
+        """
+        return self.background is None or self._size != self.screen.get_size()
+
+    def build_background(self, walls=()):
+        """
+        Draw the grid onto the background surface and work out the screen position of every column and row.
+
+        Args:
+            walls: The (x, y) coordinates of every cell holding a wall, walls are part of the background.
+        """
+        import pygame
+
+        self._size = self.screen.get_size()
+        self.build_offsets()
+        top_left = self.top_left()
+
+        self.background = pygame.Surface(self._size)
+        self.background.fill(BACKGROUND_COLOR)
+        for x, y in walls:
+            self.background.fill(WALL_COLOR, self.cell_rect(x, y))
+
+        for n in range(0, self.width+1):
+            x = top_left[0] + (n * self.square_width)
+            pygame.draw.line(
+                surface=self.background,
+                color=GRID_COLOR,
+                start_pos=(x, top_left[1]),
+                end_pos=(x, top_left[1]+(self.height*self.square_width)),
+                width=1
+            )
+
+        for n in range(0, self.height+1):
+            y = top_left[1] + (n * self.square_width)
+            pygame.draw.line(
+                surface=self.background,
+                color=GRID_COLOR,
+                start_pos=(top_left[0], y),
+                end_pos=(top_left[0]+(self.width*self.square_width), y),
+                width=1
+            )
+
+    def invalidate(self):
+        """Make is_stale return True so that the background is drawn again."""
+        self.background = None
+
+    def screen_coordinates(self, location):
+        """
+        Coverts a given grid location into X and Y pixel coordinates on the screen.
+
+        Args:
+             location: A tuple containing the Grid location (x,y).
+
+        Return:
+            A tuple containing the X and Y pixel coordinates on the screen of the center of the grid square.
+        """
+        if self.column_centres is None:
+            self.build_offsets()
+        x, y = location
+        return (self.column_centres[x], self.row_centres[y])
+
+    def cell_rect(self, x, y):
+        """
+        The area of the screen covered by a grid square, including the grid lines around it.
+
+        Returns:
+            pygame.Rect: The area of the square.
+        """
+        from pygame import Rect
+
+        centre_x, centre_y = self.screen_coordinates((x, y))
+        half_square = self.square_width / 2
+        size = int(self.square_width) + 2
+        return Rect(int(centre_x - half_square), int(centre_y - half_square), size, size)
@@ -0,0 +1,196 @@
+"""Playing back a recorded invasion in a pygame window."""
+from characters.human import Human
+from characters.zombie import Zombie
+from simulation.replay import Replay, HUMAN, ZOMBIE
+from ui.assets import sprite_atlas
+from ui.layout import GridLayout
+
+# The glob pattern of the images each role is drawn with
+ROLE_IMAGES = {HUMAN: Human.image_pattern, ZOMBIE: Zombie.image_pattern}
+
+
+class ReplayViewer:
+    """
+    Shows a replay on the screen a turn at a time.
+
+    The viewer can be played by a TurnScheduler just like a simulation engine, so it has the same play, pause, step
+    and speed controls, but moving on a turn only reads the changes from the replay rather than running the turn.  It
+    can also jump straight to any turn with seek.
+    """
+    def __init__(self, screen, replay, atlas=sprite_atlas):
+        """
+        Initialise the viewer at the first turn of the replay.
+
+        Args:
+            screen: The screen to draw the replay on.
+            replay: The Replay to show.
+            atlas: The images to draw the characters with.
+        """
+        self.screen = screen
+        self.replay = replay
+        self.atlas = atlas
+        self.layout = GridLayout(screen, replay.width, replay.height)
+        self.state = {}
+        self.turn_count = None
+        # The ids of the characters in every occupied cell, so a cell can be redrawn without searching the state
+        self._cells = {}
+        self._dirty_cells = set()
+        self.seek(replay.first_turn)
+
+    def seek(self, turn):
+        """
+        Jump to the end of a turn.
+
+        Args:
+            turn: The turn to show, it is clamped to the turns in the replay.
+        """
+        turn = max(self.replay.first_turn, min(turn, self.replay.last_turn))
+        self.state = self.replay.state_at(turn)
+        self.turn_count = turn
+        self._cells = {}
+        for character_id, (_, x, y) in self.state.items():
+            self._cells.setdefault((x, y), set()).add(character_id)
+        self.layout.invalidate()
+
+    def commence_turn(self):
+        """Move on to the next turn of the replay."""
+        self.turn_count += 1
+        before = self.replay.apply_turn(self.state, self.turn_count)
+        for character_id, previous in before.items():
+            if previous is not None:
+                cell = (previous[1], previous[2])
+                self._cells[cell].discard(character_id)
+                self._dirty_cells.add(cell)
+            current = self.state.get(character_id)
+            if current is not None:
+                cell = (current[1], current[2])
+                self._cells.setdefault(cell, set()).add(character_id)
+                self._dirty_cells.add(cell)
+
+    def is_over(self):
+        """
+        Check whether the replay has reached its last turn.
+
+        Returns:
+            bool: True at the last turn of the replay.
+        """
+        return self.turn_count >= self.replay.last_turn
+
+    def stats(self):
+        """
+        The population statistics of the turn being shown.
+
+        Returns:
+            dict: The turn and the number of humans and zombies.
+        """
+        humans = sum(1 for role, _, _ in self.state.values() if role == HUMAN)
+        return {"turns": self.turn_count, "humans": humans, "zombies": len(self.state) - humans}
+
+    def draw(self):
+        """
+        Draw the turn being shown.
+
+        Returns:
+            list: The pygame.Rect of every area of the screen that was drawn on, to pass to pygame.display.update.
+        """
+        if self.layout.is_stale():
+            self.layout.build_background(self.replay.walls)
+            self.screen.blit(self.layout.background, (0, 0))
+            for character_id, (role, x, y) in self.state.items():
+                self._draw_character(character_id, role, x, y)
+            self._dirty_cells.clear()
+            return [self.screen.get_rect()]
+
+        rects = []
+        for x, y in self._dirty_cells:
+            rect = self.layout.cell_rect(x, y)
+            self.screen.blit(self.layout.background, rect, rect)
+            for character_id in self._cells.get((x, y), ()):
+                self._draw_character(character_id, self.state[character_id][0], x, y)
+            rects.append(rect)
+        self._dirty_cells.clear()
+        return rects
+
+    def _draw_character(self, character_id, role, x, y):
+        """Draw a character centred in its grid square."""
+        # The image is picked the same way the FrameView picks it, so characters look the same as when they were
+        # recorded
+        paths = self.atlas.paths(ROLE_IMAGES[role])
+        image = self.atlas.scaled(paths[character_id % len(paths)], self.layout.square_width-4)
+        centre_x, centre_y = self.layout.screen_coordinates((x, y))
+        self.screen.blit(image, (centre_x - image.get_width()/2, centre_y - image.get_height()/2))
+
+
+CONTROLS = """Controls:
+    Space       Play / pause
+    Right       Step forward a turn
+    Left        Step back a turn
+    Page Up     Jump back a keyframe
+    Page Down   Jump forward a keyframe
+    Home, End   Jump to the start or the end
+    Up, Down    Faster / slower"""
+
+
+def main(path, turn=None, turns_per_second=2):
+    """
+    Play a replay in a pygame window.
+
+    Args:
+        path: The replay file.
+        turn: The turn to start at, defaults to the start of the replay.
+        turns_per_second: The speed to play the replay at.
+    """
+    import pygame
+
+    from simulation.scheduler import TurnScheduler
+
+    pygame.init()
+    screen = pygame.display.set_mode((1280, 720))
+    clock = pygame.time.Clock()
+    replay = Replay(path)
+    viewer = ReplayViewer(screen, replay)
+    if turn is not None:
+        viewer.seek(turn)
+    scheduler = TurnScheduler(viewer, turns_per_second=turns_per_second)
+    running = True
+    dt = 0
+    print(CONTROLS)
+
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    scheduler.toggle_pause()
+                elif event.key == pygame.K_RIGHT:
+                    scheduler.step()
+                elif event.key == pygame.K_LEFT:
+                    scheduler.pause()
+                    viewer.seek(viewer.turn_count - 1)
+                elif event.key == pygame.K_PAGEUP:
+                    viewer.seek(viewer.turn_count - replay.keyframe_interval)
+                elif event.key == pygame.K_PAGEDOWN:
+                    viewer.seek(viewer.turn_count + replay.keyframe_interval)
+                elif event.key == pygame.K_HOME:
+                    viewer.seek(replay.first_turn)
+                elif event.key == pygame.K_END:
+                    viewer.seek(replay.last_turn)
+                elif event.key == pygame.K_UP:
+                    scheduler.faster()
+                elif event.key == pygame.K_DOWN:
+                    scheduler.slower()
+
+        scheduler.update(dt)
+        pygame.display.update(viewer.draw())
+
+        stats = viewer.stats()
+        pygame.display.set_caption(
+            f"Zombie Invasion replay - turn {stats['turns']} of {replay.last_turn}, {stats['humans']} humans, "
+            f"{stats['zombies']} zombies - {scheduler.describe()}"
+        )
+
+        dt = clock.tick(30) / 1000
+
+    replay.close()
+    pygame.quit()